@@ -5,8 +5,13 @@ Each habit has its own Current Streak and Longest Streak properties
 """
 
 import os
-import requests
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'scripts'))
+
+from notion_client import NotionAPIError, NotionClient
 
 # Configuration
 NOTION_TOKEN = os.environ.get('NOTION_TOKEN')
@@ -17,42 +22,29 @@ if not NOTION_TOKEN:
     print("❌ NOTION_TOKEN not found in environment variables")
     exit(1)
 
-# API Headers
-headers = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Notion-Version": "2022-06-28",
-    "Content-Type": "application/json"
-}
+client = NotionClient(NOTION_TOKEN)
 
 def delete_database_entries(database_id):
     """Delete all existing entries in the database"""
     print("🗑️  Checking for existing entries to delete...")
     
     try:
-        # Query all entries
-        response = requests.post(
-            f"https://api.notion.com/v1/databases/{database_id}/query",
-            headers=headers,
-            json={"page_size": 100}
-        )
+        # Query all entries (every page) before archiving any of them
+        try:
+            results = client.query_all(database_id)
+        except NotionAPIError as e:
+            print(f"⚠️  Could not query database: {e.status}")
+            return
         
-        if response.status_code == 200:
-            results = response.json().get('results', [])
-            print(f"📋 Found {len(results)} existing entries")
-            
-            for entry in results:
-                entry_id = entry['id']
-                archive_response = requests.patch(
-                    f"https://api.notion.com/v1/pages/{entry_id}",
-                    headers=headers,
-                    json={"archived": True}
-                )
-                if archive_response.status_code == 200:
-                    print(f"  ✅ Archived entry: {entry_id}")
-                else:
-                    print(f"  ⚠️  Could not archive entry: {entry_id}")
-        else:
-            print(f"⚠️  Could not query database: {response.status_code}")
+        print(f"📋 Found {len(results)} existing entries")
+        
+        for entry in results:
+            entry_id = entry['id']
+            try:
+                client.update_page(entry_id, archived=True)
+                print(f"  ✅ Archived entry: {entry_id}")
+            except NotionAPIError:
+                print(f"  ⚠️  Could not archive entry: {entry_id}")
             
     except Exception as e:
         print(f"⚠️  Error deleting entries: {e}")
@@ -129,20 +121,14 @@ def update_database_schema(database_id):
     }
     
     try:
-        response = requests.patch(
-            f"https://api.notion.com/v1/databases/{database_id}",
-            headers=headers,
-            json=schema_updates
-        )
+        client.update_schema(database_id, schema_updates["properties"])
+        print("✅ Database schema updated successfully!")
+        return True
         
-        if response.status_code == 200:
-            print("✅ Database schema updated successfully!")
-            return True
-        else:
-            print(f"❌ Error updating schema: {response.status_code}")
-            print(f"Response: {response.text}")
-            return False
-            
+    except NotionAPIError as e:
+        print(f"❌ Error updating schema: {e.status}")
+        print(f"Response: {e}")
+        return False
     except Exception as e:
         print(f"❌ Exception updating schema: {e}")
         return False
@@ -154,7 +140,6 @@ def add_habit_entry(database_id, date_str, fruit, fruit_streak, fruit_longest,
     """Add a habit tracking entry"""
     
     entry = {
-        "parent": {"database_id": database_id},
         "properties": {
             "Date": {"date": {"start": date_str}},
             "Fruit": {"checkbox": fruit},
@@ -173,20 +158,14 @@ def add_habit_entry(database_id, date_str, fruit, fruit_streak, fruit_longest,
     }
     
     try:
-        response = requests.post(
-            "https://api.notion.com/v1/pages",
-            headers=headers,
-            json=entry
-        )
+        client.create_page(entry["properties"], database_id=database_id)
+        print(f"✅ Entry added for {date_str}")
+        return True
         
-        if response.status_code == 200:
-            print(f"✅ Entry added for {date_str}")
-            return True
-        else:
-            print(f"❌ Error adding entry for {date_str}: {response.status_code}")
-            print(f"Response: {response.text}")
-            return False
-            
+    except NotionAPIError as e:
+        print(f"❌ Error adding entry for {date_str}: {e.status}")
+        print(f"Response: {e}")
+        return False
     except Exception as e:
         print(f"❌ Exception adding entry: {e}")
         return False
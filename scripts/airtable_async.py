@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Async Airtable Client
+asyncio wrapper around AirtableClient so scripts can fetch several tables
+at once. Requests run on a bounded worker pool over the same shared
+keep-alive sessions and rate limiter as the sync client.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional
+
+from airtable_client import (
+    AirtableClient, POOL_MAXSIZE
+)
+
+# Keep concurrency within the connection pool so requests never queue for a socket
+DEFAULT_CONCURRENCY = POOL_MAXSIZE
+
+_END = object()
+
+
+class AsyncAirtableClient:
+    """Async Airtable client with the same method surface as AirtableClient"""
+
+    def __init__(self, api_key: Optional[str] = None,
+                 priority: Optional[int] = None,
+                 max_concurrency: int = DEFAULT_CONCURRENCY):
+        self.sync = AirtableClient(api_key, priority)
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="airtable")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Shut down the worker pool"""
+        self._executor.shutdown(wait=False)
+
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking client call on the bounded worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    # Same surface as AirtableClient
+    async def get_tables(self, base_id: str) -> List[Dict]:
+        return await self._run(self.sync.get_tables, base_id)
+
+    async def get_table_id(self, base_id: str, table_name: str) -> Optional[str]:
+        return await self._run(self.sync.get_table_id, base_id, table_name)
+
+    async def preload_schema(self, **kwargs) -> Dict[str, bool]:
+        return await self._run(self.sync.preload_schema, **kwargs)
+
+    async def get_field_ids(self, base_id: str, table_name: str,
+                            field_names: List[str]) -> List[str]:
+        return await self._run(self.sync.get_field_ids, base_id, table_name, field_names)
+
+    async def query_records(self, base_id: str, table_name: str, **kwargs) -> List[Dict]:
+        return await self._run(self.sync.query_records, base_id, table_name, **kwargs)
+
+    async def iter_records(self, base_id: str, table_name: str, **kwargs) -> AsyncIterator[Dict]:
+        """Async stream of records, page by page"""
+        records = self.sync.iter_records(base_id, table_name, **kwargs)
+        while True:
+            record = await self._run(next, records, _END)
+            if record is _END:
+                break
+            yield record
+
+    async def create_record(self, base_id: str, table_name: str,
+                            fields: Dict[str, Any], **kwargs) -> Dict:
+        return await self._run(self.sync.create_record, base_id, table_name, fields, **kwargs)
+
+    async def update_record(self, base_id: str, table_name: str,
+                            record_id: str, fields: Dict[str, Any]) -> Dict:
+        return await self._run(self.sync.update_record, base_id, table_name, record_id, fields)
+
+    async def delete_record(self, base_id: str, table_name: str, record_id: str) -> bool:
+        return await self._run(self.sync.delete_record, base_id, table_name, record_id)
+
+    async def create_records(self, base_id: str, table_name: str,
+                             records: List[Dict[str, Any]], **kwargs) -> List[Dict]:
+        return await self._run(self.sync.create_records, base_id, table_name, records, **kwargs)
+
+    async def update_records(self, base_id: str, table_name: str,
+                             updates: List[Dict[str, Any]], **kwargs) -> List[Dict]:
+        return await self._run(self.sync.update_records, base_id, table_name, updates, **kwargs)
+
+    async def upsert_records(self, base_id: str, table_name: str,
+                             records: List[Dict[str, Any]], merge_on: List[str],
+                             **kwargs) -> List[Dict]:
+        return await self._run(self.sync.upsert_records, base_id, table_name,
+                               records, merge_on, **kwargs)
+
+    # Fan-out helper
+    async def gather(self, queries: Dict[str, Awaitable]) -> Dict[str, Any]:
+        """Await named queries concurrently
+
+        Returns {name: result}; a failed query maps to its exception so one
+        bad table doesn't sink the rest.
+        """
+        names = list(queries)
+        results = await asyncio.gather(*queries.values(), return_exceptions=True)
+        return dict(zip(names, results))
+
+
+def get_async_client(priority: Optional[int] = None) -> AsyncAirtableClient:
+    """Get configured async Airtable client (use as an async context manager)"""
+    return AsyncAirtableClient(priority=priority)
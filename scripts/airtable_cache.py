@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Airtable Query Cache
+Read-through cache for AirtableClient.query_records: an in-memory LRU per
+process plus an optional on-disk tier shared between cron runs. Entries
+expire per table and are dropped when the same process writes to the table.
+"""
+
+import os
+import copy
+import json
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Seconds a cached query stays fresh, by table name (or ID)
+DEFAULT_TTL = 60
+TABLE_TTLS = {
+    "TAT Tasks v2": 30,
+    "Daily Habits": 30,
+    "Food Log": 60,
+    "Weight Tracker": 300,
+    "Workouts": 300,
+    "WHOOP Data": 300,
+}
+
+DEFAULT_MAX_ENTRIES = 256
+
+# Set to a directory to enable the on-disk tier for every client
+CACHE_DIR_ENV = "AIRTABLE_CACHE_DIR"
+
+
+def make_cache_key(base_id: str, table_id: str,
+                   filter_formula: Optional[str] = None,
+                   sort: Optional[List[Dict]] = None,
+                   fields: Optional[List[str]] = None,
+                   max_records: Optional[int] = None,
+                   by_field_id: bool = False) -> Tuple:
+    """Normalized key for a list-records query"""
+    sort_key = tuple(
+        (s.get('field'), 'desc' if s.get('direction', 'asc').startswith('desc') else 'asc')
+        for s in (sort or []) if s.get('field')
+    )
+    return (base_id, table_id, (filter_formula or '').strip(), sort_key,
+            tuple(sorted(fields or [])), max_records or 0, bool(by_field_id))
+
+
+class QueryCache:
+    """LRU + optional disk cache of query results with per-table TTLs"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 default_ttl: float = DEFAULT_TTL,
+                 table_ttls: Optional[Dict[str, float]] = None,
+                 disk_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.table_ttls = dict(TABLE_TTLS if table_ttls is None else table_ttls)
+        self.disk_dir = os.path.expanduser(disk_dir) if disk_dir else None
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "disk_hits": 0,
+                      "evictions": 0, "invalidations": 0}
+
+    def ttl_for(self, *table_keys: str) -> float:
+        """TTL for the first table name/ID that has one configured"""
+        for key in table_keys:
+            if key in self.table_ttls:
+                return self.table_ttls[key]
+        return self.default_ttl
+
+    # Disk tier
+    def _disk_path(self, key: Tuple) -> Optional[str]:
+        if not self.disk_dir:
+            return None
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f"{key[0]}_{key[1]}", f"{digest}.json")
+
+    def _disk_get(self, key: Tuple) -> Optional[Tuple[float, List[Dict]]]:
+        path = self._disk_path(key)
+        if not path:
+            return None
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if entry.get('expires_at', 0) <= time.time():
+            return None
+        return entry['expires_at'], entry['records']
+
+    def _disk_set(self, key: Tuple, expires_at: float, records: List[Dict]):
+        path = self._disk_path(key)
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"expires_at": expires_at, "records": records}, f)
+        os.replace(tmp_path, path)
+
+    # Public API
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        """Cached records for a query, or None on miss/expiry"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return copy.deepcopy(entry[1])
+            if entry:
+                del self._entries[key]
+
+        disk_entry = self._disk_get(key)
+        with self._lock:
+            if disk_entry:
+                self._store(key, disk_entry)
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+                return copy.deepcopy(disk_entry[1])
+            self.stats["misses"] += 1
+        return None
+
+    def set(self, key: Tuple, records: List[Dict], ttl: float):
+        """Cache records for a query"""
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        records = copy.deepcopy(records)
+        with self._lock:
+            self._store(key, (expires_at, records))
+        self._disk_set(key, expires_at, records)
+
+    def _store(self, key: Tuple, entry: Tuple[float, List[Dict]]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate_table(self, base_id: str, table_id: str):
+        """Drop every cached query for a table (call after writes)"""
+        with self._lock:
+            stale = [k for k in self._entries if k[0] == base_id and k[1] == table_id]
+            for k in stale:
+                del self._entries[k]
+            self.stats["invalidations"] += 1
+        if self.disk_dir:
+            shutil.rmtree(os.path.join(self.disk_dir, f"{base_id}_{table_id}"),
+                          ignore_errors=True)
+
+    def invalidate_base(self, base_id: str):
+        """Drop every cached query for a base (call after a schema change)"""
+        with self._lock:
+            tables = {k[1] for k in self._entries if k[0] == base_id}
+        for table_id in tables:
+            self.invalidate_table(base_id, table_id)
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for name in os.listdir(self.disk_dir):
+                if name.startswith(f"{base_id}_"):
+                    shutil.rmtree(os.path.join(self.disk_dir, name), ignore_errors=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir:
+            shutil.rmtree(self.disk_dir, ignore_errors=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_default_cache: Optional[QueryCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> QueryCache:
+    """Process-wide cache shared by every AirtableClient"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = QueryCache(disk_dir=os.getenv(CACHE_DIR_ENV))
+        return _default_cache
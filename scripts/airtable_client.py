@@ -7,54 +7,158 @@ Unified interface for interacting with Sam's Airtable bases
 import os
 import json
 import time
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Iterator
+from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
+
+from airtable_formula import QueryCoalescer, and_, eq, gte, in_, is_after, or_
+from airtable_cache import QueryCache, get_default_cache, make_cache_key
+from airtable_schema import SchemaRegistry, get_schema_registry
+from duplicate_index import (
+    DuplicateIndex, DuplicateRecordError, INDEXED_TABLES, RETRY_WINDOW, get_duplicate_index
+)
+from api_metrics import record_request, request_size, response_size
+from airtable_rate_limiter import (
+    get_limiter, PENALTY_SECONDS, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+)
 
 # Base Configuration
 HEALTH_BASE_ID = "appnVeGSjwJgG2snS"
 PRODUCTIVITY_BASE_ID = "appvUbV8IeGhxmcPn"
 
-# Table IDs (will be discovered dynamically or cached)
-TABLE_CACHE_FILE = os.path.expanduser("~/.openclaw/workspace/.airtable_table_cache.json")
+ALL_BASE_IDS = (HEALTH_BASE_ID, PRODUCTIVITY_BASE_ID)
+
+# Airtable returns at most 100 records per list request
+MAX_PAGE_SIZE = 100
+
+# Airtable accepts at most 10 records per create/update request
+MAX_BATCH_SIZE = 10
+
+# Connection pooling - one keep-alive session per host, shared by every client
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 10
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+# Process-wide config cache so new clients don't re-read the key file
+_api_key_cache: Optional[str] = None
+
+
+def get_session(url: str) -> requests.Session:
+    """Get the shared keep-alive session for the host of a URL"""
+    host = urlparse(url).netloc
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS,
+                                  pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+        return session
+
+
+def get_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Get connection reuse counters per host
+
+    Returns {host: {"requests", "connections", "reused"}} where
+    "connections" is the number of TCP/TLS handshakes actually paid.
+    """
+    with _sessions_lock:
+        sessions = dict(_sessions)
+    
+    stats = {}
+    for host, session in sessions.items():
+        counters = {"requests": 0, "connections": 0, "reused": 0}
+        seen = set()
+        for adapter in session.adapters.values():
+            if id(adapter) in seen or not hasattr(adapter, 'poolmanager'):
+                continue
+            seen.add(id(adapter))
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                counters["requests"] += pool.num_requests
+                counters["connections"] += pool.num_connections
+        counters["reused"] = max(counters["requests"] - counters["connections"], 0)
+        stats[host] = counters
+    return stats
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for the process-wide query cache"""
+    return get_default_cache().get_stats()
+
+
+def close_sessions():
+    """Close all pooled sessions (e.g. on server shutdown)"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
 
 class AirtableClient:
     """Unified Airtable API client for Health & Productivity bases"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize Airtable client with API key"""
+    def __init__(self, api_key: Optional[str] = None,
+                 priority: Optional[int] = None,
+                 cache: Optional[QueryCache] = None,
+                 schema: Optional[SchemaRegistry] = None,
+                 duplicates: Optional[DuplicateIndex] = None):
+        """Initialize Airtable client with API key
+        
+        priority: rate-limiter priority for every request (PRIORITY_HIGH,
+        PRIORITY_NORMAL, PRIORITY_LOW). Defaults to HIGH for writes and
+        NORMAL for reads.
+        cache: query cache for query_records; defaults to the process-wide
+        cache. Set client.cache = None to bypass it.
+        schema: table/field ID registry; defaults to the process-wide one.
+        duplicates: duplicate-key index for Food Log / Daily Habits; defaults
+        to the process-wide one. Set client.duplicates = None to skip it.
+        """
         self.api_key = api_key or self._load_api_key()
+        self.priority = priority
+        self.cache = cache or get_default_cache()
+        self._coalescer: Optional[QueryCoalescer] = None
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         self.base_url = "https://api.airtable.com/v0"
-        self.table_cache = self._load_table_cache()
+        self.session = get_session(self.base_url)
+        self.schema = schema or get_schema_registry()
+        self.duplicates = duplicates or get_duplicate_index()
         
     def _load_api_key(self) -> str:
-        """Load API key from config file"""
+        """Load API key from config file (read once per process)"""
+        global _api_key_cache
+        if _api_key_cache:
+            return _api_key_cache
+        
         key_path = os.path.expanduser("~/.config/airtable/api_key")
         try:
             with open(key_path, 'r') as f:
-                return f.read().strip()
+                _api_key_cache = f.read().strip()
+                return _api_key_cache
         except FileNotFoundError:
             raise ValueError(f"Airtable API key not found at {key_path}")
     
-    def _load_table_cache(self) -> Dict:
-        """Load cached table IDs"""
-        if os.path.exists(TABLE_CACHE_FILE):
-            try:
-                with open(TABLE_CACHE_FILE, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def _save_table_cache(self):
-        """Save table IDs to cache"""
-        os.makedirs(os.path.dirname(TABLE_CACHE_FILE), exist_ok=True)
-        with open(TABLE_CACHE_FILE, 'w') as f:
-            json.dump(self.table_cache, f, indent=2)
+    @staticmethod
+    def _rate_limit_key(endpoint: str) -> str:
+        """Base ID an endpoint counts against (Airtable limits per base)"""
+        parts = endpoint.split('/')
+        if parts[0] == 'meta' and len(parts) > 2:
+            return parts[2]
+        return parts[0]
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict:
         """Make API request with rate limiting and error handling"""
@@ -62,21 +166,60 @@ class AirtableClient:
         max_retries = 3
         retry_delay = 1
         
+        priority = kwargs.pop('priority', self.priority)
+        if priority is None:
+            priority = PRIORITY_NORMAL if method == "GET" else PRIORITY_HIGH
+        limiter = get_limiter(self._rate_limit_key(endpoint))
+        
+        metrics = {"retries": 0, "wait": 0.0, "response": None}
+        started = time.time()
+        error = None
+        try:
+            return self._send_with_retries(method, url, limiter, priority,
+                                           max_retries, retry_delay, metrics, **kwargs)
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            response = metrics["response"]
+            record_request("airtable", method, endpoint,
+                           getattr(response, 'status_code', None),
+                           time.time() - started,
+                           retries=metrics["retries"], rate_limit_wait=metrics["wait"],
+                           request_bytes=request_size(response) if response is not None else 0,
+                           response_bytes=response_size(response) if response is not None else 0,
+                           error=error)
+            # Any write makes cached queries on this table stale
+            if method != "GET" and self.cache:
+                parts = endpoint.split('/')
+                if len(parts) >= 2 and parts[0] != 'meta':
+                    self.cache.invalidate_table(parts[0], parts[1])
+    
+    def _send_with_retries(self, method: str, url: str, limiter, priority: int,
+                           max_retries: int, retry_delay: float,
+                           metrics: Dict, **kwargs) -> Dict:
+        """Send one request, retrying timeouts, connection errors and 429s
+        
+        Fills metrics with the retry count, rate-limit wait and last response.
+        """
         for attempt in range(max_retries):
+            metrics["retries"] = attempt
             try:
-                response = requests.request(
+                metrics["wait"] += limiter.acquire(priority)
+                response = self.session.request(
                     method, 
                     url, 
                     headers=self.headers, 
                     timeout=30,
                     **kwargs
                 )
+                metrics["response"] = response
                 
-                # Handle rate limiting
+                # Handle rate limiting - block every process on this base
                 if response.status_code == 429:
-                    retry_after = int(response.headers.get('Retry-After', 60))
+                    retry_after = int(response.headers.get('Retry-After', PENALTY_SECONDS))
                     print(f"⚠️ Rate limited. Waiting {retry_after}s...")
-                    time.sleep(retry_after)
+                    limiter.penalize(retry_after)
                     continue
                 
                 # Handle other errors
@@ -106,73 +249,196 @@ class AirtableClient:
         
         raise Exception("Max retries exceeded")
     
+    @property
+    def coalescer(self) -> QueryCoalescer:
+        """Merges concurrent same-table queries from this client into one request"""
+        if self._coalescer is None:
+            self._coalescer = QueryCoalescer(self)
+        return self._coalescer
+    
     def get_tables(self, base_id: str) -> List[Dict]:
         """Get all tables in a base"""
         result = self._make_request("GET", f"meta/bases/{base_id}/tables")
         return result.get('tables', [])
     
+    def _schema_lookup(self, lookup, base_id: str, *args):
+        """Run a registry lookup; drop cached queries if it refreshed the base
+        to a new schema version (TTL expiry or an unknown table/field name)
+        """
+        before = self.schema.version(base_id)
+        result = lookup(self.get_tables, base_id, *args)
+        if self.cache and before is not None and self.schema.version(base_id) != before:
+            self.cache.invalidate_base(base_id)
+        return result
+    
     def get_table_id(self, base_id: str, table_name: str) -> Optional[str]:
-        """Get table ID by name, using cache if available"""
-        cache_key = f"{base_id}:{table_name}"
-        
-        if cache_key in self.table_cache:
-            return self.table_cache[cache_key]
-        
-        # Discover tables
-        tables = self.get_tables(base_id)
-        for table in tables:
-            if table['name'] == table_name:
-                table_id = table['id']
-                self.table_cache[cache_key] = table_id
-                self._save_table_cache()
-                return table_id
-        
-        return None
+        """Get table ID by name from the schema registry"""
+        return self._schema_lookup(self.schema.table_id, base_id, table_name)
     
-    def query_records(self, base_id: str, table_name: str, 
-                      filter_formula: Optional[str] = None,
-                      sort: Optional[List[Dict]] = None,
-                      max_records: int = 100) -> List[Dict]:
-        """Query records from a table"""
+    def preload_schema(self, base_ids=ALL_BASE_IDS, force: bool = False):
+        """Load table and field IDs for every base up front
+        
+        Cached queries are dropped for a base whose schema changed.
+        """
+        changes = self.schema.preload(self.get_tables, base_ids, force=force)
+        if self.cache:
+            for base_id, changed in changes.items():
+                if changed:
+                    self.cache.invalidate_base(base_id)
+        return changes
+    
+    def get_field_ids(self, base_id: str, table_name: str,
+                      field_names: List[str]) -> List[str]:
+        """Field IDs for field names (for fields[] with returnFieldsByFieldId)"""
+        return self._schema_lookup(self.schema.field_ids, base_id, table_name, field_names)
+    
+    def fields_by_name(self, base_id: str, table_name: str, record: Dict) -> Dict:
+        """Copy of a record fetched by field ID with its fields keyed by name"""
+        names = self._schema_lookup(self.schema.field_names, base_id, table_name)
+        fields = {names.get(fid, fid): value for fid, value in record.get('fields', {}).items()}
+        return {**record, "fields": fields}
+    
+    @staticmethod
+    def _build_query_params(filter_formula: Optional[str] = None,
+                            sort: Optional[List[Dict]] = None,
+                            fields: Optional[List[str]] = None,
+                            page_size: int = MAX_PAGE_SIZE,
+                            max_records: Optional[int] = None,
+                            by_field_id: bool = False) -> Dict:
+        """Build list-records query params (sort[] and fields[] go server-side)"""
+        params: Dict[str, Any] = {"pageSize": max(1, min(page_size, MAX_PAGE_SIZE))}
+        if max_records:
+            params["maxRecords"] = max_records
+        if by_field_id:
+            params["returnFieldsByFieldId"] = "true"
+        if filter_formula:
+            params["filterByFormula"] = filter_formula
+        if fields:
+            params["fields[]"] = list(fields)
+        for i, sort_item in enumerate(sort or []):
+            field = sort_item.get('field')
+            if not field:
+                continue
+            direction = sort_item.get('direction', 'asc')
+            params[f"sort[{i}][field]"] = field
+            params[f"sort[{i}][direction]"] = "desc" if direction.startswith("desc") else "asc"
+        return params
+    
+    def iter_records(self, base_id: str, table_name: str,
+                     filter_formula: Optional[str] = None,
+                     sort: Optional[List[Dict]] = None,
+                     fields: Optional[List[str]] = None,
+                     page_size: int = MAX_PAGE_SIZE,
+                     max_records: Optional[int] = None,
+                     by_field_id: bool = False) -> Iterator[Dict]:
+        """Stream records page by page, following Airtable's offset cursor
+        
+        The next page is fetched in the background while the caller works
+        through the current one. With by_field_id, records come back keyed
+        by field ID (pass IDs from get_field_ids in fields).
+        """
         table_id = self.get_table_id(base_id, table_name)
         if not table_id:
             raise ValueError(f"Table '{table_name}' not found in base {base_id}")
         
         endpoint = f"{base_id}/{table_id}"
-        
-        # Build query params - Airtable expects specific format for sort
-        params = {"maxRecords": max_records}
-        if filter_formula:
-            params["filterByFormula"] = filter_formula
-        
-        result = self._make_request("GET", endpoint, params=params)
-        records = result.get('records', [])
-        
-        # Sort locally if needed
-        if sort and records:
-            for sort_item in reversed(sort):
-                field = sort_item.get('field')
-                direction = sort_item.get('direction', 'asc')
-                if field:
-                    records = sorted(
-                        records, 
-                        key=lambda x: x.get('fields', {}).get(field, ''),
-                        reverse=(direction == 'descending')
-                    )
-        
+        params = self._build_query_params(filter_formula, sort, fields,
+                                          page_size, max_records, by_field_id)
+        
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(self._make_request, "GET", endpoint, params=params)
+            while pending is not None:
+                result = pending.result()
+                pending = None
+                
+                offset = result.get('offset')
+                if offset:
+                    pending = prefetcher.submit(self._make_request, "GET", endpoint,
+                                                params={**params, "offset": offset})
+                
+                for record in result.get('records', []):
+                    yield record
+    
+    def query_records(self, base_id: str, table_name: str, 
+                      filter_formula: Optional[str] = None,
+                      sort: Optional[List[Dict]] = None,
+                      max_records: Optional[int] = None,
+                      fields: Optional[List[str]] = None,
+                      by_field_id: bool = False) -> List[Dict]:
+        """Query all matching records from a table (every page)
+        
+        Results are served from the query cache while fresh.
+        """
+        cache_key = None
+        if self.cache:
+            table_id = self.get_table_id(base_id, table_name)
+            if table_id:
+                cache_key = make_cache_key(base_id, table_id, filter_formula,
+                                           sort, fields, max_records, by_field_id)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
+        
+        records = list(self.iter_records(base_id, table_name,
+                                         filter_formula=filter_formula,
+                                         sort=sort, fields=fields,
+                                         max_records=max_records,
+                                         by_field_id=by_field_id))
+        
+        if cache_key:
+            self.cache.set(cache_key, records, self.cache.ttl_for(table_name, cache_key[1]))
         return records
     
+    def _index_records(self, table_name: str, records: List[Dict]):
+        """Keep the duplicate index in step with records Airtable returned"""
+        if self.duplicates and table_name in INDEXED_TABLES:
+            self.duplicates.add(table_name, records)
+    
     def create_record(self, base_id: str, table_name: str, 
-                     fields: Dict[str, Any]) -> Dict:
-        """Create a new record"""
+                     fields: Dict[str, Any], on_duplicate: str = "create") -> Dict:
+        """Create a new record
+        
+        Callers that may retry a write (e.g. webhooks) can have Food Log and
+        Daily Habits records looked up in the duplicate index first.
+        on_duplicate decides what a match does: "auto" returns the existing
+        record if it was written within RETRY_WINDOW (a retried write) and
+        creates otherwise, with a warning; "skip" always returns the
+        existing record; "raise" raises DuplicateRecordError; "create" (the
+        default) writes without looking.
+        """
         table_id = self.get_table_id(base_id, table_name)
         if not table_id:
             raise ValueError(f"Table '{table_name}' not found in base {base_id}")
         
         endpoint = f"{base_id}/{table_id}"
+        
+        if self.duplicates and on_duplicate != "create" and table_name in INDEXED_TABLES:
+            matches = self.duplicates.find(table_name, fields)
+            if matches:
+                ids = [m["id"] for m in matches]
+                if on_duplicate == "raise":
+                    raise DuplicateRecordError(table_name, ids)
+                latest = max(matches, key=lambda m: m["created_at"])
+                if on_duplicate == "skip" or time.time() - latest["created_at"] < RETRY_WINDOW:
+                    try:
+                        existing = self._make_request("GET", f"{endpoint}/{latest['id']}")
+                    except Exception as e:
+                        if "Airtable API error: 404" not in str(e):
+                            raise
+                        # Deleted in Airtable since it was indexed
+                        self.duplicates.remove(table_name, [latest['id']])
+                    else:
+                        print(f"⚠️ Duplicate {table_name} record skipped (matches {latest['id']})")
+                        existing["duplicate"] = True
+                        return existing
+                else:
+                    print(f"⚠️ {table_name} record duplicates {', '.join(ids)} - creating anyway")
+        
         payload = {"fields": fields}
         
-        return self._make_request("POST", endpoint, json=payload)
+        record = self._make_request("POST", endpoint, json=payload)
+        self._index_records(table_name, [record])
+        return record
     
     def update_record(self, base_id: str, table_name: str, 
                      record_id: str, fields: Dict[str, Any]) -> Dict:
@@ -184,7 +450,79 @@ class AirtableClient:
         endpoint = f"{base_id}/{table_id}/{record_id}"
         payload = {"fields": fields}
         
-        return self._make_request("PATCH", endpoint, json=payload)
+        record = self._make_request("PATCH", endpoint, json=payload)
+        self._index_records(table_name, [record])
+        return record
+    
+    def _write_batches(self, method: str, base_id: str, table_name: str,
+                       records: List[Dict], extra: Optional[Dict] = None) -> List[Dict]:
+        """Send records in chunks of MAX_BATCH_SIZE
+        
+        Returns one result per input record, in order: the Airtable record
+        on success, or {"error": ..., "input": ...} if its chunk failed.
+        """
+        table_id = self.get_table_id(base_id, table_name)
+        if not table_id:
+            raise ValueError(f"Table '{table_name}' not found in base {base_id}")
+        
+        endpoint = f"{base_id}/{table_id}"
+        results = []
+        upsert = bool(extra and "performUpsert" in extra)
+        
+        for start in range(0, len(records), MAX_BATCH_SIZE):
+            chunk = records[start:start + MAX_BATCH_SIZE]
+            payload = {"records": chunk}
+            if extra:
+                payload.update(extra)
+            
+            try:
+                response = self._make_request(method, endpoint, json=payload)
+            except Exception as e:
+                print(f"⚠️ Batch {start // MAX_BATCH_SIZE + 1} failed: {e}")
+                results.extend({"error": str(e), "input": item} for item in chunk)
+                continue
+            
+            created_ids = set(response.get('createdRecords', []))
+            for record in response.get('records', []):
+                # Upserts flag every record - a chunk that only updated
+                # comes back with no createdRecords at all
+                if upsert:
+                    record['created'] = record.get('id') in created_ids
+                results.append(record)
+        
+        self._index_records(table_name, results)
+        return results
+    
+    def create_records(self, base_id: str, table_name: str,
+                       records: List[Dict[str, Any]],
+                       typecast: bool = False) -> List[Dict]:
+        """Create many records (list of field dicts), 10 per request"""
+        extra = {"typecast": True} if typecast else None
+        return self._write_batches("POST", base_id, table_name,
+                                   [{"fields": fields} for fields in records], extra)
+    
+    def update_records(self, base_id: str, table_name: str,
+                       updates: List[Dict[str, Any]],
+                       typecast: bool = False) -> List[Dict]:
+        """Update many records ({"id": ..., "fields": {...}}), 10 per request"""
+        extra = {"typecast": True} if typecast else None
+        return self._write_batches("PATCH", base_id, table_name,
+                                   [{"id": u["id"], "fields": u["fields"]} for u in updates],
+                                   extra)
+    
+    def upsert_records(self, base_id: str, table_name: str,
+                       records: List[Dict[str, Any]],
+                       merge_on: List[str],
+                       typecast: bool = False) -> List[Dict]:
+        """Create or update records matched on merge_on fields (e.g. ["Date"])
+        
+        Each returned record carries "created": True/False.
+        """
+        extra: Dict[str, Any] = {"performUpsert": {"fieldsToMergeOn": list(merge_on)}}
+        if typecast:
+            extra["typecast"] = True
+        return self._write_batches("PATCH", base_id, table_name,
+                                   [{"fields": fields} for fields in records], extra)
     
     def delete_record(self, base_id: str, table_name: str, 
                      record_id: str) -> bool:
@@ -197,31 +535,30 @@ class AirtableClient:
         
         try:
             self._make_request("DELETE", endpoint)
-            return True
         except:
             return False
+        if self.duplicates and table_name in INDEXED_TABLES:
+            self.duplicates.remove(table_name, [record_id])
+        return True
 
 
 # Productivity Base Specific Methods
 class ProductivityAirtableClient(AirtableClient):
     """Client specifically for Productivity base"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        super().__init__(api_key)
+    def __init__(self, api_key: Optional[str] = None,
+                 priority: Optional[int] = None):
+        super().__init__(api_key, priority)
         self.base_id = PRODUCTIVITY_BASE_ID
     
     # TAT Tasks
     def get_tat_tasks(self, category: Optional[str] = None, 
                      status: Optional[str] = None) -> List[Dict]:
         """Get TAT tasks with optional filters"""
-        filters = []
-        
-        if category:
-            filters.append(f"{{Category}} = '{category}'")
-        if status:
-            filters.append(f"{{Status}} = '{status}'")
-        
-        filter_formula = " AND ".join(filters) if filters else None
+        filter_formula = and_(
+            eq("Category", category) if category else None,
+            eq("Status", status) if status else None,
+        )
         
         return self.query_records(self.base_id, "TAT Tasks v2",
                                  filter_formula=filter_formula,
@@ -229,21 +566,16 @@ class ProductivityAirtableClient(AirtableClient):
     
     def get_urgent_tat_tasks(self) -> List[Dict]:
         """Get urgent TAT tasks (Category 1 = Today)"""
-        # Get Category 1 tasks (Today)
-        cat1_tasks = self.get_tat_tasks(category="1")
-        
-        # Get Not Started or In Progress tasks (excluding Complete)
-        active_tasks = self.get_tat_tasks(status="Not Started") + self.get_tat_tasks(status="In Progress")
-        
-        # Combine and deduplicate
-        seen_ids = set()
-        urgent = []
-        for task in cat1_tasks + active_tasks:
-            if task['id'] not in seen_ids:
-                seen_ids.add(task['id'])
-                urgent.append(task)
+        # Category 1 tasks (Today) plus anything Not Started or In Progress,
+        # fetched as one OR query instead of three
+        filter_formula = or_(
+            eq("Category", "1"),
+            in_("Status", ["Not Started", "In Progress"]),
+        )
         
-        return urgent
+        return self.query_records(self.base_id, "TAT Tasks v2",
+                                 filter_formula=filter_formula,
+                                 sort=[{"field": "Due Date", "direction": "asc"}])
     
     def add_tat_task(self, task_name: str, category: str = "7",
                     priority: str = "Medium", notes: str = "",
@@ -277,38 +609,47 @@ class ProductivityAirtableClient(AirtableClient):
     def get_habits(self, days: int = 7) -> List[Dict]:
         """Get habit entries"""
         start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        filter_formula = f"IS_AFTER({{Date}}, '{start_date}')"
+        filter_formula = is_after("Date", start_date)
         
         return self.query_records(self.base_id, "Daily Habits",
                                  filter_formula=filter_formula,
                                  sort=[{"field": "Date", "direction": "desc"}])
     
     def add_habit(self, habit_name: str, completed: bool = True,
-                 date: Optional[str] = None) -> Dict:
-        """Add a habit entry"""
+                 date: Optional[str] = None, on_duplicate: str = "create") -> Dict:
+        """Add a habit entry (on_duplicate as for create_record)"""
         fields = {
             "Habit": habit_name,
             "Completed": completed,
             "Date": date or datetime.now().strftime('%Y-%m-%d')
         }
         
-        return self.create_record(self.base_id, "Daily Habits", fields)
+        return self.create_record(self.base_id, "Daily Habits", fields, on_duplicate)
 
 
 # Health Base Specific Methods
 class HealthAirtableClient(AirtableClient):
     """Client specifically for Health & Nutrition base"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        super().__init__(api_key)
+    def __init__(self, api_key: Optional[str] = None,
+                 priority: Optional[int] = None):
+        super().__init__(api_key, priority)
         self.base_id = HEALTH_BASE_ID
+        self._productivity_client: Optional[ProductivityAirtableClient] = None
+    
+    @property
+    def productivity(self) -> ProductivityAirtableClient:
+        """Productivity client sharing this client's key and connection pool"""
+        if self._productivity_client is None:
+            self._productivity_client = ProductivityAirtableClient(self.api_key, self.priority)
+        return self._productivity_client
     
     # Food Log
     def get_food_entries(self, date: Optional[str] = None, days: int = 7) -> List[Dict]:
         """Get food entries for a date range"""
         # Get last N days and filter locally
         start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        filter_formula = f"{{Date}} >= '{start_date}'"
+        filter_formula = gte("Date", start_date)
         
         records = self.query_records(self.base_id, "Food Log", 
                                  filter_formula=filter_formula,
@@ -323,8 +664,8 @@ class HealthAirtableClient(AirtableClient):
     def add_food_entry(self, food_name: str, calories: Optional[int] = None,
                       protein: Optional[float] = None, carbs: Optional[float] = None,
                       fat: Optional[float] = None, meal_type: str = "Snack",
-                      date: Optional[str] = None) -> Dict:
-        """Add a food entry"""
+                      date: Optional[str] = None, on_duplicate: str = "create") -> Dict:
+        """Add a food entry (on_duplicate as for create_record)"""
         fields = {
             "Food Name": food_name,
             "Meal Type": meal_type,
@@ -339,13 +680,19 @@ class HealthAirtableClient(AirtableClient):
         if fat:
             fields["Fat (g)"] = fat
         
-        return self.create_record(self.base_id, "Food Log", fields)
+        return self.create_record(self.base_id, "Food Log", fields, on_duplicate)
+    
+    def add_food_entries(self, entries: List[Dict[str, Any]]) -> List[Dict]:
+        """Add many food entries (Food Log field dicts), 10 per request"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        records = [{"Date": today, "Meal Type": "Snack", **fields} for fields in entries]
+        return self.create_records(self.base_id, "Food Log", records)
     
     # Weight
     def get_weight_entries(self, days: int = 30) -> List[Dict]:
         """Get weight entries"""
         start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        filter_formula = f"IS_AFTER({{Date}}, '{start_date}')"
+        filter_formula = is_after("Date", start_date)
         
         return self.query_records(self.base_id, "Weight Tracker",
                                  filter_formula=filter_formula,
@@ -367,7 +714,7 @@ class HealthAirtableClient(AirtableClient):
     def get_workouts(self, days: int = 7) -> List[Dict]:
         """Get recent workouts"""
         start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        filter_formula = f"IS_AFTER({{Date}}, '{start_date}')"
+        filter_formula = is_after("Date", start_date)
         
         return self.query_records(self.base_id, "Workouts",
                                  filter_formula=filter_formula,
@@ -392,14 +739,12 @@ class HealthAirtableClient(AirtableClient):
     # Habits - use Productivity base
     def get_habits(self, days: int = 7) -> List[Dict]:
         """Get habit entries from Daily Habits table in Productivity base"""
-        prod_client = ProductivityAirtableClient(self.api_key)
-        return prod_client.get_habits(days=days)
+        return self.productivity.get_habits(days=days)
     
     def add_habit(self, habit_name: str, completed: bool = True,
-                 date: Optional[str] = None) -> Dict:
-        """Add a habit entry"""
-        prod_client = ProductivityAirtableClient(self.api_key)
-        return prod_client.add_habit(habit_name, completed, date)
+                 date: Optional[str] = None, on_duplicate: str = "create") -> Dict:
+        """Add a habit entry (on_duplicate as for create_record)"""
+        return self.productivity.add_habit(habit_name, completed, date, on_duplicate)
     
     # WHOOP Data
     def save_whoop_recovery(self, recovery_score: int, hrv: Optional[float] = None,
@@ -428,16 +773,35 @@ class HealthAirtableClient(AirtableClient):
             fields["Sleep Efficiency"] = efficiency
         
         return self.create_record(self.base_id, "WHOOP Data", fields)
+    
+    def save_whoop_recoveries(self, entries: List[Dict]) -> List[Dict]:
+        """Upsert many WHOOP recovery days at once (merged on Date)
+        
+        entries: [{"date", "recovery_score", "hrv", "resting_hr"}, ...]
+        """
+        records = []
+        for entry in entries:
+            fields = {
+                "Recovery Score": entry["recovery_score"],
+                "Date": entry.get("date") or datetime.now().strftime('%Y-%m-%d')
+            }
+            if entry.get("hrv"):
+                fields["HRV"] = entry["hrv"]
+            if entry.get("resting_hr"):
+                fields["Resting HR"] = entry["resting_hr"]
+            records.append(fields)
+        
+        return self.upsert_records(self.base_id, "WHOOP Data", records, merge_on=["Date"])
 
 
 # Convenience function to get configured client
-def get_health_client() -> HealthAirtableClient:
+def get_health_client(priority: Optional[int] = None) -> HealthAirtableClient:
     """Get configured Health Airtable client"""
-    return HealthAirtableClient()
+    return HealthAirtableClient(priority=priority)
 
-def get_productivity_client() -> ProductivityAirtableClient:
+def get_productivity_client(priority: Optional[int] = None) -> ProductivityAirtableClient:
     """Get configured Productivity Airtable client"""
-    return ProductivityAirtableClient()
+    return ProductivityAirtableClient(priority=priority)
 
 
 if __name__ == "__main__":
@@ -462,6 +826,8 @@ if __name__ == "__main__":
         for table in productivity.get_tables(PRODUCTIVITY_BASE_ID)[:5]:
             print(f"  - {table['name']}")
         
+        print(f"\n🔌 Connection pool: {get_pool_stats()}")
+        print(f"🗄️ Query cache: {get_cache_stats()}")
         print("\n✅ Airtable client working!")
         
     except Exception as e:
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Airtable Formula Helpers
+- Builder for safely escaped filterByFormula expressions
+- Local evaluator that compiles a formula into a Python predicate
+- QueryCoalescer that merges concurrent queries on one table into a single
+  OR(...) request and splits the rows back out per caller
+"""
+
+import re
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# ---------------------------------------------------------------------------
+# Formula builder
+# ---------------------------------------------------------------------------
+
+def field(name: str) -> str:
+    """Field reference, e.g. {Due Date}"""
+    if '{' in name or '}' in name:
+        raise ValueError(f"Field name cannot contain braces: {name!r}")
+    return f"{{{name}}}"
+
+
+def quote(value: Any) -> str:
+    """Formula literal for a Python value"""
+    if value is None:
+        return "BLANK()"
+    if isinstance(value, bool):
+        return "TRUE()" if value else "FALSE()"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, date):
+        value = value.strftime('%Y-%m-%d')
+    text = str(value).replace('\\', '\\\\').replace("'", "\\'")
+    return f"'{text}'"
+
+
+def _compare_expr(op: str):
+    return lambda name, value: f"{field(name)}{op}{quote(value)}"
+
+
+eq = _compare_expr('=')
+ne = _compare_expr('!=')
+gt = _compare_expr('>')
+gte = _compare_expr('>=')
+lt = _compare_expr('<')
+lte = _compare_expr('<=')
+
+
+def and_(*exprs: Optional[str]) -> Optional[str]:
+    """AND of the non-empty expressions (None if there are none)"""
+    parts = [e for e in exprs if e]
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else f"AND({', '.join(parts)})"
+
+
+def or_(*exprs: Optional[str]) -> Optional[str]:
+    """OR of the non-empty expressions (None if there are none)"""
+    parts = [e for e in exprs if e]
+    if not parts:
+        return None
+    return parts[0] if len(parts) == 1 else f"OR({', '.join(parts)})"
+
+
+def not_(expr: str) -> str:
+    return f"NOT({expr})"
+
+
+def in_(name: str, values: List[Any]) -> Optional[str]:
+    """Field equals any of the values"""
+    return or_(*(eq(name, v) for v in values))
+
+
+def is_after(name: str, value: Any) -> str:
+    return f"IS_AFTER({field(name)}, {quote(value)})"
+
+
+def is_before(name: str, value: Any) -> str:
+    return f"IS_BEFORE({field(name)}, {quote(value)})"
+
+
+def is_same(name: str, value: Any, unit: str = 'day') -> str:
+    return f"IS_SAME({field(name)}, {quote(value)}, {quote(unit)})"
+
+
+def between(name: str, start: Any, end: Any) -> str:
+    """start < field < end (exclusive, like IS_AFTER/IS_BEFORE)"""
+    return and_(is_after(name, start), is_before(name, end))
+
+
+# ---------------------------------------------------------------------------
+# Local evaluation
+# ---------------------------------------------------------------------------
+
+def _parse_iso(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+
+class UnsupportedFormula(ValueError):
+    """Formula uses syntax the local evaluator doesn't implement"""
+
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<field>\{[^}]*\})
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<number>\d+(?:\.\d+)?)
+      | (?P<op>!=|>=|<=|=|>|<|&)
+      | (?P<punct>[(),])
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )""", re.VERBOSE)
+
+
+def _tokenize(formula: str) -> List[tuple]:
+    tokens = []
+    pos = 0
+    formula = formula.strip()
+    while pos < len(formula):
+        match = _TOKEN_RE.match(formula, pos)
+        if not match or match.end() == pos:
+            raise UnsupportedFormula(f"Cannot parse formula near: {formula[pos:pos + 20]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'string':
+            text = re.sub(r"\\(.)", r"\1", text[1:-1])
+        elif kind == 'field':
+            text = text[1:-1]
+        tokens.append((kind, text))
+        pos = match.end()
+    return tokens
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return ', '.join(str(v) for v in value)
+    return str(value)
+
+
+def _blank_for(other: Any) -> Any:
+    """Value a blank field compares as, given the other operand"""
+    if isinstance(other, bool):
+        return False
+    if isinstance(other, (int, float)):
+        return 0
+    return ''
+
+
+def _coerce_pair(a: Any, b: Any):
+    if a is None:
+        a = _blank_for(b)
+    if b is None:
+        b = _blank_for(a)
+    if isinstance(a, (int, float)) and isinstance(b, str):
+        try:
+            b = float(b)
+        except ValueError:
+            a = str(a)
+    elif isinstance(b, (int, float)) and isinstance(a, str):
+        try:
+            a = float(a)
+        except ValueError:
+            b = str(b)
+    if isinstance(a, list):
+        a = ', '.join(str(v) for v in a)
+    if isinstance(b, list):
+        b = ', '.join(str(v) for v in b)
+    return a, b
+
+
+def _compare(op: str, a: Any, b: Any) -> bool:
+    a, b = _coerce_pair(a, b)
+    try:
+        if op == '=':
+            return a == b
+        if op == '!=':
+            return a != b
+        if op == '>':
+            return a > b
+        if op == '<':
+            return a < b
+        if op == '>=':
+            return a >= b
+        if op == '<=':
+            return a <= b
+    except TypeError:
+        return False
+    raise UnsupportedFormula(f"Unknown operator {op}")
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if not value or not isinstance(value, str):
+        return None
+    dt = _parse_iso(value if 'T' in value else f"{value}T00:00:00")
+    if dt is not None and dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _date_fn(name: str, args: List[Any]) -> bool:
+    a = _as_datetime(args[0])
+    b = _as_datetime(args[1]) if len(args) > 1 else None
+    if a is None or b is None:
+        return False
+    if name == 'IS_AFTER':
+        return a > b
+    if name == 'IS_BEFORE':
+        return a < b
+    unit = (args[2] if len(args) > 2 else '').lower()
+    if unit in ('day', 'days'):
+        return a.date() == b.date()
+    if unit in ('month', 'months'):
+        return (a.year, a.month) == (b.year, b.month)
+    if unit in ('year', 'years'):
+        return a.year == b.year
+    return a == b
+
+
+_FUNCTIONS: Dict[str, Callable[[List[Any]], Any]] = {
+    'AND': lambda args: all(bool(a) for a in args),
+    'OR': lambda args: any(bool(a) for a in args),
+    'NOT': lambda args: not args[0],
+    'TRUE': lambda args: True,
+    'FALSE': lambda args: False,
+    'BLANK': lambda args: None,
+    'LOWER': lambda args: str(args[0] or '').lower(),
+    'UPPER': lambda args: str(args[0] or '').upper(),
+    'LEN': lambda args: len(str(args[0] or '')),
+    'FIND': lambda args: (str(args[1] or '').find(str(args[0])) + 1) if args[0] else 0,
+    'IS_AFTER': lambda args: _date_fn('IS_AFTER', args),
+    'IS_BEFORE': lambda args: _date_fn('IS_BEFORE', args),
+    'IS_SAME': lambda args: _date_fn('IS_SAME', args),
+}
+
+
+class _Parser:
+    """Recursive-descent parser turning a formula into a predicate"""
+
+    def __init__(self, tokens: List[tuple]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, text=None):
+        tok = self.peek()
+        if tok[0] is None or (kind and tok[0] != kind) or (text and tok[1] != text):
+            raise UnsupportedFormula(f"Unexpected token {tok[1]!r}")
+        self.pos += 1
+        return tok
+
+    def parse(self):
+        node = self.comparison()
+        if self.pos != len(self.tokens):
+            raise UnsupportedFormula(f"Trailing input at {self.peek()[1]!r}")
+        return node
+
+    def comparison(self):
+        left = self.concat()
+        while self.peek()[0] == 'op' and self.peek()[1] != '&':
+            op = self.take()[1]
+            right = self.concat()
+            left = (lambda l, r, o: lambda f: _compare(o, l(f), r(f)))(left, right, op)
+        return left
+
+    def concat(self):
+        left = self.primary()
+        while self.peek() == ('op', '&'):
+            self.take()
+            right = self.primary()
+            left = (lambda l, r: lambda f: _text(l(f)) + _text(r(f)))(left, right)
+        return left
+
+    def primary(self):
+        kind, text = self.take()
+        if kind == 'string':
+            return lambda f, v=text: v
+        if kind == 'number':
+            value = float(text) if '.' in text else int(text)
+            return lambda f, v=value: v
+        if kind == 'field':
+            return lambda f, n=text: f.get(n)
+        if kind == 'punct' and text == '(':
+            node = self.comparison()
+            self.take('punct', ')')
+            return node
+        if kind == 'name':
+            if self.peek() == ('punct', '('):
+                return self.call(text.upper())
+            # Bare field reference, e.g. Date='2026-02-12'
+            return lambda f, n=text: f.get(n)
+        raise UnsupportedFormula(f"Unexpected token {text!r}")
+
+    def call(self, name: str):
+        fn = _FUNCTIONS.get(name)
+        if fn is None:
+            raise UnsupportedFormula(f"Function {name}() not supported locally")
+        self.take('punct', '(')
+        args = []
+        if self.peek() != ('punct', ')'):
+            args.append(self.comparison())
+            while self.peek() == ('punct', ','):
+                self.take()
+                args.append(self.comparison())
+        self.take('punct', ')')
+        return lambda f: fn([a(f) for a in args])
+
+
+def compile_formula(formula: Optional[str]) -> Callable[[Dict], bool]:
+    """Compile a filterByFormula string into a predicate over record fields
+
+    Raises UnsupportedFormula for syntax the local evaluator can't handle.
+    """
+    if not formula or not formula.strip():
+        return lambda fields: True
+    node = _Parser(_tokenize(formula)).parse()
+    return lambda fields: bool(node(fields))
+
+
+
+def _sort_key(value: Any):
+    """Sort blanks first, numbers before text"""
+    if value is None or value == '':
+        return (0, 0, '')
+    if isinstance(value, bool):
+        return (1, int(value), '')
+    if isinstance(value, (int, float)):
+        return (1, value, '')
+    return (2, 0, str(value))
+
+
+def sort_records(records: List[Dict], sort: Optional[List[Dict]]) -> List[Dict]:
+    """Sort records in place the way Airtable's sort[] param would"""
+    for sort_item in reversed(sort or []):
+        name = sort_item.get('field')
+        if name:
+            records.sort(key=lambda r: _sort_key(r['fields'].get(name)),
+                         reverse=sort_item.get('direction', 'asc').startswith('desc'))
+    return records
+
+
+def project_fields(record: Dict, fields: Optional[List[str]]) -> Dict:
+    """Copy of a record keeping only the requested fields"""
+    if not fields:
+        return record
+    return {**record, 'fields': {k: v for k, v in record['fields'].items() if k in fields}}
+
+
+# ---------------------------------------------------------------------------
+# Query coalescing
+# ---------------------------------------------------------------------------
+
+class _PendingQuery:
+    def __init__(self, formula, predicate, sort, fields):
+        self.formula = formula
+        self.predicate = predicate
+        self.sort = sort
+        self.fields = fields
+        self.result: Optional[List[Dict]] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class QueryCoalescer:
+    """Merge concurrent queries on the same table into one OR(...) request
+
+    Callers on different threads that query the same table within `window`
+    seconds share a single request; each gets back only its own rows,
+    filtered, sorted and projected client-side.
+    """
+
+    def __init__(self, client, window: float = 0.01):
+        self.client = client
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], List[_PendingQuery]] = {}
+        self.stats = {"queries": 0, "requests": 0}
+
+    def query(self, base_id: str, table_name: str,
+              filter_formula: Optional[str] = None,
+              sort: Optional[List[Dict]] = None,
+              fields: Optional[List[str]] = None) -> List[Dict]:
+        try:
+            predicate = compile_formula(filter_formula)
+        except UnsupportedFormula:
+            return self.client.query_records(base_id, table_name, filter_formula=filter_formula,
+                                             sort=sort, fields=fields)
+
+        item = _PendingQuery(filter_formula, predicate, sort, fields)
+        key = (base_id, table_name)
+        with self._lock:
+            self.stats["queries"] += 1
+            batch = self._pending.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._pending[key] = []
+            batch.append(item)
+
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                batch = self._pending.pop(key)
+            self._execute(base_id, table_name, batch)
+
+        item.done.wait()
+        if item.error:
+            raise item.error
+        return item.result
+
+    def query_many(self, base_id: str, table_name: str,
+                   formulas: List[Optional[str]],
+                   sort: Optional[List[Dict]] = None,
+                   fields: Optional[List[str]] = None) -> List[List[Dict]]:
+        """Run several filters on one table as a single request"""
+        try:
+            batch = [_PendingQuery(f, compile_formula(f), sort, fields) for f in formulas]
+        except UnsupportedFormula:
+            return [self.client.query_records(base_id, table_name, filter_formula=f,
+                                              sort=sort, fields=fields) for f in formulas]
+        with self._lock:
+            self.stats["queries"] += len(batch)
+        self._execute(base_id, table_name, batch)
+        for item in batch:
+            if item.error:
+                raise item.error
+        return [item.result for item in batch]
+
+    def _execute(self, base_id: str, table_name: str, batch: List[_PendingQuery]):
+        """Fetch once for the whole batch and hand each caller its rows"""
+        with self._lock:
+            self.stats["requests"] += 1
+        try:
+            if len(batch) == 1:
+                item = batch[0]
+                item.result = self.client.query_records(base_id, table_name,
+                                                        filter_formula=item.formula,
+                                                        sort=item.sort, fields=item.fields)
+                return
+
+            formulas = list(dict.fromkeys(item.formula for item in batch))
+            combined = None if any(not f for f in formulas) else or_(*formulas)
+            # Filters may reference fields callers didn't ask for, so fetch
+            # every field and project per caller
+            records = self.client.query_records(base_id, table_name, filter_formula=combined)
+
+            for item in batch:
+                rows = [r for r in records if item.predicate(r['fields'])]
+                sort_records(rows, item.sort)
+                item.result = [project_fields(r, item.fields) for r in rows]
+        except BaseException as e:
+            for item in batch:
+                item.error = e
+        finally:
+            for item in batch:
+                item.done.set()
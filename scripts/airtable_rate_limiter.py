@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Airtable Rate Limiter
+Token bucket shared by every process on the machine (via a lock file),
+so cron jobs, fetch scripts and the webhook server never exceed
+Airtable's 5 requests/second per base between them.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+# Airtable allows 5 req/s per base; a 429 costs a 30s penalty
+DEFAULT_RATE = 5.0
+DEFAULT_CAPACITY = 5.0
+PENALTY_SECONDS = 30
+
+STATE_DIR = os.path.expanduser("~/.openclaw/ratelimit")
+
+# Priorities - lower number goes first
+PRIORITY_HIGH = 0     # webhook writes
+PRIORITY_NORMAL = 1   # scripts, syncs
+PRIORITY_LOW = 2      # dashboard / report reads
+
+# Tokens each priority must leave in the bucket for higher priorities
+RESERVED_TOKENS = {
+    PRIORITY_HIGH: 0.0,
+    PRIORITY_NORMAL: 1.0,
+    PRIORITY_LOW: 2.0,
+}
+
+
+class TokenBucketLimiter:
+    """Cross-process token bucket keyed by name (e.g. an Airtable base ID)"""
+
+    def __init__(self, key: str, rate: float = DEFAULT_RATE,
+                 capacity: float = DEFAULT_CAPACITY,
+                 state_dir: str = STATE_DIR):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self.state_file = os.path.join(state_dir, f"{key}.json")
+        self.lock_file = os.path.join(state_dir, f"{key}.lock")
+        self._thread_lock = threading.Lock()
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _locked(self, fn):
+        """Run fn(state) -> result while holding the process and file locks"""
+        with self._thread_lock:
+            with open(self.lock_file, 'a') as lock:
+                if HAS_FCNTL:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    state = self._read_state()
+                    result = fn(state)
+                    self._write_state(state)
+                    return result
+                finally:
+                    if HAS_FCNTL:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_state(self) -> Dict:
+        """Load bucket state, refilled up to now"""
+        now = time.time()
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            state = {"tokens": self.capacity, "updated": now, "blocked_until": 0}
+
+        elapsed = max(now - state.get("updated", now), 0)
+        state["tokens"] = min(self.capacity, state.get("tokens", 0) + elapsed * self.rate)
+        state["updated"] = now
+        return state
+
+    def _write_state(self, state: Dict):
+        """Persist bucket state atomically"""
+        tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_file, self.state_file)
+
+    def acquire(self, priority: int = PRIORITY_NORMAL,
+                timeout: Optional[float] = None) -> float:
+        """Block until a request may be sent; returns seconds waited"""
+        reserve = RESERVED_TOKENS.get(priority, RESERVED_TOKENS[PRIORITY_LOW])
+        started = time.time()
+
+        def take(state):
+            now = time.time()
+            if state.get("blocked_until", 0) > now:
+                return state["blocked_until"] - now
+            if state["tokens"] >= 1 + reserve:
+                state["tokens"] -= 1
+                return 0.0
+            return (1 + reserve - state["tokens"]) / self.rate
+
+        while True:
+            wait = self._locked(take)
+            if wait <= 0:
+                return time.time() - started
+            if timeout is not None and time.time() - started + wait > timeout:
+                raise TimeoutError(f"Rate limiter for {self.key} timed out after {timeout}s")
+            time.sleep(wait)
+
+    def penalize(self, seconds: float = PENALTY_SECONDS):
+        """Block every process for this key (call after a 429)"""
+        def block(state):
+            state["blocked_until"] = max(state.get("blocked_until", 0), time.time() + seconds)
+            state["tokens"] = 0
+        self._locked(block)
+
+
+_limiters: Dict[str, TokenBucketLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(key: str) -> TokenBucketLimiter:
+    """Get the shared limiter for a key (one instance per process)"""
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucketLimiter(key)
+            _limiters[key] = limiter
+        return limiter
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Airtable Local Replica
+Mirrors the Health and Productivity tables into a local SQLite (WAL)
+database and serves reads from it.
+
+Sync is incremental: each run only pulls records whose
+LAST_MODIFIED_TIME() is after the table's stored watermark. A full
+refresh runs once a day to pick up deletions.
+
+Usage:
+    python3 airtable_replica.py sync [--full]
+    python3 airtable_replica.py status
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from airtable_client import (
+    AirtableClient, HealthAirtableClient, ProductivityAirtableClient,
+    HEALTH_BASE_ID, PRODUCTIVITY_BASE_ID, MAX_PAGE_SIZE, PRIORITY_LOW
+)
+from airtable_formula import (
+    UnsupportedFormula, compile_formula, project_fields, sort_records
+)
+
+REPLICA_DB = os.path.expanduser("~/.openclaw/airtable_replica.db")
+
+# Tables mirrored locally
+REPLICATED_TABLES = {
+    HEALTH_BASE_ID: ["Food Log", "Weight Tracker", "Workouts", "WHOOP Data"],
+    PRODUCTIVITY_BASE_ID: ["TAT Tasks v2", "Daily Habits"],
+}
+
+# Overlap each incremental window to absorb clock skew
+WATERMARK_SKEW = timedelta(minutes=2)
+
+# Full refresh (catches deleted records) at least this often
+FULL_SYNC_INTERVAL = timedelta(hours=24)
+
+# Reads go back to the API when a table's last sync is older than this
+# (three runs of the 10-minute sync cron)
+MAX_STALENESS = timedelta(minutes=30)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    base_id TEXT NOT NULL,
+    table_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    created_time TEXT,
+    synced_at TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    PRIMARY KEY (base_id, table_id, record_id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    base_id TEXT NOT NULL,
+    table_id TEXT NOT NULL,
+    table_name TEXT,
+    watermark TEXT,
+    last_full_sync TEXT,
+    record_count INTEGER DEFAULT 0,
+    PRIMARY KEY (base_id, table_id)
+);
+"""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _parse_iso(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Replica storage and sync
+# ---------------------------------------------------------------------------
+
+class AirtableReplica:
+    """SQLite mirror of Airtable tables"""
+
+    def __init__(self, db_path: str = REPLICA_DB):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def get_state(self, base_id: str, table_id: str) -> Optional[Dict]:
+        """Sync state for a table, or None if never synced"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT table_name, watermark, last_full_sync, record_count "
+                "FROM sync_state WHERE base_id=? AND table_id=?",
+                (base_id, table_id)).fetchone()
+        if not row:
+            return None
+        return {"table_name": row[0], "watermark": row[1],
+                "last_full_sync": row[2], "record_count": row[3]}
+
+    def upsert(self, base_id: str, table_id: str, records: List[Dict]):
+        """Insert or replace records (as returned by the Airtable API)"""
+        now = _iso(_utcnow())
+        rows = [(base_id, table_id, r['id'], r.get('createdTime'), now,
+                 json.dumps(r.get('fields', {})))
+                for r in records if r.get('id')]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO records "
+                "(base_id, table_id, record_id, created_time, synced_at, fields) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def delete(self, base_id: str, table_id: str, record_ids: List[str]):
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "DELETE FROM records WHERE base_id=? AND table_id=? AND record_id=?",
+                [(base_id, table_id, rid) for rid in record_ids])
+
+    def records(self, base_id: str, table_id: str) -> Iterator[Dict]:
+        """All replicated records for a table, in Airtable's record shape"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT record_id, created_time, fields FROM records "
+                "WHERE base_id=? AND table_id=?", (base_id, table_id)).fetchall()
+        for record_id, created_time, fields in rows:
+            yield {"id": record_id, "createdTime": created_time, "fields": json.loads(fields)}
+
+    def sync_table(self, client: AirtableClient, base_id: str, table_name: str,
+                   full: bool = False) -> Dict:
+        """Pull changes for one table; returns sync stats"""
+        table_id = client.get_table_id(base_id, table_name)
+        if not table_id:
+            raise ValueError(f"Table '{table_name}' not found in base {base_id}")
+
+        state = self.get_state(base_id, table_id) or {}
+        started = _utcnow()
+        last_full = _parse_iso(state.get('last_full_sync') or '')
+        if not state.get('watermark') or not last_full or started - last_full > FULL_SYNC_INTERVAL:
+            full = True
+
+        formula = None
+        if not full:
+            formula = f"IS_AFTER(LAST_MODIFIED_TIME(), '{state['watermark']}')"
+
+        seen_ids = []
+        batch = []
+        for record in client.iter_records(base_id, table_id, filter_formula=formula):
+            seen_ids.append(record['id'])
+            batch.append(record)
+            if len(batch) >= 500:
+                self.upsert(base_id, table_id, batch)
+                batch = []
+        if batch:
+            self.upsert(base_id, table_id, batch)
+
+        deleted = 0
+        if full:
+            with self._lock:
+                local_ids = {row[0] for row in self.conn.execute(
+                    "SELECT record_id FROM records WHERE base_id=? AND table_id=?",
+                    (base_id, table_id))}
+            stale = list(local_ids - set(seen_ids))
+            if stale:
+                self.delete(base_id, table_id, stale)
+            deleted = len(stale)
+
+        with self._lock, self.conn:
+            count = self.conn.execute(
+                "SELECT COUNT(*) FROM records WHERE base_id=? AND table_id=?",
+                (base_id, table_id)).fetchone()[0]
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state "
+                "(base_id, table_id, table_name, watermark, last_full_sync, record_count) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (base_id, table_id, table_name, _iso(started - WATERMARK_SKEW),
+                 _iso(started) if full else state.get('last_full_sync'), count))
+
+        return {"table": table_name, "mode": "full" if full else "incremental",
+                "pulled": len(seen_ids), "deleted": deleted, "total": count}
+
+    def sync_all(self, client: Optional[AirtableClient] = None, full: bool = False,
+                 tables: Optional[Dict[str, List[str]]] = None) -> List[Dict]:
+        """Sync every replicated table"""
+        client = client or AirtableClient(priority=PRIORITY_LOW)
+        results = []
+        for base_id, table_names in (tables or REPLICATED_TABLES).items():
+            for table_name in table_names:
+                try:
+                    results.append(self.sync_table(client, base_id, table_name, full=full))
+                except Exception as e:
+                    results.append({"table": table_name, "error": str(e)})
+        return results
+
+
+_replica: Optional[AirtableReplica] = None
+_replica_lock = threading.Lock()
+
+
+def get_replica(db_path: str = REPLICA_DB) -> AirtableReplica:
+    """Shared replica handle for this process"""
+    global _replica
+    with _replica_lock:
+        if _replica is None or _replica.db_path != db_path:
+            _replica = AirtableReplica(db_path)
+        return _replica
+
+
+# ---------------------------------------------------------------------------
+# Clients reading from the replica
+# ---------------------------------------------------------------------------
+
+class ReplicaClient(AirtableClient):
+    """AirtableClient that serves reads from the local replica
+
+    Tables that were never synced or last synced over MAX_STALENESS ago,
+    and formulas the local evaluator can't handle, fall through to the
+    Airtable API. Writes go to Airtable and are mirrored into the replica.
+    """
+
+    def __init__(self, api_key: Optional[str] = None,
+                 priority: Optional[int] = None,
+                 db_path: str = REPLICA_DB):
+        super().__init__(api_key, priority)
+        self.replica = get_replica(db_path)
+
+    def iter_records(self, base_id: str, table_name: str,
+                     filter_formula: Optional[str] = None,
+                     sort: Optional[List[Dict]] = None,
+                     fields: Optional[List[str]] = None,
+                     page_size: int = MAX_PAGE_SIZE,
+                     max_records: Optional[int] = None,
+                     by_field_id: bool = False) -> Iterator[Dict]:
+        table_id = self.get_table_id(base_id, table_name)
+        predicate = None
+        # The replica stores fields by name, so field-ID reads go to the API
+        if table_id and not by_field_id and self._is_fresh(base_id, table_id):
+            try:
+                predicate = compile_formula(filter_formula)
+            except UnsupportedFormula:
+                predicate = None
+
+        if predicate is None:
+            yield from super().iter_records(base_id, table_name, filter_formula,
+                                            sort, fields, page_size, max_records,
+                                            by_field_id)
+            return
+
+        records = [r for r in self.replica.records(base_id, table_id)
+                   if predicate(r['fields'])]
+        sort_records(records, sort)
+        if max_records:
+            records = records[:max_records]
+        for record in records:
+            yield project_fields(record, fields)
+
+    def _is_fresh(self, base_id: str, table_id: str) -> bool:
+        """Synced within MAX_STALENESS (the watermark trails the sync start by WATERMARK_SKEW)"""
+        state = self.replica.get_state(base_id, table_id)
+        watermark = _parse_iso((state or {}).get('watermark') or '')
+        return bool(watermark) and _utcnow() - watermark <= MAX_STALENESS + WATERMARK_SKEW
+
+    def _mirror(self, base_id: str, table_name: str, records: List[Dict]):
+        table_id = self.get_table_id(base_id, table_name)
+        if table_id and self.replica.get_state(base_id, table_id):
+            self.replica.upsert(base_id, table_id, [r for r in records if 'id' in r])
+
+    def create_record(self, base_id: str, table_name: str, fields: Dict[str, Any],
+                      **kwargs) -> Dict:
+        record = super().create_record(base_id, table_name, fields, **kwargs)
+        self._mirror(base_id, table_name, [record])
+        return record
+
+    def update_record(self, base_id: str, table_name: str,
+                      record_id: str, fields: Dict[str, Any]) -> Dict:
+        record = super().update_record(base_id, table_name, record_id, fields)
+        self._mirror(base_id, table_name, [record])
+        return record
+
+    def delete_record(self, base_id: str, table_name: str, record_id: str) -> bool:
+        deleted = super().delete_record(base_id, table_name, record_id)
+        table_id = self.get_table_id(base_id, table_name)
+        if deleted and table_id:
+            self.replica.delete(base_id, table_id, [record_id])
+        return deleted
+
+    def _write_batches(self, method: str, base_id: str, table_name: str,
+                       records: List[Dict], extra: Optional[Dict] = None) -> List[Dict]:
+        results = super()._write_batches(method, base_id, table_name, records, extra)
+        self._mirror(base_id, table_name, results)
+        return results
+
+
+class ReplicaProductivityClient(ReplicaClient, ProductivityAirtableClient):
+    """Productivity client reading from the local replica"""
+
+
+class ReplicaHealthClient(ReplicaClient, HealthAirtableClient):
+    """Health client reading from the local replica"""
+
+    @property
+    def productivity(self) -> ProductivityAirtableClient:
+        if self._productivity_client is None:
+            self._productivity_client = ReplicaProductivityClient(
+                self.api_key, self.priority, self.replica.db_path)
+        return self._productivity_client
+
+
+def get_replica_health_client(priority: Optional[int] = None) -> ReplicaHealthClient:
+    """Health client with replica-backed reads"""
+    return ReplicaHealthClient(priority=priority)
+
+
+def get_replica_productivity_client(priority: Optional[int] = None) -> ReplicaProductivityClient:
+    """Productivity client with replica-backed reads"""
+    return ReplicaProductivityClient(priority=priority)
+
+
+def print_status(replica: AirtableReplica):
+    """Print per-table replica state"""
+    with replica._lock:
+        rows = replica.conn.execute(
+            "SELECT base_id, table_name, record_count, watermark, last_full_sync "
+            "FROM sync_state ORDER BY base_id, table_name").fetchall()
+    if not rows:
+        print("ℹ️  Replica is empty - run: python3 airtable_replica.py sync")
+        return
+    for base_id, table_name, count, watermark, last_full in rows:
+        print(f"  {base_id} {table_name:<16} {count:>6} records  "
+              f"watermark {watermark}  full {last_full}")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "sync"
+    replica = get_replica()
+
+    if command == "sync":
+        full = "--full" in sys.argv
+        print(f"🔄 Syncing Airtable replica ({'full' if full else 'incremental'})...")
+        for result in replica.sync_all(full=full):
+            if 'error' in result:
+                print(f"  ❌ {result['table']}: {result['error']}")
+            else:
+                print(f"  ✅ {result['table']}: {result['pulled']} pulled ({result['mode']}), "
+                      f"{result['deleted']} deleted, {result['total']} total")
+    elif command == "status":
+        print(f"📦 Replica: {replica.db_path}")
+        print_status(replica)
+    else:
+        print(__doc__)
+        sys.exit(1)
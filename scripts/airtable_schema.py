@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Airtable Schema Registry
+Table and field name <-> ID maps for every base, loaded with one
+meta/bases/{id}/tables call per base and kept in a compact cache file.
+
+Entries expire after SCHEMA_TTL. Looking up an unknown table or field
+refreshes that base once (rate limited by MIN_REFRESH_INTERVAL), and each
+refresh records a schema version hash so callers can tell when tables
+or fields were renamed, added or removed. If a refresh fails, the expired
+entry keeps being served (the meta call is retried at most once per
+MIN_REFRESH_INTERVAL).
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+SCHEMA_CACHE_FILE = os.path.expanduser("~/.openclaw/workspace/.airtable_schema_cache.json")
+
+# Schemas change rarely; refetch once a day
+SCHEMA_TTL = 24 * 3600
+
+# Don't refetch a base more often than this when chasing unknown names
+MIN_REFRESH_INTERVAL = 60
+
+# Fetcher signature: base_id -> list of table dicts from the meta API
+TablesFetcher = Callable[[str], List[Dict]]
+
+
+def schema_version(tables: List[Dict]) -> str:
+    """Stable hash of a base's table and field names/IDs"""
+    shape = sorted(
+        (t['id'], t['name'], sorted((f['id'], f['name']) for f in t.get('fields', [])))
+        for t in tables
+    )
+    return hashlib.sha1(json.dumps(shape).encode('utf-8')).hexdigest()[:12]
+
+
+class SchemaRegistry:
+    """Process-wide cache of Airtable table and field IDs"""
+
+    def __init__(self, path: str = SCHEMA_CACHE_FILE, ttl: float = SCHEMA_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._bases: Dict[str, Dict] = {}
+        self._failed_at: Dict[str, float] = {}  # base -> last failed refresh
+        self._lock = threading.RLock()
+        self.stats = {"refreshes": 0, "version_changes": 0}
+        self._load()
+
+    # Persistence
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if isinstance(data.get('bases'), dict):
+            self._bases = data['bases']
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"bases": self._bases}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    # Loading
+    def _is_fresh(self, base_id: str) -> bool:
+        entry = self._bases.get(base_id)
+        return bool(entry) and time.time() - entry.get('fetched_at', 0) < self.ttl
+
+    def refresh(self, fetch_tables: TablesFetcher, base_id: str) -> bool:
+        """Refetch one base's schema; returns True if its version changed"""
+        tables = fetch_tables(base_id)
+        version = schema_version(tables)
+        entry = {
+            "fetched_at": time.time(),
+            "version": version,
+            "tables": {
+                t['name']: {
+                    "id": t['id'],
+                    "fields": {f['name']: f['id'] for f in t.get('fields', [])},
+                }
+                for t in tables
+            },
+        }
+        with self._lock:
+            previous = self._bases.get(base_id, {}).get('version')
+            self._bases[base_id] = entry
+            self.stats["refreshes"] += 1
+            changed = previous is not None and previous != version
+            if changed:
+                self.stats["version_changes"] += 1
+            self._save()
+        return changed
+
+    def preload(self, fetch_tables: TablesFetcher, base_ids: Iterable[str],
+                force: bool = False) -> Dict[str, bool]:
+        """Make sure every base is loaded; returns {base_id: version_changed}"""
+        changes = {}
+        for base_id in base_ids:
+            with self._lock:
+                needed = force or not self._is_fresh(base_id)
+            changes[base_id] = self.refresh(fetch_tables, base_id) if needed else False
+        return changes
+
+    def version(self, base_id: str) -> Optional[str]:
+        return self._bases.get(base_id, {}).get('version')
+
+    # Lookups
+    def _table(self, fetch_tables: TablesFetcher, base_id: str,
+               table_name: str) -> Optional[Dict]:
+        """Table entry by name or ID, refreshing on stale or unknown names"""
+        with self._lock:
+            if not self._is_fresh(base_id):
+                self._refresh_or_keep(fetch_tables, base_id)
+            entry = self._bases[base_id]
+            table = self._find_table(entry, table_name)
+            if table is None and time.time() - entry['fetched_at'] > MIN_REFRESH_INTERVAL:
+                self._refresh_or_keep(fetch_tables, base_id)
+                table = self._find_table(self._bases[base_id], table_name)
+            return table
+
+    def _refresh_or_keep(self, fetch_tables: TablesFetcher, base_id: str):
+        """Refresh a base, falling back to its expired entry if the fetch fails
+
+        Raises only when there is no entry to fall back to.
+        """
+        if base_id in self._bases and \
+                time.time() - self._failed_at.get(base_id, 0) < MIN_REFRESH_INTERVAL:
+            return  # failed moments ago - don't retry on every lookup
+        try:
+            self.refresh(fetch_tables, base_id)
+            self._failed_at.pop(base_id, None)
+        except Exception as e:
+            if base_id not in self._bases:
+                raise
+            self._failed_at[base_id] = time.time()
+            print(f"⚠️ Schema refresh failed for {base_id}, using cached schema: {e}")
+
+    @staticmethod
+    def _find_table(entry: Dict, table_name: str) -> Optional[Dict]:
+        table = entry['tables'].get(table_name)
+        if table is None and table_name.startswith('tbl'):
+            table = next((t for t in entry['tables'].values() if t['id'] == table_name), None)
+        return table
+
+    def table_id(self, fetch_tables: TablesFetcher, base_id: str,
+                 table_name: str) -> Optional[str]:
+        """Table ID by name (IDs pass through)"""
+        if table_name.startswith('tbl'):
+            return table_name
+        table = self._table(fetch_tables, base_id, table_name)
+        return table['id'] if table else None
+
+    def field_ids(self, fetch_tables: TablesFetcher, base_id: str, table_name: str,
+                  field_names: Iterable[str]) -> List[str]:
+        """Field IDs for field names, in order (IDs pass through)
+
+        Raises KeyError for a field the table doesn't have.
+        """
+        field_names = list(field_names)
+        table = self._table(fetch_tables, base_id, table_name)
+        if table is None:
+            raise KeyError(f"Table '{table_name}' not found in base {base_id}")
+        fields = table['fields']
+        missing = [n for n in field_names if n not in fields and not n.startswith('fld')]
+        if missing:
+            with self._lock:
+                if time.time() - self._bases[base_id]['fetched_at'] > MIN_REFRESH_INTERVAL:
+                    self._refresh_or_keep(fetch_tables, base_id)
+                    table = self._find_table(self._bases[base_id], table_name) or table
+                    fields = table['fields']
+            missing = [n for n in field_names if n not in fields and not n.startswith('fld')]
+            if missing:
+                raise KeyError(f"Fields {missing} not found in table '{table_name}'")
+        return [fields.get(n, n) for n in field_names]
+
+    def field_names(self, fetch_tables: TablesFetcher, base_id: str,
+                    table_name: str) -> Dict[str, str]:
+        """{field_id: field_name} for a table"""
+        table = self._table(fetch_tables, base_id, table_name)
+        if table is None:
+            raise KeyError(f"Table '{table_name}' not found in base {base_id}")
+        return {fid: name for name, fid in table['fields'].items()}
+
+    def clear(self):
+        with self._lock:
+            self._bases.clear()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+_default_registry: Optional[SchemaRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_schema_registry() -> SchemaRegistry:
+    """Process-wide registry shared by every AirtableClient"""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = SchemaRegistry()
+        return _default_registry
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Robust Airtable Sync - Two Functions:
-1. Sync local data to Airtable (verify what's actually there)
+1. Push unsynced local changes (change journal) to Airtable
 2. Retry Edamam API for meals missing nutrition data
 
 Runs at: 3pm, 8pm, 11pm via cron
@@ -13,6 +13,13 @@ import json
 import re
 import requests
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from airtable_client import AirtableClient
+from airtable_formula import and_, eq, field, gte, lte, or_, quote
+from change_journal import get_journal, DATA_DIR, HABIT_CHECKBOXES, OP_ADD_MEAL, OP_SET_HABITS
 
 def get_today():
     """Get today's date in YYYY-MM-DD format"""
@@ -22,20 +29,66 @@ AIRTABLE_KEY = open('/home/samsclaw/.config/airtable/api_key').read().strip()
 HEALTH_BASE = "appnVeGSjwJgG2snS"
 PRODUCTIVITY_BASE = "appvUbV8IeGhxmcPn"
 
+# Written by the habit tracker and food logger, which don't journal yet
+HABIT_FILE = os.path.join(DATA_DIR, 'habit_tracker.json')
+NUTRITION_FILE = os.path.join(DATA_DIR, 'daily_nutrition_{date}.json')
+IMPORTED_FILE = os.path.join(DATA_DIR, 'sync_imported.json')
+
+
+def op_tag(op_id):
+    """Idempotency key written into a synced record's Notes"""
+    return f"[op {op_id}]"
+
+
+def find_op_tag(op_id):
+    return f"FIND({quote(op_tag(op_id))}, {field('Notes')})"
+
+
+def meal_key(meal_type, food):
+    return f"{meal_type}|{food[:30].lower()}"
+
+
+def load_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
 class AirtableSync:
     def __init__(self):
         self.headers = {
             "Authorization": f"Bearer {AIRTABLE_KEY}",
             "Content-Type": "application/json"
         }
+        # Table IDs come from the schema registry (one meta call per base, cached)
+        self.client = AirtableClient(AIRTABLE_KEY)
+        self.client.preload_schema()
+        # Local writers append here; Function 1 pushes only what's unsynced
+        self.journal = get_journal()
+    
+    def _table_url(self, base_id, table_name):
+        """REST URL for a table, resolved by name"""
+        table_id = self.client.get_table_id(base_id, table_name)
+        if not table_id:
+            raise ValueError(f"Table '{table_name}' not found in base {base_id}")
+        return f"https://api.airtable.com/v0/{base_id}/{table_id}"
     
     # ============================================================================
     # FUNCTION 1: Sync Local Data to Airtable (What we just fixed)
     # ============================================================================
     def sync_local_to_airtable(self):
         """
-        Sync local food/habit data to Airtable
-        Actually verifies what's in Airtable and pushes missing items
+        Sync local food/habit changes to Airtable
+        Pushes unsynced change-journal entries (see change_journal.py)
         """
         print("=" * 60)
         print("🔄 FUNCTION 1: Sync Local Data to Airtable")
@@ -48,6 +101,11 @@ class AirtableSync:
             'errors': []
         }
         
+        try:
+            self._import_local_files()
+        except Exception as e:
+            results['errors'].append(f"Import: {e}")
+        
         # Sync habits
         habit_result = self._sync_daily_habits()
         results['habits_synced'] = habit_result.get('synced', 0)
@@ -71,214 +129,204 @@ class AirtableSync:
         
         return results
     
-    def _sync_daily_habits(self):
-        """Sync habits from local tracker to Airtable"""
-        print("📊 Syncing Daily Habits...")
+    def _import_local_files(self):
+        """Journal today's habit ticks and meals from the local JSON files
         
-        # Read local habit data
-        habit_file = '/home/samsclaw/.openclaw/workspace/data/habit_tracker.json'
-        water_file = '/home/samsclaw/.openclaw/workspace/data/water_tracker.json'
+        The habit tracker (habit_tracker.json) and the food logger
+        (daily_nutrition_<date>.json) don't append to the journal
+        themselves yet. What was imported is remembered per day in
+        sync_imported.json, so each tick and meal is journaled once.
+        """
+        today = get_today()
+        imported = load_json(IMPORTED_FILE)
+        if imported.get('date') != today:
+            imported = {'date': today, 'habits': [], 'meals': []}
         
-        local_data = {
-            'date': get_today(),
-            'habits': {}
-        }
+        habits = load_json(HABIT_FILE)
+        if habits.get('date') == today:
+            ticked = [name for name in HABIT_CHECKBOXES
+                      if habits.get('habits', {}).get(name) and name not in imported['habits']]
+            if ticked:
+                self.journal.set_habits({name: True for name in ticked}, today)
+                imported['habits'] += ticked
+                print(f"  📥 Imported habits: {', '.join(ticked)}")
         
-        if os.path.exists(habit_file):
-            with open(habit_file) as f:
-                data = json.load(f)
-                if data.get('date') == get_today():
-                    local_data['habits'] = data.get('habits', {})
+        meals = []
+        for meal in load_json(NUTRITION_FILE.format(date=today)).get('meals', []):
+            key = meal_key(meal.get('type', 'Meal'), meal.get('items', ''))
+            if key not in imported['meals']:
+                meals.append((key, meal))
         
-        if os.path.exists(water_file):
-            with open(water_file) as f:
-                data = json.load(f)
-                if data.get('date') == get_today():
-                    local_data['water'] = data.get('today', 0)
+        if meals:
+            # daily_nutrition is also written from Airtable by
+            # fetch_daily_nutrition.py - skip meals already there or queued
+            existing = [r['fields'].get('Food Items', '').lower()[:30] for r in
+                        self.client.query_records(HEALTH_BASE, "Food Log",
+                                                  filter_formula=eq('Date', today),
+                                                  fields=["Food Items"])]
+            existing += [e['fields'].get('Food Items', '').lower()[:30]
+                         for e in self.journal.pending()
+                         if e['op'] == OP_ADD_MEAL and e['date'] == today]
+            for key, meal in meals:
+                food = meal.get('items', '')
+                food_short = food[:30].lower()
+                if not any(food_short in other or other in food_short for other in existing):
+                    self.journal.add_meal({
+                        "Meal Type": meal.get('type', 'Meal'),
+                        "Food Items": food,
+                        "Calories": meal.get('calories', 0),
+                        "Protein (g)": meal.get('protein', 0),
+                        "Carbs (g)": meal.get('carbs', 0),
+                        "Fat (g)": meal.get('fat', 0),
+                    }, today)
+                    existing.append(food_short)
+                    print(f"  📥 Imported meal: {food[:40]}")
+                imported['meals'].append(key)
         
-        # Build updates
-        updates = {}
-        if local_data['habits'].get('Multivitamin'):
-            updates['Multivitamin'] = True
-        if local_data['habits'].get('Fruit'):
-            updates['Fruit'] = True
-        if local_data['habits'].get('Exercise'):
-            updates['Exercise'] = True
-        if local_data['habits'].get('Creatine'):
-            updates['Creatine'] = True
-        if 'water' in local_data:
-            updates['Water'] = local_data['water']
+        save_json(IMPORTED_FILE, imported)
+    
+    def _sync_daily_habits(self):
+        """Push journaled habit changes to Airtable, one upsert per day"""
+        print("📊 Syncing Daily Habits...")
         
-        if not updates:
-            print("  ℹ️  No local habit data to sync")
+        ops = [e for e in self.journal.pending() if e['op'] == OP_SET_HABITS]
+        if not ops:
+            print("  ℹ️  No local habit changes to sync")
             return {'synced': 0}
         
-        # Check what's in Airtable
-        url = f"https://api.airtable.com/v0/{PRODUCTIVITY_BASE}/tblZSHA0bOZGNaRUm"
+        # Collapse to one record per day - later changes win, except Water,
+        # which is a running total and only ever goes up
+        days = {}
+        for entry in ops:
+            day = days.setdefault(entry['date'], {'fields': {}, 'op_ids': []})
+            for key, value in entry['fields'].items():
+                if key == 'Water':
+                    value = max(value, day['fields'].get('Water', 0))
+                day['fields'][key] = value
+            day['op_ids'].append(entry['op_id'])
         
+        # Merge with what Airtable has: habit_tracker_from_food adds glasses
+        # to the same Water field, so only raise it, and only set unset ticks
+        dates = sorted(days)
         try:
-            response = requests.get(
-                f"{url}?filterByFormula=Date='{get_today()}'",
-                headers=self.headers,
-                timeout=15
-            )
-            
-            if response.status_code != 200:
-                return {'synced': 0, 'error': f"Cannot fetch habits: {response.status_code}"}
-            
-            records = response.json().get('records', [])
-            
-            if records:
-                record_id = records[0]['id']
-                existing = records[0].get('fields', {})
-                
-                # Check what needs updating
-                needs_update = False
-                final_updates = {}
-                
-                for key, value in updates.items():
-                    if key == 'Water':
-                        existing_val = existing.get(key, 0)
-                        if value > existing_val:
-                            final_updates[key] = value
-                            needs_update = True
-                            print(f"  📝 Water: {existing_val} → {value}")
-                    elif key in ['Multivitamin', 'Fruit', 'Exercise', 'Creatine']:
-                        if not existing.get(key):
-                            final_updates[key] = True
-                            needs_update = True
-                            print(f"  📝 {key}: False → True")
-                
-                if needs_update:
-                    update_resp = requests.patch(
-                        f"{url}/{record_id}",
-                        headers=self.headers,
-                        json={"fields": final_updates},
-                        timeout=10
-                    )
-                    if update_resp.status_code == 200:
-                        print(f"  ✅ Updated {len(final_updates)} habits")
-                        return {'synced': len(final_updates)}
-                    else:
-                        return {'synced': 0, 'error': f"Update failed: {update_resp.status_code}"}
-                else:
-                    print("  ✅ Habits already up to date")
-                    return {'synced': 0}
+            existing = {}
+            for record in self.client.iter_records(PRODUCTIVITY_BASE, "Daily Habits",
+                                                   filter_formula=and_(gte('Date', dates[0]), lte('Date', dates[-1])),
+                                                   fields=["Date", "Water", *HABIT_CHECKBOXES]):
+                date = (record['fields'].get('Date') or '')[:10]
+                existing.setdefault(date, {}).update(record['fields'])
+        except Exception as e:
+            return {'synced': 0, 'error': f"Cannot fetch habits: {e}"}
+        
+        changes, applied = {}, []
+        for date in dates:
+            current = existing.get(date, {})
+            fields = {}
+            for key, value in days[date]['fields'].items():
+                if key == 'Water':
+                    if value > (current.get('Water') or 0):
+                        fields[key] = value
+                        print(f"  📝 {date} Water: {current.get('Water') or 0} → {value}")
+                elif value and not current.get(key):
+                    fields[key] = True
+                    print(f"  📝 {date} {key}: False → True")
+            if fields:
+                changes[date] = fields
             else:
-                # Create new record
-                updates['Date'] = get_today()
-                create_resp = requests.post(
-                    url,
-                    headers=self.headers,
-                    json={"fields": updates},
-                    timeout=10
-                )
-                if create_resp.status_code == 200:
-                    print(f"  ✅ Created habit record with {len(updates)-1} habits")
-                    return {'synced': len(updates)-1}
-                else:
-                    return {'synced': 0, 'error': f"Create failed: {create_resp.status_code}"}
-                    
+                applied += days[date]['op_ids']
+        
+        if not changes:
+            print("  ✅ Habits already up to date")
+            self.journal.commit(applied)
+            return {'synced': 0}
+        
+        try:
+            results = self.client.upsert_records(
+                PRODUCTIVITY_BASE, "Daily Habits",
+                [{"Date": date, **fields} for date, fields in changes.items()],
+                merge_on=["Date"]
+            )
         except Exception as e:
             return {'synced': 0, 'error': str(e)}
+        
+        synced, errors = 0, []
+        for (date, fields), result in zip(changes.items(), results):
+            if 'error' in result:
+                errors.append(f"Habits {date}: {result['error']}")
+                continue
+            applied += days[date]['op_ids']
+            synced += len(fields)
+        print(f"  ✅ Updated {synced} habits")
+        
+        self.journal.commit(applied)
+        return {'synced': synced, 'error': '; '.join(errors) or None}
     
     def _sync_food_log(self):
-        """Sync food log from local memory to Airtable"""
-        print("📊 Syncing Food Log...")
+        """Push journaled meals to Airtable, 10 per request
         
-        # Read from daily nutrition file instead of hardcoded entries
-        local_meals = []
-        daily_nutrition_file = f'/home/samsclaw/.openclaw/workspace/data/daily_nutrition_{get_today()}.json'
-        
-        if os.path.exists(daily_nutrition_file):
-            with open(daily_nutrition_file) as f:
-                nutrition_data = json.load(f)
-                for meal in nutrition_data.get('meals', []):
-                    local_meals.append({
-                        "meal_type": meal.get('type', 'Meal'),
-                        "food": meal.get('items', ''),
-                        "calories": meal.get('calories', 0),
-                        "protein": meal.get('protein', 0),
-                        "carbs": meal.get('carbs', 0),
-                        "fat": meal.get('fat', 0)
-                    })
+        Each record carries its operation ID in Notes. Meals that were
+        in flight when a previous run died are looked up by that tag first,
+        so they're never created twice.
+        """
+        print("📊 Syncing Food Log...")
         
-        if not local_meals:
-            print("  ℹ️  No local food data to sync")
+        ops = [e for e in self.journal.pending() if e['op'] == OP_ADD_MEAL]
+        if not ops:
+            print("  ℹ️  No local food changes to sync")
             return {'synced': 0, 'error': None}
         
-        url = f"https://api.airtable.com/v0/{HEALTH_BASE}/tblsoErCMSBtzBZKB"
-        
         try:
-            # Get existing meals from Airtable
-            response = requests.get(
-                f"{url}?maxRecords=50",
-                headers=self.headers,
-                timeout=15
-            )
-            
-            if response.status_code != 200:
-                return {'synced': 0, 'error': f"Cannot fetch meals: {response.status_code}"}
-            
-            existing_records = response.json().get('records', [])
-            
-            # Filter for today's meals
-            today_records = [(r['id'], r['fields']) for r in existing_records if r.get('fields', {}).get('Date') == get_today()]
-            
-            synced = 0
-            duplicates_found = 0
-            
-            for meal in local_meals:
-                food_short = meal['food'][:30].lower()
-                
-                # Check if already exists (match by food content)
-                exists = False
-                for record_id, fields in today_records:
-                    existing_food = fields.get('Food Items', '').lower()[:30]
-                    if food_short in existing_food or existing_food in food_short:
-                        exists = True
-                        break
-                
-                if exists:
-                    # Meal already exists - don't touch Edamam Data flag
-                    # It will only be set to True when Edamam API succeeds
-                    continue
-                
-                # Create record
-                record = {
-                    "fields": {
-                        "Date": get_today(),
-                        "Meal Type": meal['meal_type'],
-                        "Food Items": meal['food'],
-                        "Calories": meal.get('calories', 0),
-                        "Protein (g)": meal.get('protein', 0),
-                        "Carbs (g)": meal.get('carbs', 0),
-                        "Fat (g)": meal.get('fat', 0),
-                        "Edamam Data": False,  # FLAG: False = estimated, True = from Edamam API
-                        "Notes": f"Synced at {datetime.now().strftime('%H:%M')} - Edamam API pending"
-                    }
-                }
-                
-                create_resp = requests.post(
-                    url,
-                    headers=self.headers,
-                    json=record,
-                    timeout=10
+            # Reconcile meals a crashed run may already have created
+            inflight = set(self.journal.inflight())
+            unsure = [e['op_id'] for e in ops if e['op_id'] in inflight]
+            if unsure:
+                found = self.client.query_records(
+                    HEALTH_BASE, "Food Log",
+                    filter_formula=or_(*(find_op_tag(op_id) for op_id in unsure)),
+                    fields=["Notes"]
                 )
-                
-                if create_resp.status_code == 200:
-                    print(f"  ✅ Synced: {meal['meal_type']} - {meal['food'][:40]}")
-                    synced += 1
-                else:
-                    print(f"  ❌ Failed: {meal['food'][:40]} ({create_resp.status_code})")
+                notes = ' '.join(r['fields'].get('Notes', '') for r in found)
+                created = [op_id for op_id in unsure if op_tag(op_id) in notes]
+                self.journal.commit(created, settled=unsure)
+                if created:
+                    print(f"  ↩️  {len(created)} meal(s) already created by an interrupted sync")
+                ops = [e for e in ops if e['op_id'] not in created]
             
-            if synced == 0:
-                print("  ✅ All meals already in Airtable")
+            if not ops:
+                return {'synced': 0, 'error': None}
             
-            return {'synced': synced}
+            records = []
+            for entry in ops:
+                records.append({
+                    "Date": entry['date'],
+                    "Meal Type": "Meal",
+                    "Calories": 0,
+                    "Protein (g)": 0,
+                    "Carbs (g)": 0,
+                    "Fat (g)": 0,
+                    **entry['fields'],
+                    "Edamam Data": False,  # FLAG: False = estimated, True = from Edamam API
+                    "Notes": f"Synced at {datetime.now().strftime('%H:%M')} - Edamam API pending {op_tag(entry['op_id'])}"
+                })
             
+            self.journal.mark_inflight(e['op_id'] for e in ops)
+            results = self.client.create_records(HEALTH_BASE, "Food Log", records)
         except Exception as e:
             return {'synced': 0, 'error': str(e)}
+        
+        # Failed chunks stay in flight - the request may have landed anyway
+        applied = []
+        for entry, result in zip(ops, results):
+            food = entry['fields'].get('Food Items', '')
+            if 'error' in result:
+                print(f"  ❌ Failed: {food[:40]} ({result['error']})")
+                continue
+            print(f"  ✅ Synced: {entry['fields'].get('Meal Type', 'Meal')} - {food[:40]}")
+            applied.append(entry['op_id'])
+        
+        self.journal.commit(applied)
+        failed = len(ops) - len(applied)
+        return {'synced': len(applied), 'error': f"{failed} meal(s) failed to sync" if failed else None}
     
     # ============================================================================
     # FUNCTION 2: Retry Edamam API for Missing Nutrition Data
@@ -294,9 +342,8 @@ class AirtableSync:
         print("=" * 60)
         print()
         
-        url = f"https://api.airtable.com/v0/{HEALTH_BASE}/tblsoErCMSBtzBZKB"
-        
         try:
+            url = self._table_url(HEALTH_BASE, "Food Log")
             # Find meals missing Edamam data (or with Edamam Data = False/empty)
             # Formula: Edamam Data is unchecked OR Protein is empty
             # Find meals missing Edamam data (check today's meals manually)
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+API Request Metrics
+Shared instrumentation for outbound API clients (Airtable, WHOOP, Notion).
+
+Every request is appended to a rotating JSONL log with latency, status,
+retry count, rate-limit wait and request/response bytes. Per-endpoint
+counters are merged into a shared state file at process exit and
+rendered as a Prometheus text file (for node_exporter's textfile
+collector).
+
+Usage:
+    python3 api_metrics.py report [--hours 24] [--service airtable]
+    python3 api_metrics.py prom
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import atexit
+import argparse
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+METRICS_DIR = os.path.expanduser(os.getenv("OPENCLAW_METRICS_DIR", "~/.openclaw/metrics"))
+LOG_FILE = "api_requests.jsonl"
+STATE_FILE = "api_counters.json"
+PROM_FILE = "api_requests.prom"
+
+# Rotate the JSONL log at this size, keeping BACKUP_COUNT old files
+MAX_LOG_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
+
+# Long-running processes (webhook server) also flush counters this often
+FLUSH_INTERVAL = 60
+
+# Latency histogram buckets (seconds) for the Prometheus export
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Record/page IDs in URL paths collapse to placeholders so endpoints stay
+# low-cardinality; base and table IDs are kept so tables stay distinguishable
+_ID_PATTERNS = [
+    (re.compile(r'^(rec|fld|viw|att)[A-Za-z0-9]{14}$'), lambda m: f"{{{m.group(1)}}}"),
+    (re.compile(r'^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$'),
+     lambda m: "{id}"),
+    (re.compile(r'^\d+$'), lambda m: "{n}"),
+]
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
+_atexit_registered = False
+_last_flush = time.time()
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """Strip query strings and replace record/page IDs with placeholders"""
+    path = endpoint.split('?', 1)[0].strip('/')
+    parts = []
+    for part in path.split('/'):
+        for pattern, repl in _ID_PATTERNS:
+            match = pattern.match(part)
+            if match:
+                part = repl(match)
+                break
+        parts.append(part)
+    return '/'.join(parts)
+
+
+def _body_size(body: Any) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    return 0
+
+
+def request_size(response) -> int:
+    """Bytes sent for a requests.Response (0 if unknown)"""
+    request = getattr(response, 'request', None)
+    return _body_size(getattr(request, 'body', None)) if request is not None else 0
+
+
+def response_size(response) -> int:
+    """Bytes received for a requests.Response (0 if unknown)"""
+    try:
+        return len(response.content or b'')
+    except Exception:
+        return 0
+
+
+def _open_log():
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = os.path.join(METRICS_DIR, LOG_FILE)
+    try:
+        if os.path.getsize(path) >= MAX_LOG_BYTES:
+            for i in range(BACKUP_COUNT - 1, 0, -1):
+                older = f"{path}.{i}"
+                if os.path.exists(older):
+                    os.replace(older, f"{path}.{i + 1}")
+            os.replace(path, f"{path}.1")
+    except FileNotFoundError:
+        pass
+    return open(path, 'a')
+
+
+def record_request(service: str, method: str, endpoint: str,
+                   status: Optional[int], latency: float,
+                   retries: int = 0, rate_limit_wait: float = 0.0,
+                   request_bytes: int = 0, response_bytes: int = 0,
+                   error: Optional[str] = None):
+    """Record one logical request (after all of its retries)"""
+    global _atexit_registered, _last_flush
+    endpoint = normalize_endpoint(endpoint)
+    entry = {
+        "ts": round(time.time(), 3),
+        "service": service,
+        "method": method,
+        "endpoint": endpoint,
+        "status": status,
+        "latency": round(latency, 4),
+        "retries": retries,
+        "wait": round(rate_limit_wait, 4),
+        "req_bytes": request_bytes,
+        "resp_bytes": response_bytes,
+    }
+    if error:
+        entry["error"] = error[:200]
+
+    with _lock:
+        key = (service, method, endpoint, str(status or 'error'))
+        counter = _counters.setdefault(key, {
+            "count": 0, "latency_sum": 0.0, "retries": 0, "wait_sum": 0.0,
+            "req_bytes": 0, "resp_bytes": 0,
+            "buckets": [0] * len(LATENCY_BUCKETS),
+        })
+        counter["count"] += 1
+        counter["latency_sum"] += latency
+        counter["retries"] += retries
+        counter["wait_sum"] += rate_limit_wait
+        counter["req_bytes"] += request_bytes
+        counter["resp_bytes"] += response_bytes
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                counter["buckets"][i] += 1
+        if not _atexit_registered:
+            atexit.register(flush)
+            _atexit_registered = True
+
+        try:
+            with _open_log() as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        except OSError:
+            pass
+
+        due = time.time() - _last_flush > FLUSH_INTERVAL
+        if due:
+            _last_flush = time.time()
+    if due:
+        flush()
+
+
+class RequestTimer:
+    """Context manager that times a request and records it on exit
+
+        with RequestTimer("notion", "POST", endpoint) as timer:
+            response = requests.post(...)
+            timer.response = response
+    """
+
+    def __init__(self, service: str, method: str, endpoint: str):
+        self.service = service
+        self.method = method
+        self.endpoint = endpoint
+        self.response = None
+        self.retries = 0
+        self.rate_limit_wait = 0.0
+
+    def __enter__(self):
+        self.started = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        response = self.response
+        record_request(
+            self.service, self.method, self.endpoint,
+            getattr(response, 'status_code', None),
+            time.time() - self.started,
+            retries=self.retries, rate_limit_wait=self.rate_limit_wait,
+            request_bytes=request_size(response) if response is not None else 0,
+            response_bytes=response_size(response) if response is not None else 0,
+            error=repr(exc) if exc else None,
+        )
+        return False
+
+
+# Counter state shared between processes
+def _locked_state(fn):
+    """Run fn(state) while holding the counters file lock, then persist"""
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    state_path = os.path.join(METRICS_DIR, STATE_FILE)
+    with open(state_path + '.lock', 'a') as lock:
+        if HAS_FCNTL:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            try:
+                with open(state_path, 'r') as f:
+                    state = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                state = {}
+            result = fn(state)
+            tmp_path = f"{state_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f, separators=(',', ':'))
+            os.replace(tmp_path, state_path)
+            return result
+        finally:
+            if HAS_FCNTL:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def flush():
+    """Merge this process's counters into the shared state and rewrite the .prom file"""
+    with _lock:
+        pending = dict(_counters)
+        _counters.clear()
+    if not pending:
+        return
+
+    def merge(state):
+        for key, counter in pending.items():
+            total = state.setdefault('|'.join(key), {
+                "count": 0, "latency_sum": 0.0, "retries": 0, "wait_sum": 0.0,
+                "req_bytes": 0, "resp_bytes": 0,
+                "buckets": [0] * len(LATENCY_BUCKETS),
+            })
+            for name in ("count", "latency_sum", "retries", "wait_sum",
+                         "req_bytes", "resp_bytes"):
+                total[name] += counter[name]
+            total["buckets"] = [a + b for a, b in zip(total["buckets"], counter["buckets"])]
+        write_prometheus(state)
+
+    try:
+        _locked_state(merge)
+    except OSError as e:
+        print(f"⚠️ Could not write API metrics: {e}")
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def write_prometheus(state: Dict[str, Dict]):
+    """Render cumulative counters in Prometheus text format"""
+    lines = [
+        "# HELP openclaw_api_requests_total Outbound API requests",
+        "# TYPE openclaw_api_requests_total counter",
+    ]
+    series = []
+    for key, counter in sorted(state.items()):
+        service, method, endpoint, status = key.split('|', 3)
+        labels = (f'service="{_label(service)}",method="{method}",'
+                  f'endpoint="{_label(endpoint)}",status="{status}"')
+        series.append((labels, counter))
+        lines.append(f"openclaw_api_requests_total{{{labels}}} {counter['count']}")
+
+    for name, field, help_text in (
+        ("openclaw_api_retries_total", "retries", "Retries across all attempts"),
+        ("openclaw_api_rate_limit_wait_seconds_total", "wait_sum", "Time spent waiting on rate limiters"),
+        ("openclaw_api_request_bytes_total", "req_bytes", "Request body bytes sent"),
+        ("openclaw_api_response_bytes_total", "resp_bytes", "Response body bytes received"),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, counter in series:
+            lines.append(f"{name}{{{labels}}} {round(counter[field], 4)}")
+
+    lines.append("# HELP openclaw_api_request_duration_seconds Request latency including retries")
+    lines.append("# TYPE openclaw_api_request_duration_seconds histogram")
+    for labels, counter in series:
+        for bound, count in zip(LATENCY_BUCKETS, counter["buckets"]):
+            lines.append(f'openclaw_api_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'openclaw_api_request_duration_seconds_bucket{{{labels},le="+Inf"}} {counter["count"]}')
+        lines.append(f"openclaw_api_request_duration_seconds_sum{{{labels}}} {round(counter['latency_sum'], 4)}")
+        lines.append(f"openclaw_api_request_duration_seconds_count{{{labels}}} {counter['count']}")
+
+    prom_path = os.path.join(METRICS_DIR, PROM_FILE)
+    tmp_path = f"{prom_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, prom_path)
+
+
+# Reporting
+def iter_entries(since: float) -> Iterator[Dict]:
+    """JSONL entries newer than a timestamp, across rotated files"""
+    path = os.path.join(METRICS_DIR, LOG_FILE)
+    paths = [f"{path}.{i}" for i in range(BACKUP_COUNT, 0, -1)] + [path]
+    for p in paths:
+        try:
+            with open(p, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry.get('ts', 0) >= since:
+                        yield entry
+        except FileNotFoundError:
+            continue
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    rank = max(1, min(len(values), math.ceil(pct / 100 * len(values))))
+    return values[rank - 1]
+
+
+def summarize(hours: float = 24, service: Optional[str] = None) -> List[Dict]:
+    """Per-endpoint latency percentiles and totals for the last N hours"""
+    groups: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    for entry in iter_entries(time.time() - hours * 3600):
+        if service and entry.get('service') != service:
+            continue
+        key = (entry['service'], entry['method'], entry['endpoint'])
+        group = groups.setdefault(key, {"latencies": [], "errors": 0, "retries": 0,
+                                        "wait": 0.0, "bytes": 0})
+        group["latencies"].append(entry.get('latency', 0))
+        status = entry.get('status')
+        if not status or status >= 400:
+            group["errors"] += 1
+        group["retries"] += entry.get('retries', 0)
+        group["wait"] += entry.get('wait', 0)
+        group["bytes"] += entry.get('req_bytes', 0) + entry.get('resp_bytes', 0)
+
+    rows = []
+    for (svc, method, endpoint), group in groups.items():
+        latencies = sorted(group["latencies"])
+        rows.append({
+            "service": svc, "method": method, "endpoint": endpoint,
+            "count": len(latencies), "errors": group["errors"],
+            "retries": group["retries"], "wait": group["wait"],
+            "bytes": group["bytes"], "total": sum(latencies),
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+        })
+    rows.sort(key=lambda r: r["total"], reverse=True)
+    return rows
+
+
+def print_report(hours: float = 24, service: Optional[str] = None):
+    rows = summarize(hours, service)
+    if not rows:
+        print(f"No API requests recorded in the last {hours:g}h")
+        return
+    print(f"📊 API requests, last {hours:g}h (sorted by total time)")
+    print(f"{'endpoint':<64} {'n':>5} {'err':>4} {'retry':>5} "
+          f"{'p50':>7} {'p95':>7} {'p99':>7} {'wait':>7} {'total':>8} {'KB':>8}")
+    for r in rows:
+        name = f"{r['service']} {r['method']} {r['endpoint']}"
+        print(f"{name[:64]:<64} {r['count']:>5} {r['errors']:>4} {r['retries']:>5} "
+              f"{r['p50']:>6.2f}s {r['p95']:>6.2f}s {r['p99']:>6.2f}s "
+              f"{r['wait']:>6.1f}s {r['total']:>7.1f}s {r['bytes'] / 1024:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Outbound API request metrics")
+    sub = parser.add_subparsers(dest="command")
+    report = sub.add_parser("report", help="p50/p95/p99 latency per endpoint")
+    report.add_argument("--hours", type=float, default=24)
+    report.add_argument("--service", help="airtable, whoop or notion")
+    sub.add_parser("prom", help="rewrite the Prometheus text file from saved counters")
+    args = parser.parse_args()
+
+    if args.command == "prom":
+        _locked_state(write_prometheus)
+        print(os.path.join(METRICS_DIR, PROM_FILE))
+    else:
+        print_report(getattr(args, 'hours', 24), getattr(args, 'service', None))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
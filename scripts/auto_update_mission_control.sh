@@ -10,12 +10,9 @@ echo "Updating Mission Control data..."
 python3 scripts/fetch_exercise_data.py 2>/dev/null || true
 cp data/exercise_data.json mission-control/data/ 2>/dev/null || true
 
-# Update productivity data  
-python3 scripts/fetch_productivity_data.py 2>/dev/null || true
+# Update productivity, timeline, overview and trend data from one snapshot
+python3 scripts/dashboard_snapshot.py 2>/dev/null || true
 cp data/productivity_data.json mission-control/data/ 2>/dev/null || true
-
-# Update timeline data
-python3 scripts/fetch_timeline_data.py 2>/dev/null || true
 cp data/timeline_data.json mission-control/data/ 2>/dev/null || true
 
 # Update daily nutrition data
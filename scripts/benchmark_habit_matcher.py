@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Habit Matcher Benchmark
+Times the compiled habit matcher (habit_matcher.py) against the previous
+per-keyword loops in habit_parser and habit_tracker_from_food on synthetic
+chat messages and food descriptions, and checks both give the same result
+for every line.
+
+No API calls - lines are generated locally.
+
+Usage:
+    python3 benchmark_habit_matcher.py              # 50k lines each
+    python3 benchmark_habit_matcher.py --lines 5000 --repeat 5
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from habit_parser import HABIT_PATTERNS, parse_habit_updates
+from habit_tracker_from_food import detect_food_habits_many
+
+
+# ---------------------------------------------------------------------------
+# Previous implementations (per-keyword loops)
+# ---------------------------------------------------------------------------
+
+def legacy_parse_habit_update(message):
+    message_lower = message.lower()
+    updates = []
+
+    for habit_name, config in HABIT_PATTERNS.items():
+        found = False
+        for keyword in config['keywords']:
+            if len(keyword) <= 4:
+                pattern = r'\b' + re.escape(keyword) + r'\b'
+                if re.search(pattern, message_lower):
+                    found = True
+                    break
+            else:
+                if keyword in message_lower:
+                    found = True
+                    break
+
+        if found:
+            update = {
+                'habit': habit_name,
+                'field': config['database_field'],
+                'type': config['type']
+            }
+            value = None
+            for pattern in config['number_patterns']:
+                match = re.search(pattern, message_lower)
+                if match:
+                    value = int(match.group(1))
+                    break
+            if value:
+                update['value'] = value
+            if habit_name == 'water':
+                if 'another' in message_lower or 'more' in message_lower or '+' in message:
+                    update['increment'] = True
+            updates.append(update)
+
+    return updates
+
+
+def legacy_food_habits(food_description):
+    food_lower = food_description.lower()
+    updates = {}
+
+    if any(word in food_lower for word in ['multivitamin', 'vitamin', 'multi vitamin', 'multi-vitamin']):
+        updates['Multivitamin'] = True
+
+    fruit_keywords = [
+        'apple', 'banana', 'orange', 'pear', 'grape', 'berry', 'berries',
+        'strawberry', 'blueberry', 'raspberry', 'blackberry', 'mango',
+        'pineapple', 'watermelon', 'melon', 'peach', 'plum', 'cherry',
+        'kiwi', 'lemon', 'lime', 'date', 'fig', 'pomegranate'
+    ]
+    if any(fruit in food_lower for fruit in fruit_keywords):
+        updates['Fruit'] = True
+
+    water_patterns = [
+        r'(\d+)\s*glass(?:es)?\s+of\s+water',
+        r'(\d+)\s*glass(?:es)?\s+water',
+        r'water\s*:\s*(\d+)',
+    ]
+    water_count = 0
+    for pattern in water_patterns:
+        matches = re.findall(pattern, food_lower)
+        if matches:
+            water_count = int(matches[0])
+            break
+    if 'water' in food_lower and water_count == 0:
+        water_count = 1
+    if water_count > 0:
+        updates['Water'] = water_count
+
+    return updates
+
+
+# ---------------------------------------------------------------------------
+# Synthetic lines
+# ---------------------------------------------------------------------------
+
+CHAT_FRAGMENTS = [
+    "had {n} glasses of water", "drank another glass", "{n} more water", "water total of {n}",
+    "went for a run", "ran {n} km this morning", "yoga for {n} minutes", "gym session",
+    "walked the dog for {n} min", "swam {n} laps", "ate an apple", "{n} servings of fruit",
+    "banana and berries", "took my multivitamin", "vitamin d pill", "meeting at {n}pm",
+    "orange juice", "running late today", "call mum", "finished the report", "+{n} water",
+    "cycled {n} miles", "pilates class", "{n} portions of veg", "nothing much today",
+]
+
+FOOD_FRAGMENTS = [
+    "2 eggs and toast", "chicken salad", "{n} glasses of water", "water: {n}", "watermelon slice",
+    "greek yogurt with blueberries", "multivitamin", "multi-vitamin with breakfast", "oats with banana",
+    "salmon, rice, lime", "{n} glass water", "coffee", "pasta bolognese", "dates and figs",
+    "pomegranate seeds", "steak and chips", "sparkling water", "peach tea", "kiwi", "protein shake",
+]
+
+
+def synthetic_lines(fragments, n, rng):
+    lines = []
+    for _ in range(n):
+        parts = rng.sample(fragments, rng.randint(1, 3))
+        lines.append(", ".join(p.format(n=rng.randint(0, 12)) for p in parts).capitalize())
+    return lines
+
+
+def best_of(fn, lines, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(lines)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+CASES = [
+    ("Chat", CHAT_FRAGMENTS,
+     lambda lines: [legacy_parse_habit_update(line) for line in lines],
+     parse_habit_updates),
+    ("Food log", FOOD_FRAGMENTS,
+     lambda lines: [legacy_food_habits(line) for line in lines],
+     detect_food_habits_many),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled habit matcher")
+    parser.add_argument('--lines', type=int, default=50_000, help="lines per case (default 50000)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per implementation, best is reported")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"Matching {args.lines:,} synthetic lines per case (best of {args.repeat})\n")
+    print(f"{'Case':<10} {'Legacy':>10} {'Compiled':>10} {'Speedup':>8}  {'Matches':>8}")
+    print("-" * 52)
+
+    for name, fragments, legacy, compiled in CASES:
+        lines = synthetic_lines(fragments, args.lines, rng)
+        legacy_time, legacy_result = best_of(legacy, lines, args.repeat)
+        compiled_time, compiled_result = best_of(compiled, lines, args.repeat)
+
+        for line, old, new in zip(lines, legacy_result, compiled_result):
+            if old != new:
+                print(f"❌ {name}: results differ for {line!r}\n   legacy:   {old}\n   compiled: {new}")
+                sys.exit(1)
+
+        matches = sum(1 for r in compiled_result if r)
+        print(f"{name:<10} {legacy_time:>9.3f}s {compiled_time:>9.3f}s "
+              f"{legacy_time / compiled_time:>7.1f}x  {matches:>8,}")
+
+
+if __name__ == "__main__":
+    main()
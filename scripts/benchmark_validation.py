@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Validation Rule Engine Benchmark
+Times the single-pass rule sets (validation_rules.py) against the
+previous multi-pass validator loops on synthetic Food Log, Daily Habits
+and TAT Tasks records, and checks both report the same issues.
+
+No API calls - records are generated locally.
+
+Usage:
+    python3 benchmark_validation.py               # 100k records per table
+    python3 benchmark_validation.py --records 20000 --repeat 5
+"""
+
+import sys
+import time
+import random
+import argparse
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from validation_rules import FOOD_RULES, HABIT_RULES, TAT_RULES, SEVERE, MINOR, WARNING
+
+
+class CountingLog:
+    """Minimal IssueLog stand-in that only keeps the messages"""
+
+    def __init__(self):
+        self.issues = {SEVERE: [], MINOR: [], WARNING: []}
+
+    def add(self, key, kind, message):
+        self.issues[kind].append(message)
+
+
+# ---------------------------------------------------------------------------
+# Synthetic records (~10% faulty)
+# ---------------------------------------------------------------------------
+
+def synthetic_food(n, rng):
+    start = datetime(2025, 1, 1)
+    meals = ['Breakfast', 'Lunch', 'Dinner', 'Snack']
+    records = []
+    for i in range(n):
+        f = {
+            'Date': (start + timedelta(days=i // 4)).strftime('%Y-%m-%d'),
+            'Meal Type': meals[i % 4],
+            'Food Items': rng.choice(['oats', 'chicken rice', 'apple', 'salmon salad', 'yogurt']),
+            'Calories': rng.randint(100, 900),
+            'Protein (g)': rng.randint(5, 60),
+            'Carbs (g)': rng.randint(5, 80),
+            'Fat (g)': rng.randint(1, 40),
+            'Edamam Data': True,
+        }
+        fault = rng.random()
+        if fault < 0.02:
+            del f['Calories']
+        elif fault < 0.04:
+            f['Meal Type'] = 'Brunch'
+        elif fault < 0.05:
+            f['Calories'] = 'lots'
+        elif fault < 0.06:
+            f['Date'] = f['Date'].replace('-', '/')
+        elif fault < 0.08:
+            del f['Protein (g)']
+        elif fault < 0.10:
+            f['Edamam Data'] = False
+        records.append({'id': f'rec{i:014d}', 'fields': f})
+    return records
+
+
+def synthetic_habits(n, rng):
+    start = datetime(2000, 1, 1)
+    records = []
+    for i in range(n):
+        f = {
+            'Date': (start + timedelta(days=i)).strftime('%Y-%m-%d'),
+            'Multivitamin': rng.random() < 0.8,
+            'Fruit': rng.random() < 0.6,
+            'Exercise': rng.random() < 0.5,
+            'Creatine': rng.random() < 0.7,
+            'Water': rng.randint(2, 10),
+        }
+        fault = rng.random()
+        if fault < 0.03:
+            del f['Creatine']
+        elif fault < 0.05:
+            f['Water'] = 25
+        elif fault < 0.07:
+            f['Fruit'] = 'yes'
+        elif fault < 0.08:
+            f['Date'] = ''
+        records.append({'id': f'rec{i:014d}', 'fields': f})
+    return records
+
+
+def synthetic_tasks(n, rng):
+    start = datetime(2025, 1, 1)
+    statuses = ['Not Started', 'In Progress', 'Blocked', 'Complete', 'Cancelled']
+    records = []
+    for i in range(n):
+        created = start + timedelta(hours=i)
+        category = rng.choice(['1', '3', '7', '30'])
+        f = {
+            'Task Name': f'Task {i}',
+            'Category': category,
+            'Status': rng.choice(statuses),
+            'Priority': 'Medium',
+            'Notes': '',
+            'Tags': ['bench'],
+            'Date Created': created.isoformat() + 'Z',
+            'Due Date': (created + timedelta(days=int(category))).isoformat() + 'Z',
+            'Days Remaining': rng.randint(-5, 30),
+        }
+        fault = rng.random()
+        if fault < 0.02:
+            f['Category'] = '14'
+        elif fault < 0.04:
+            f['Status'] = 'Done'
+        elif fault < 0.06:
+            f['Due Date'] = (created + timedelta(days=60)).isoformat() + 'Z'
+        elif fault < 0.08:
+            del f['Notes']
+        records.append({'id': f'rec{i:014d}', 'fields': f})
+    return records
+
+
+# ---------------------------------------------------------------------------
+# Previous validator loops (required / optional / type / date passes,
+# then a separate duplicate pass)
+# ---------------------------------------------------------------------------
+
+def legacy_food(records, log):
+    required_fields = {
+        'Date': 'Date of meal',
+        'Meal Type': 'Type of meal (Breakfast/Lunch/Dinner/Snack)',
+        'Food Items': 'Description of food consumed',
+        'Calories': 'Calorie count'
+    }
+    optional_fields = {
+        'Protein (g)': 'Protein content',
+        'Carbs (g)': 'Carbohydrate content',
+        'Fat (g)': 'Fat content',
+        'Edamam Data': 'Whether data came from Edamam API'
+    }
+
+    add = log.add
+
+    missing = 0
+    for r in records:
+        f = r.get('fields', {})
+        record_id = r['id'][:10]
+        for field, description in required_fields.items():
+            if field not in f or f[field] is None or f[field] == '':
+                add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Missing required field '{field}' ({description})")
+                missing += 1
+        for field, description in optional_fields.items():
+            if field not in f or f[field] is None or f[field] == '':
+                add(r['id'], MINOR, f"MINOR: Record {record_id}: Missing optional field '{field}' ({description})")
+                missing += 1
+        meal_type = f.get('Meal Type', '')
+        if meal_type and meal_type not in ['Breakfast', 'Lunch', 'Dinner', 'Snack']:
+            add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Invalid Meal Type '{meal_type}'")
+        calories = f.get('Calories')
+        if calories is not None:
+            if not isinstance(calories, (int, float)):
+                add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Calories must be numeric, got {type(calories)}")
+            elif calories < 0:
+                add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Calories cannot be negative ({calories})")
+            elif calories == 0:
+                add(r['id'], WARNING, f"⚠️ Record {record_id}: Calories is 0 - verify this is correct")
+        record_date = f.get('Date', '')
+        if record_date:
+            try:
+                datetime.strptime(record_date, '%Y-%m-%d')
+            except ValueError:
+                add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Invalid Date format '{record_date}' (expected YYYY-MM-DD)")
+
+    by_date = defaultdict(list)
+    for r in records:
+        date = r.get('fields', {}).get('Date')
+        if date:
+            by_date[date[:10]].append(r)
+
+    seen_meals = defaultdict(list)
+    for r in records:
+        f = r.get('fields', {})
+        key = f"{f.get('Date', '')}:{f.get('Meal Type', '')}:{f.get('Food Items', '')[:30]}"
+        seen_meals[key].append(r['id'][:10])
+
+    for r in records:
+        f = r.get('fields', {})
+        if f.get('Edamam Data', False) and not f.get('Protein (g)'):
+            add(r['id'], MINOR, f"MINOR: Record {r['id'][:10]}: Edamam Data=True but missing protein - incomplete nutrition")
+    return missing
+
+
+def legacy_habits(records, log):
+    optional_fields = {
+        'Multivitamin': 'Multivitamin taken (checkbox)',
+        'Fruit': 'Fruit consumed (checkbox)',
+        'Exercise': 'Exercise completed (checkbox)',
+        'Creatine': 'Creatine taken (checkbox)',
+        'Water': 'Water intake (number of glasses)'
+    }
+
+    add = log.add
+
+    by_date = defaultdict(list)
+    for r in records:
+        date = r.get('fields', {}).get('Date')
+        if date:
+            by_date[date[:10]].append(r)
+
+    missing = 0
+    for r in records:
+        f = r.get('fields', {})
+        record_id = r['id'][:10]
+        if 'Date' not in f or not f['Date']:
+            add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Missing required field 'Date' (Date of habit tracking)")
+            missing += 1
+        for field, description in optional_fields.items():
+            if field not in f:
+                add(r['id'], MINOR, f"MINOR: Record {record_id}: Missing field '{field}' ({description})")
+                missing += 1
+        water = f.get('Water')
+        if water is not None:
+            if not isinstance(water, (int, float)):
+                add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Water must be numeric, got {type(water)}")
+            elif water < 0 or water > 20:
+                add(r['id'], WARNING, f"⚠️ Record {record_id}: Water value ({water}) seems unusual")
+        for field in ['Multivitamin', 'Fruit', 'Exercise', 'Creatine']:
+            value = f.get(field)
+            if value is not None and not isinstance(value, bool):
+                add(r['id'], SEVERE, f"SEVERE: Record {record_id}: {field} should be boolean (checkbox), got {type(value)}")
+    return missing
+
+
+def legacy_tasks(records, log):
+    required_fields = {
+        'Task Name': 'Description of the task',
+        'Category': 'TAT category (1/3/7/30 days)',
+        'Status': 'Current status of the task'
+    }
+    optional_fields = {
+        'Priority': 'Task priority level',
+        'Notes': 'Additional notes',
+        'Tags': 'Task tags'
+    }
+    valid_statuses = ['Not Started', 'In Progress', 'Blocked', 'Complete', 'Cancelled']
+
+    add = log.add
+
+    missing = 0
+    for r in records:
+        f = r.get('fields', {})
+        record_id = r['id'][:10]
+        for field, description in required_fields.items():
+            if field not in f or not f[field]:
+                add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Missing required field '{field}' ({description})")
+                missing += 1
+        for field, description in optional_fields.items():
+            if field not in f:
+                add(r['id'], MINOR, f"MINOR: Record {record_id}: Missing field '{field}' ({description})")
+                missing += 1
+        category = f.get('Category', '')
+        if category and category not in ['1', '3', '7', '30']:
+            add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Invalid Category '{category}' (must be 1, 3, 7, or 30)")
+        status = f.get('Status', '')
+        if status and status not in valid_statuses:
+            add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Invalid Status '{status}' (must be one of: {', '.join(valid_statuses)})")
+        date_created, cat, due_date = f.get('Date Created'), f.get('Category'), f.get('Due Date')
+        if date_created and cat and due_date:
+            try:
+                created = datetime.fromisoformat(date_created.replace('Z', '+00:00'))
+                expected_due = created + timedelta(days=int(cat))
+                actual_due = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+                if abs((expected_due - actual_due).days) > 1:
+                    add(r['id'], SEVERE, f"SEVERE: Record {record_id}: Due Date formula error - expected {expected_due.date()}, got {actual_due.date()}")
+            except ValueError:
+                pass
+        days_remaining = f.get('Days Remaining')
+        if isinstance(days_remaining, (int, float)) and days_remaining < 0 and status not in ['Complete', 'Cancelled']:
+            add(r['id'], WARNING, f"⚠️ Record {record_id}: Task overdue ({days_remaining} days) with status '{status}'")
+    return missing
+
+
+# ---------------------------------------------------------------------------
+# Rule sets (what validate_food_log & co. now run)
+# ---------------------------------------------------------------------------
+
+def compiled_food(records, log):
+    by_date = defaultdict(list)
+    seen_meals = defaultdict(list)
+
+    def collect(r):
+        f = r.get('fields', {})
+        if f.get('Date'):
+            by_date[f['Date'][:10]].append(r)
+        key = f"{f.get('Date', '')}:{f.get('Meal Type', '')}:{f.get('Food Items', '')[:30]}"
+        seen_meals[key].append(r['id'][:10])
+
+    return FOOD_RULES.run(records, log, on_record=collect)
+
+
+def compiled_habits(records, log):
+    by_date = defaultdict(list)
+
+    def collect(r):
+        day = r.get('fields', {}).get('Date')
+        if day:
+            by_date[day[:10]].append(r)
+
+    return HABIT_RULES.run(records, log, on_record=collect)
+
+
+def compiled_tasks(records, log):
+    return TAT_RULES.run(records, log)
+
+
+TABLES = [
+    ('Food Log', synthetic_food, legacy_food, compiled_food),
+    ('Daily Habits', synthetic_habits, legacy_habits, compiled_habits),
+    ('TAT Tasks', synthetic_tasks, legacy_tasks, compiled_tasks),
+]
+
+
+def best_of(fn, records, repeat):
+    """Fastest of N runs (seconds) and the log of the last one"""
+    best = None
+    for _ in range(repeat):
+        log = CountingLog()
+        start = time.perf_counter()
+        missing = fn(records, log)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, log, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the validation rule engine")
+    parser.add_argument('--records', type=int, default=100_000, help="records per table (default 100000)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per implementation, best is reported")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"Validating {args.records:,} synthetic records per table (best of {args.repeat})\n")
+    print(f"{'Table':<14} {'Legacy':>10} {'Rules':>10} {'Speedup':>8}  {'Issues':>8}")
+    print("-" * 56)
+
+    total_legacy = total_compiled = 0.0
+    for name, generate, legacy, compiled in TABLES:
+        records = generate(args.records, rng)
+        legacy_time, legacy_log, legacy_missing = best_of(legacy, records, args.repeat)
+        compiled_time, compiled_log, compiled_missing = best_of(compiled, records, args.repeat)
+
+        for kind in (SEVERE, MINOR, WARNING):
+            if sorted(legacy_log.issues[kind]) != sorted(compiled_log.issues[kind]):
+                print(f"❌ {name}: {kind} issues differ between implementations")
+                sys.exit(1)
+        if legacy_missing != compiled_missing:
+            print(f"❌ {name}: missing-field counts differ ({legacy_missing} vs {compiled_missing})")
+            sys.exit(1)
+
+        issues = sum(len(v) for v in compiled_log.issues.values())
+        total_legacy += legacy_time
+        total_compiled += compiled_time
+        print(f"{name:<14} {legacy_time:>9.3f}s {compiled_time:>9.3f}s "
+              f"{legacy_time / compiled_time:>7.1f}x  {issues:>8,}")
+
+    print("-" * 56)
+    print(f"{'Total':<14} {total_legacy:>9.3f}s {total_compiled:>9.3f}s "
+          f"{total_legacy / total_compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
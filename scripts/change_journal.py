@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Change Journal
+Append-only write-ahead log of local changes waiting to be pushed to
+Airtable. Local writers (water_tracker, the habit tracker, the food logger)
+append one JSON line per change with a unique operation ID; the sync worker
+in airtable_sync_v2.py reads only entries past its saved offset, so a sync
+costs O(changes) and a crash never applies the same operation twice.
+
+Operations:
+    set_habits  fields merged into that day's Daily Habits record (upsert on Date)
+    add_meal    one new Food Log record
+
+Usage:
+    python3 change_journal.py habit Multivitamin Fruit [--date 2026-02-12]
+    python3 change_journal.py water 6
+    python3 change_journal.py meal Lunch "chicken salad" --calories 450
+    python3 change_journal.py status
+"""
+
+import os
+import json
+import uuid
+import argparse
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+DATA_DIR = '/home/samsclaw/.openclaw/workspace/data'
+JOURNAL_FILE = os.path.join(DATA_DIR, 'sync_journal.jsonl')
+
+OP_SET_HABITS = 'set_habits'
+OP_ADD_MEAL = 'add_meal'
+
+HABIT_CHECKBOXES = ['Multivitamin', 'Fruit', 'Exercise', 'Creatine']
+
+
+def get_today():
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+class ChangeJournal:
+    """JSONL journal plus a cursor (offset + applied op IDs) for the sync worker
+
+    The cursor lives next to the journal in <journal>.state.json. Entries
+    before the offset are done; "applied" holds IDs past the offset that
+    succeeded out of order, and "inflight" the IDs a sync was sending when
+    it last saved (the worker checks Airtable for those before resending).
+    """
+
+    def __init__(self, path: str = JOURNAL_FILE):
+        self.path = path
+        self.state_path = f"{path}.state.json"
+        self.lock_file = f"{path}.lock"
+        self._lock = threading.Lock()
+
+    def _locked(self, fn):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.lock_file, 'a') as lock:
+                if HAS_FCNTL:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    return fn()
+                finally:
+                    if HAS_FCNTL:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # Writers
+    def append(self, op: str, date: str, fields: Dict[str, Any],
+               op_id: Optional[str] = None) -> str:
+        """Durably record one change; returns its operation ID"""
+        entry = {
+            "op_id": op_id or uuid.uuid4().hex,
+            "op": op,
+            "date": date,
+            "fields": fields,
+            "ts": datetime.now().isoformat(timespec='seconds'),
+        }
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+
+        def write():
+            with open(self.path, 'a') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        self._locked(write)
+        return entry["op_id"]
+
+    def set_habits(self, fields: Dict[str, Any], date: Optional[str] = None) -> str:
+        return self.append(OP_SET_HABITS, date or get_today(), fields)
+
+    def add_meal(self, fields: Dict[str, Any], date: Optional[str] = None) -> str:
+        return self.append(OP_ADD_MEAL, date or get_today(), fields)
+
+    # Sync cursor
+    def load_state(self) -> Dict:
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            state = {}
+        state.setdefault("offset", 0)
+        state.setdefault("applied", [])
+        state.setdefault("inflight", [])
+        return state
+
+    def _save_state(self, state: Dict):
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+
+    def _read_from(self, offset: int) -> List[Tuple[int, Dict]]:
+        """(end offset, entry) for each complete line after offset"""
+        entries = []
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        break  # writer mid-append; pick it up next run
+                    offset += len(raw)
+                    try:
+                        entries.append((offset, json.loads(raw)))
+                    except json.JSONDecodeError:
+                        entries.append((offset, {}))  # skip a corrupt line
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def pending(self) -> List[Dict]:
+        """Entries not yet applied, in journal order"""
+        state = self.load_state()
+        done = set(state["applied"])
+        return [e for _, e in self._read_from(state["offset"])
+                if e.get("op_id") and e["op_id"] not in done]
+
+    def inflight(self) -> List[str]:
+        return self.load_state()["inflight"]
+
+    def mark_inflight(self, op_ids: Iterable[str]):
+        """Record IDs about to be sent, so a crash mid-request can be reconciled"""
+        def save():
+            state = self.load_state()
+            state["inflight"] = sorted(set(state["inflight"]) | set(op_ids))
+            self._save_state(state)
+        self._locked(save)
+
+    def commit(self, op_ids: Iterable[str], settled: Iterable[str] = ()):
+        """Mark operations applied and move the offset past every leading done entry
+
+        settled: in-flight IDs resolved without being applied (they fail
+        normally and will be retried), cleared from the in-flight list.
+        """
+        op_ids = set(op_ids)
+
+        def save():
+            state = self.load_state()
+            done = set(state["applied"]) | op_ids
+            for end, entry in self._read_from(state["offset"]):
+                if entry and entry.get("op_id") not in done:
+                    break
+                done.discard(entry.get("op_id"))
+                state["offset"] = end
+            state["applied"] = sorted(done)
+            state["inflight"] = sorted(set(state["inflight"]) - op_ids - set(settled))
+            self._save_state(state)
+        self._locked(save)
+
+    def status(self) -> Dict[str, int]:
+        state = self.load_state()
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            size = 0
+        pending = self.pending()
+        return {
+            "pending": len(pending),
+            "habits": sum(1 for e in pending if e["op"] == OP_SET_HABITS),
+            "meals": sum(1 for e in pending if e["op"] == OP_ADD_MEAL),
+            "inflight": len(state["inflight"]),
+            "synced_bytes": state["offset"],
+            "journal_bytes": size,
+        }
+
+
+_default_journal: Optional[ChangeJournal] = None
+
+
+def get_journal() -> ChangeJournal:
+    global _default_journal
+    if _default_journal is None:
+        _default_journal = ChangeJournal()
+    return _default_journal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record local changes for the Airtable sync")
+    parser.add_argument('--date', default=None, help="YYYY-MM-DD (default: today)")
+    sub = parser.add_subparsers(dest='command', required=True)
+    habit = sub.add_parser('habit', help="tick habit checkboxes")
+    habit.add_argument('habits', nargs='+', choices=HABIT_CHECKBOXES)
+    water = sub.add_parser('water', help="set today's water total (glasses)")
+    water.add_argument('glasses', type=int)
+    meal = sub.add_parser('meal', help="log a meal")
+    meal.add_argument('meal_type', choices=['Breakfast', 'Lunch', 'Dinner', 'Snack'])
+    meal.add_argument('food')
+    for macro in ('calories', 'protein', 'carbs', 'fat'):
+        meal.add_argument(f'--{macro}', type=float, default=0)
+    sub.add_parser('status', help="show unsynced changes")
+    args = parser.parse_args()
+
+    journal = get_journal()
+    if args.command == 'habit':
+        op_id = journal.set_habits({name: True for name in args.habits}, args.date)
+    elif args.command == 'water':
+        op_id = journal.set_habits({"Water": args.glasses}, args.date)
+    elif args.command == 'meal':
+        op_id = journal.add_meal({
+            "Meal Type": args.meal_type,
+            "Food Items": args.food,
+            "Calories": args.calories,
+            "Protein (g)": args.protein,
+            "Carbs (g)": args.carbs,
+            "Fat (g)": args.fat,
+        }, args.date)
+    else:
+        for key, value in journal.status().items():
+            print(f"{key:<14} {value}")
+        return
+    print(f"✅ Journaled {args.command} ({op_id[:8]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,20 +4,16 @@
 Fixed version with better property detection
 """
 
-import requests
-import os
+import sys
 from datetime import datetime, date
+from pathlib import Path
 
-# Notion API Configuration
-NOTION_TOKEN = os.environ.get('NOTION_TOKEN') or open(
-    os.path.expanduser('~/.config/notion/api_key')
-).read().strip()
+sys.path.insert(0, str(Path(__file__).parent))
 
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Notion-Version": "2022-06-28",
-    "Content-Type": "application/json"
-}
+from notion_client import NotionAPIError, get_notion_client
+from notion_decoder import compile_decoder, title_property
+
+client = get_notion_client()
 
 # Database IDs from system architect review
 OVERNIGHT_BUILD_TASKS_DB = "2fdf2cb1-2276-81cc-99c6-df60e7a1600e"
@@ -26,74 +22,37 @@ MASTER_CRON_SCHEDULE_DB = "2fdf2cb1-2276-81a5-84e9-d60295943cd6"
 
 def get_database_schema(database_id):
     """Get the schema of a Notion database to understand property names"""
-    url = f"https://api.notion.com/v1/databases/{database_id}"
-    
-    response = requests.get(url, headers=HEADERS)
-    
-    if response.status_code != 200:
-        print(f"❌ Error fetching database schema: {response.status_code}")
+    try:
+        return client.get_schema(database_id)
+    except NotionAPIError as e:
+        print(f"❌ Error fetching database schema: {e.status}")
         return None
-    
-    return response.json()
 
 def query_notion_database(database_id, filter_payload=None):
-    """Query a Notion database and return results"""
-    url = f"https://api.notion.com/v1/databases/{database_id}/query"
-    
+    """Query a Notion database and return every matching page"""
     payload = filter_payload or {}
     
-    response = requests.post(url, headers=HEADERS, json=payload)
-    
-    if response.status_code != 200:
-        print(f"❌ Error querying database {database_id}: {response.status_code}")
-        print(f"   Response: {response.text}")
+    try:
+        return client.query_all(database_id, filter=payload.get('filter'), sorts=payload.get('sorts'))
+    except NotionAPIError as e:
+        print(f"❌ Error querying database {database_id}: {e.status}")
+        print(f"   Response: {e}")
         return []
-    
-    return response.json().get('results', [])
 
-def extract_title(page):
-    """Extract the title from a Notion page"""
-    props = page.get('properties', {})
-    
-    # Try to find the title property
-    for prop_name, prop_data in props.items():
-        if prop_data.get('type') == 'title' and prop_data.get('title'):
-            title_parts = []
-            for text_obj in prop_data['title']:
-                content = text_obj.get('text', {}).get('content', '')
-                if content:
-                    title_parts.append(content)
-            return ' '.join(title_parts) if title_parts else 'Untitled'
-    
-    # Fallback: check page title directly
-    if 'title' in page:
-        if isinstance(page['title'], list) and page['title']:
-            return page['title'][0].get('text', {}).get('content', 'Untitled')
-        elif isinstance(page['title'], str):
-            return page['title']
-    
-    return 'Untitled'
+# Status property names tried in order
+STATUS_PROPERTIES = ['Status', 'status', 'State', 'state', 'Progress', 'progress']
 
-def extract_status(page):
-    """Extract the status from a Notion page"""
-    props = page.get('properties', {})
-    
-    # Try common status property names
-    for prop_name in ['Status', 'status', 'State', 'state', 'Progress', 'progress']:
-        if prop_name in props:
-            prop_data = props[prop_name]
-            prop_type = prop_data.get('type', '')
-            
-            if prop_type == 'status' and prop_data.get('status'):
-                return prop_data['status'].get('name', 'Unknown')
-            elif prop_type == 'select' and prop_data.get('select'):
-                return prop_data['select'].get('name', 'Unknown')
-    
-    return 'Unknown'
+def task_decoder(properties):
+    """Decoder for (id, url, name, status) rows, whatever the database calls them"""
+    status = next((name for name in STATUS_PROPERTIES
+                   if properties.get(name, {}).get('type') in ('status', 'select')), None)
+    return compile_decoder(properties, {'name': title_property(properties), 'status': status},
+                           defaults={'name': 'Untitled', 'status': 'Unknown'},
+                           page_fields=('id', 'url'))
 
-def is_task_complete(page):
+def is_task_complete(status):
     """Check if a task is complete based on its status"""
-    status = extract_status(page).lower()
+    status = status.lower()
     complete_keywords = ['complete', 'done', 'finished', '✅', 'closed', 'archived', 'resolved']
     return any(keyword in status for keyword in complete_keywords)
 
@@ -110,16 +69,13 @@ def check_database(database_id, database_name):
     
     pending_tasks = []
     
-    for result in results:
-        task_name = extract_title(result)
-        status = extract_status(result)
-        
-        if not is_task_complete(result):
+    for task_id, url, task_name, status in task_decoder(results[0]['properties']).decode_many(results):
+        if not is_task_complete(status):
             pending_tasks.append({
-                'id': result.get('id'),
+                'id': task_id,
                 'name': task_name,
                 'status': status,
-                'url': result.get('url', '')
+                'url': url or ''
             })
     
     if pending_tasks:
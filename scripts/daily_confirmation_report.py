@@ -8,123 +8,286 @@ Run daily at 11:00 PM
 import os
 import sys
 import json
+import time
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
+from typing import Dict, Optional
 
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from airtable_client import get_health_client, get_productivity_client
+from airtable_client import PRIORITY_LOW
+from airtable_formula import and_, eq
+from airtable_replica import ReplicaHealthClient, ReplicaProductivityClient
 
-def get_today_entries():
+# Per-run budget: Airtable requests (replica reads are free) and wall time
+MAX_API_CALLS = 20
+RUN_DEADLINE = 30.0
+
+# Longest any one section may take before its cached copy is used
+SECTION_DEADLINE = 10.0
+
+# Last good result per section, served (marked stale) when a section fails
+SECTION_CACHE = Path.home() / '.openclaw/workspace/reports/.daily_report_sections.json'
+
+
+class BudgetExceeded(RuntimeError):
+    """The run is out of API calls or time"""
+
+
+class RequestBudget:
+    """API-call and latency allowance shared by every section of one run"""
+    
+    def __init__(self, max_calls: int = MAX_API_CALLS, deadline: float = RUN_DEADLINE):
+        self.max_calls = max_calls
+        self.deadline_at = time.monotonic() + deadline
+        self.calls = 0
+        self.closed = False
+        self._lock = threading.Lock()
+    
+    def remaining_time(self) -> float:
+        return max(self.deadline_at - time.monotonic(), 0.0)
+    
+    def spend(self):
+        """Account for one API request (raises BudgetExceeded when spent)"""
+        with self._lock:
+            if self.closed:
+                raise BudgetExceeded("report already assembled")
+            if self.calls >= self.max_calls:
+                raise BudgetExceeded(f"API call budget ({self.max_calls}) spent")
+            if not self.remaining_time():
+                raise BudgetExceeded("report deadline passed")
+            self.calls += 1
+    
+    def close(self):
+        """Stop sections still running after the report was assembled"""
+        with self._lock:
+            self.closed = True
+
+
+class BudgetedClientMixin:
+    """Charges every Airtable request to self.budget"""
+    
+    budget: Optional[RequestBudget] = None
+    
+    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict:
+        if self.budget is not None:
+            self.budget.spend()
+        return super()._make_request(method, endpoint, **kwargs)
+
+
+class BudgetedHealthClient(BudgetedClientMixin, ReplicaHealthClient):
+    pass
+
+
+class BudgetedProductivityClient(BudgetedClientMixin, ReplicaProductivityClient):
+    pass
+
+
+# Section fetchers: (health client, productivity client, day) -> data or None
+
+def fetch_food_log(health, productivity, day):
+    """Food Log - stream the day's rows straight from the server filter"""
+    food_count = 0
+    total_calories = 0
+    food_names = []
+    for f in health.iter_records(health.base_id, "Food Log",
+                                 filter_formula=eq("Date", day),
+                                 fields=['Food Name', 'Calories']):
+        food_count += 1
+        total_calories += f['fields'].get('Calories', 0) or 0
+        if len(food_names) < 3:
+            food_names.append(f['fields'].get('Food Name', 'Unknown'))
+    if not food_count:
+        return None
+    return {'count': food_count, 'total_calories': total_calories, 'entries': food_names}
+
+def fetch_weight(health, productivity, day):
+    weight_entries = health.get_weight_entries(days=1)
+    if not weight_entries:
+        return None
+    latest = weight_entries[0]['fields']
+    return {'weight': latest.get('Weight (kg)'), 'date': latest.get('Date')}
+
+def fetch_workouts(health, productivity, day):
+    workout_entries = health.get_workouts(days=1)
+    if not workout_entries:
+        return None
+    total_duration = sum(w['fields'].get('Duration (min)', 0) or 0 for w in workout_entries)
+    return {
+        'count': len(workout_entries),
+        'total_minutes': total_duration,
+        'types': list(set(w['fields'].get('Workout Type', 'Unknown') for w in workout_entries))
+    }
+
+def fetch_habits(health, productivity, day):
+    habit_entries = productivity.get_habits(days=1)
+    if not habit_entries:
+        return None
+    completed = [h for h in habit_entries if h['fields'].get('Completed')]
+    return {
+        'count': len(habit_entries),
+        'completed': len(completed),
+        'names': list(set(h['fields'].get('Habit', 'Unknown') for h in completed))
+    }
+
+def fetch_whoop_recovery(health, productivity, day):
+    """WHOOP Recovery from the local export (if available)"""
+    whoop_file = Path.home() / '.openclaw/whoop_data/latest_recovery.json'
+    if not whoop_file.exists():
+        return None
+    with open(whoop_file, 'r') as f:
+        whoop_data = json.load(f)
+    return {
+        'score': whoop_data.get('recovery_score'),
+        'hrv': whoop_data.get('hrv'),
+        'resting_hr': whoop_data.get('resting_hr')
+    }
+
+# The two TAT sections start together, so their queries go through the
+# client's coalescer and share one TAT Tasks request
+
+def fetch_tat_tasks(health, productivity, day):
+    """TAT Tasks created on the day (filtered server-side)"""
+    by_category = defaultdict(list)
+    tasks = productivity.coalescer.query(productivity.base_id, "TAT Tasks v2",
+                                         filter_formula=eq("Date Created", day),
+                                         fields=['Task Name', 'Category'])
+    for task in tasks:
+        fields = task['fields']
+        by_category[fields.get('Category', 'Unknown')].append(fields.get('Task Name', 'Unnamed'))
+    if not tasks:
+        return None
+    return {'count': len(tasks), 'by_category': dict(by_category)}
+
+def fetch_completed_tasks(health, productivity, day):
+    """Number of TAT Tasks completed on the day"""
+    completed = productivity.coalescer.query(
+        productivity.base_id, "TAT Tasks v2",
+        filter_formula=and_(eq("Status", "Complete"), eq("Completed Date", day)),
+        fields=['Task Name'])
+    return len(completed) or None
+
+# name -> (report group, fetcher)
+SECTIONS: Dict[str, tuple] = {
+    'food_log': ('health', fetch_food_log),
+    'weight': ('health', fetch_weight),
+    'workouts': ('health', fetch_workouts),
+    'habits': ('health', fetch_habits),
+    'whoop_recovery': ('health', fetch_whoop_recovery),
+    'tat_tasks': ('productivity', fetch_tat_tasks),
+    'completed_today': ('productivity', fetch_completed_tasks),
+}
+
+def load_section_cache() -> Dict[str, Dict]:
+    try:
+        with open(SECTION_CACHE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_section_cache(cache: Dict[str, Dict]):
+    SECTION_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = SECTION_CACHE.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=2, default=str)
+    os.replace(tmp_path, SECTION_CACHE)
+
+def _run_section(fetch, outcome, *args):
+    try:
+        outcome['data'] = fetch(*args)
+    except Exception as e:
+        outcome['error'] = str(e) or type(e).__name__
+
+def fetch_sections(day: str, budget: RequestBudget,
+                   section_deadline: float = SECTION_DEADLINE) -> Dict[str, Dict]:
+    """Run every section fetcher in parallel within the budget
+    
+    Returns {name: {"data", "stale", "as_of", "error"}}; a section that
+    failed, overran its deadline or ran out of budget gets its last good
+    result for the same day from the section cache with stale=True.
+    Fetchers run on daemon threads, so one stuck in Airtable retries is
+    abandoned at the deadline instead of holding the process open.
+    """
+    started = time.monotonic()
+    outcomes = {name: {} for name in SECTIONS}
+    threads = {}
+    try:
+        health = BudgetedHealthClient(priority=PRIORITY_LOW)
+        productivity = BudgetedProductivityClient(priority=PRIORITY_LOW)
+        health.budget = productivity.budget = budget
+        for name, (_, fetch) in SECTIONS.items():
+            threads[name] = threading.Thread(target=_run_section,
+                                             args=(fetch, outcomes[name], health, productivity, day),
+                                             name=f"report-{name}", daemon=True)
+            threads[name].start()
+    except Exception as e:
+        for outcome in outcomes.values():
+            outcome.setdefault('error', str(e))
+    
+    cache = load_section_cache()
+    now = datetime.now().isoformat(timespec='seconds')
+    results = {}
+    for name in SECTIONS:
+        if name in threads:
+            timeout = min(started + section_deadline - time.monotonic(), budget.remaining_time())
+            threads[name].join(max(timeout, 0))
+        outcome = dict(outcomes[name])
+        if 'data' in outcome:
+            results[name] = {'data': outcome['data'], 'stale': False, 'as_of': now}
+            cache[name] = {'data': outcome['data'], 'as_of': now, 'date': day}
+            continue
+        error = outcome.get('error', 'deadline exceeded')
+        # Another day's numbers would be merged into this day's totals
+        cached = cache.get(name)
+        if cached and cached.get('date') != day:
+            cached = None
+        results[name] = {'data': cached['data'] if cached else None,
+                         'stale': bool(cached),
+                         'as_of': cached['as_of'] if cached else None,
+                         'error': error}
+        print(f"⚠️ {name}: {error}" + (f" - using cache from {cached['as_of']}" if cached else ""))
+    
+    budget.close()
+    save_section_cache(cache)
+    return results
+
+def get_today_entries(budget: Optional[RequestBudget] = None):
     """Get all entries created today across all tables"""
     today = datetime.now().strftime('%Y-%m-%d')
     yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    budget = budget or RequestBudget()
+    started = time.monotonic()
     
     report = {
         'date': today,
         'generated_at': datetime.now().isoformat(),
         'health': {},
         'productivity': {},
+        'stale': {},
+        'errors': {},
         'summary': {
             'total_entries': 0,
             'tables_with_data': 0
         }
     }
     
-    # Health Base
-    try:
-        health_client = get_health_client()
-        
-        # Food Log
-        food_entries = health_client.get_food_entries(date=yesterday)
-        if food_entries:
-            total_calories = sum(f['fields'].get('Calories', 0) or 0 for f in food_entries)
-            report['health']['food_log'] = {
-                'count': len(food_entries),
-                'total_calories': total_calories,
-                'entries': [f['fields'].get('Food Name', 'Unknown') for f in food_entries[:3]]
-            }
-        
-        # Weight
-        weight_entries = health_client.get_weight_entries(days=1)
-        if weight_entries:
-            latest = weight_entries[0]['fields']
-            report['health']['weight'] = {
-                'weight': latest.get('Weight (kg)'),
-                'date': latest.get('Date')
-            }
-        
-        # Workouts
-        workout_entries = health_client.get_workouts(days=1)
-        if workout_entries:
-            total_duration = sum(w['fields'].get('Duration (min)', 0) or 0 for w in workout_entries)
-            report['health']['workouts'] = {
-                'count': len(workout_entries),
-                'total_minutes': total_duration,
-                'types': list(set(w['fields'].get('Workout Type', 'Unknown') for w in workout_entries))
-            }
-        
-        # Habits
-        habit_entries = health_client.get_habits(days=1)
-        if habit_entries:
-            completed = [h for h in habit_entries if h['fields'].get('Completed')]
-            report['health']['habits'] = {
-                'count': len(habit_entries),
-                'completed': len(completed),
-                'names': list(set(h['fields'].get('Habit', 'Unknown') for h in completed))
-            }
-        
-        # WHOOP Recovery (if available)
-        try:
-            whoop_file = Path.home() / '.openclaw/whoop_data/latest_recovery.json'
-            if whoop_file.exists():
-                with open(whoop_file, 'r') as f:
-                    whoop_data = json.load(f)
-                    report['health']['whoop_recovery'] = {
-                        'score': whoop_data.get('recovery_score'),
-                        'hrv': whoop_data.get('hrv'),
-                        'resting_hr': whoop_data.get('resting_hr')
-                    }
-        except:
-            pass
-        
-    except Exception as e:
-        report['health_error'] = str(e)
-    
-    # Productivity Base
-    try:
-        prod_client = get_productivity_client()
-        
-        # TAT Tasks
-        all_tasks = prod_client.get_tat_tasks()
-        today_tasks = [
-            t for t in all_tasks 
-            if t['fields'].get('Date Created') == yesterday
-        ]
-        
-        if today_tasks:
-            by_category = defaultdict(list)
-            for task in today_tasks:
-                cat = task['fields'].get('Category', 'Unknown')
-                by_category[cat].append(task['fields'].get('Task Name', 'Unnamed'))
-            
-            report['productivity']['tat_tasks'] = {
-                'count': len(today_tasks),
-                'by_category': dict(by_category)
-            }
-        
-        # Also get completed tasks
-        completed_tasks = [
-            t for t in all_tasks 
-            if t['fields'].get('Status') == 'Complete'
-        ]
-        if completed_tasks:
-            report['productivity']['completed_today'] = len(completed_tasks)
-        
-    except Exception as e:
-        report['productivity_error'] = str(e)
+    for name, result in fetch_sections(yesterday, budget).items():
+        group = SECTIONS[name][0]
+        if result['data']:
+            report[group][name] = result['data']
+        if result['stale']:
+            report['stale'][name] = result['as_of']
+        if result.get('error'):
+            report['errors'][name] = result['error']
+    
+    report['budget'] = {
+        'api_calls': budget.calls,
+        'max_api_calls': budget.max_calls,
+        'seconds': round(time.monotonic() - started, 2)
+    }
     
     # Calculate totals
     total_entries = sum([
@@ -209,6 +372,8 @@ def format_telegram_message(report):
     message += "─" * 20 + "\n"
     message += f"Total entries: {report['summary']['total_entries']}\n"
     message += f"Active tables: {report['summary']['tables_with_data']}/5\n"
+    for name, as_of in report.get('stale', {}).items():
+        message += f"⚠️ {name.replace('_', ' ')}: stale (as of {as_of.replace('T', ' ')[:16]})\n"
     
     # Highlights
     message += "\n🌟 *Highlights*\n"
@@ -295,6 +460,10 @@ def generate_daily_report():
     print(f"\n📅 Date: {report['date']}")
     print(f"📈 Total entries: {report['summary']['total_entries']}")
     print(f"📊 Active tables: {report['summary']['tables_with_data']}")
+    print(f"📡 API calls: {report['budget']['api_calls']}/{report['budget']['max_api_calls']} "
+          f"in {report['budget']['seconds']}s")
+    if report['stale']:
+        print(f"⚠️ Stale sections: {', '.join(report['stale'])}")
     
     # Format message
     message = format_telegram_message(report)
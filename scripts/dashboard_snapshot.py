@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Dashboard Snapshot Pipeline
+Fetches each dashboard table from Airtable once per run (over the widest
+window any output needs) and hands the in-memory snapshot to derivers
+that write the Mission Control JSON files.
+
+Derivers live next to the data they describe (fetch_timeline_data.py,
+fetch_overview_data.py, ...) and register themselves with @deriver.
+
+Usage:
+    python3 dashboard_snapshot.py                 # every output
+    python3 dashboard_snapshot.py timeline trend  # selected outputs
+    python3 dashboard_snapshot.py --list
+"""
+
+import sys
+import json
+import asyncio
+import argparse
+import importlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from airtable_async import AsyncAirtableClient
+from airtable_client import HEALTH_BASE_ID, PRODUCTIVITY_BASE_ID, PRIORITY_LOW
+from airtable_formula import and_, is_after, is_before
+
+WORKSPACE = Path('/home/samsclaw/.openclaw/workspace')
+DATA_DIR = WORKSPACE / 'data'
+MISSION_CONTROL_DATA_DIR = WORKSPACE / 'mission-control/data'
+
+# Snapshot tables: name -> (base, Airtable table)
+SNAPSHOT_TABLES = {
+    'food': (HEALTH_BASE_ID, "Food Log"),
+    'whoop': (HEALTH_BASE_ID, "WHOOP Data"),
+    'weight': (HEALTH_BASE_ID, "Weight Tracker"),
+    'workouts': (HEALTH_BASE_ID, "Workouts"),
+    'habits': (PRODUCTIVITY_BASE_ID, "Daily Habits"),
+    'tasks': (PRODUCTIVITY_BASE_ID, "TAT Tasks v2"),
+}
+
+# Modules whose derivers make up a full run
+DERIVER_MODULES = [
+    'fetch_overview_data',
+    'fetch_trend_data',
+    'fetch_timeline_data',
+    'fetch_mission_control_data',
+    'fetch_productivity_data',
+]
+
+ALL = None  # window for tables that are fetched in full
+
+
+class Deriver:
+    """One output file built from the snapshot"""
+
+    def __init__(self, name: str, output: Path, tables: Dict[str, Optional[int]],
+                 fn: Callable[['Snapshot'], Dict]):
+        self.name = name
+        self.output = output
+        self.tables = tables
+        self.fn = fn
+
+
+def deriver(name: str, output: Path, tables: Dict[str, Optional[int]]):
+    """Mark fn(snapshot) -> dict as the producer of an output file
+
+    tables maps snapshot table -> days of history needed (today included),
+    or ALL for the whole table.
+    """
+    def register(fn):
+        fn.deriver = Deriver(name, output, tables, fn)
+        return fn
+    return register
+
+
+def load_derivers() -> Dict[str, Deriver]:
+    """Every @deriver in DERIVER_MODULES, by name"""
+    derivers = {}
+    for module_name in DERIVER_MODULES:
+        module = importlib.import_module(module_name)
+        for obj in vars(module).values():
+            spec = getattr(obj, 'deriver', None)
+            if callable(obj) and spec is not None:
+                derivers[spec.name] = spec
+    return derivers
+
+
+def merge_windows(*requirements: Dict[str, Optional[int]]) -> Dict[str, Optional[int]]:
+    """Widest window per table (ALL beats any day count)"""
+    windows: Dict[str, Optional[int]] = {}
+    for tables in requirements:
+        for table, days in tables.items():
+            if days is ALL or (table in windows and windows[table] is ALL):
+                windows[table] = ALL
+            else:
+                windows[table] = max(days, windows.get(table, 0))
+    return windows
+
+
+def bucket_by_day(records: List[Dict], date_field: str = 'Date') -> Dict[str, List[Dict]]:
+    """Group records by the YYYY-MM-DD of a date field"""
+    buckets = defaultdict(list)
+    for record in records:
+        date = record['fields'].get(date_field)
+        if date:
+            buckets[date[:10]].append(record)
+    return buckets
+
+
+def window_formula(days: int, now: datetime, date_field: str = 'Date') -> str:
+    """Records dated within the N days ending on now (inclusive)"""
+    start = (now - timedelta(days=days)).strftime('%Y-%m-%d')
+    end = (now + timedelta(days=1)).strftime('%Y-%m-%d')
+    return and_(is_after(date_field, start), is_before(date_field, end))
+
+
+class Snapshot:
+    """Records for each table, fetched once, plus per-day indexes"""
+
+    def __init__(self, records: Dict[str, Any], windows: Dict[str, Optional[int]],
+                 now: Optional[datetime] = None):
+        self._records = records
+        self.windows = windows
+        self.now = now or datetime.now()
+        self.today = self.now.strftime('%Y-%m-%d')
+        self._by_day: Dict[str, Dict[str, List[Dict]]] = {}
+
+    def date(self, days_ago: int) -> str:
+        """YYYY-MM-DD for N days before today"""
+        return (self.now - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+
+    def dates(self, days: int) -> List[str]:
+        """The last N dates, oldest first (today included)"""
+        return [self.date(i) for i in range(days - 1, -1, -1)]
+
+    def records(self, table: str) -> List[Dict]:
+        """Records for a table; re-raises the error if its fetch failed"""
+        result = self._records[table]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def by_day(self, table: str) -> Dict[str, List[Dict]]:
+        """Records grouped by their Date field"""
+        if table not in self._by_day:
+            self._by_day[table] = bucket_by_day(self.records(table))
+        return self._by_day[table]
+
+    def on(self, table: str, date: str) -> List[Dict]:
+        """Records for one day"""
+        return self.by_day(table).get(date, [])
+
+
+async def fetch_snapshot(windows: Dict[str, Optional[int]],
+                         now: Optional[datetime] = None) -> Snapshot:
+    """One concurrent range query per table, however long its window
+
+    now sets the last day of every window (defaults to today).
+    """
+    now = now or datetime.now()
+    async with AsyncAirtableClient(priority=PRIORITY_LOW) as client:
+        queries = {}
+        for table, days in windows.items():
+            base_id, table_name = SNAPSHOT_TABLES[table]
+            formula = None if days is ALL else window_formula(days, now)
+            queries[table] = client.query_records(base_id, table_name, filter_formula=formula)
+        records = await client.gather(queries)
+    return Snapshot(records, windows, now)
+
+
+def write_output(path: Path, data: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def run(names: Optional[List[str]] = None, windows: Optional[Dict[str, int]] = None,
+        now: Optional[datetime] = None) -> Dict[str, Dict]:
+    """Fetch one snapshot and run the selected derivers (all by default)
+
+    windows widens individual tables beyond what the derivers ask for;
+    now moves the end of every window back from today.
+    Returns {deriver name: output data}.
+    """
+    available = load_derivers()
+    selected = [available[n] for n in (names or available)]
+    table_windows = merge_windows(*(d.tables for d in selected), windows or {})
+
+    summary = ', '.join(f"{t} {d}d" if d else f"{t} all" for t, d in table_windows.items())
+    print(f"📥 Snapshot: {summary}")
+    snapshot = asyncio.run(fetch_snapshot(table_windows, now))
+    for table in table_windows:
+        try:
+            print(f"   {table}: {len(snapshot.records(table))} records")
+        except Exception as e:
+            print(f"   ❌ {table}: {e}")
+
+    outputs = {}
+    for d in selected:
+        try:
+            data = d.fn(snapshot)
+        except Exception as e:
+            print(f"❌ {d.name}: {e}")
+            continue
+        write_output(d.output, data)
+        outputs[d.name] = data
+        print(f"✅ {d.name} → {d.output}")
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build Mission Control data files from one Airtable snapshot")
+    parser.add_argument('outputs', nargs='*', help="derivers to run (default: all)")
+    parser.add_argument('--list', action='store_true', help="list derivers and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for d in load_derivers().values():
+            print(f"{d.name:<18} {d.output}")
+        return
+    run(args.outputs or None)
+
+
+if __name__ == "__main__":
+    main()
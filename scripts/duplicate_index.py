@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Duplicate Record Index
+Persistent hash index of normalized record keys for Food Log and Daily
+Habits, shared by every process through a JSON snapshot, an append-only
+log of changes since the snapshot, and a lock file.
+
+Keys:
+    Food Log      date | meal type | fingerprint of the food text
+    Daily Habits  date | habit (date alone for the one-row-per-day records)
+
+AirtableClient.create_record(on_duplicate="auto") looks a new record up
+before writing (so a retried webhook doesn't log the same meal twice).
+Every write keeps the index up to date; overnight validation reports
+duplicate clusters, including ones that span earlier days or a day
+boundary.
+
+Usage:
+    python3 duplicate_index.py report [--table "Food Log"]
+    python3 duplicate_index.py rebuild
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+INDEX_FILE = os.path.expanduser("~/.openclaw/workspace/.airtable_duplicate_index.json")
+
+# A match indexed this recently is a retried write, not a second meal
+RETRY_WINDOW = 15 * 60
+
+# Meals logged either side of midnight count as the same meal when they
+# were created this close together
+CROSS_DAY_WINDOW = 60 * 60
+
+# Log lines (one per write call) appended before the snapshot is rewritten
+COMPACT_AFTER = 500
+
+# Food Log has used several names for the description field
+FOOD_TEXT_FIELDS = ('Food Items', 'Food Name', 'Food')
+
+
+class DuplicateRecordError(ValueError):
+    """Raised by create_record(on_duplicate='raise')"""
+
+    def __init__(self, table_name: str, record_ids: List[str]):
+        super().__init__(f"Duplicate {table_name} record (matches {', '.join(record_ids)})")
+        self.table_name = table_name
+        self.record_ids = record_ids
+
+
+# ---------------------------------------------------------------------------
+# Keys
+# ---------------------------------------------------------------------------
+
+def fingerprint(text: str) -> str:
+    """Order- and punctuation-insensitive hash of a food description"""
+    tokens = sorted(set(re.findall(r'[a-z0-9]+', text.lower())))
+    return hashlib.sha1(' '.join(tokens).encode('utf-8')).hexdigest()[:12]
+
+
+def food_key(fields: Dict[str, Any]) -> Optional[str]:
+    date = fields.get('Date')
+    text = next((fields[f] for f in FOOD_TEXT_FIELDS if fields.get(f)), None)
+    if not date or not isinstance(text, str):
+        return None
+    meal_type = str(fields.get('Meal Type') or '').strip().lower()
+    return f"{date[:10]}|{meal_type}|{fingerprint(text)}"
+
+
+def habit_key(fields: Dict[str, Any]) -> Optional[str]:
+    date = fields.get('Date')
+    if not date:
+        return None
+    habit = str(fields.get('Habit') or '').strip().lower()
+    return f"{date[:10]}|{habit}" if habit else date[:10]
+
+
+# Table name -> key function (None when a record can't be keyed)
+INDEXED_TABLES: Dict[str, Callable[[Dict[str, Any]], Optional[str]]] = {
+    "Food Log": food_key,
+    "Daily Habits": habit_key,
+}
+
+
+def _shift_key(key: str, days: int) -> Optional[str]:
+    """Same key on a neighbouring date"""
+    date, sep, rest = key.partition('|')
+    try:
+        shifted = datetime.strptime(date, '%Y-%m-%d') + timedelta(days=days)
+    except ValueError:
+        return None
+    return shifted.strftime('%Y-%m-%d') + sep + rest
+
+
+def _created_at(record: Dict) -> float:
+    created = record.get('createdTime')
+    if created:
+        try:
+            return datetime.fromisoformat(created.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+class DuplicateIndex:
+    """key -> record IDs, per table, persisted across processes
+
+    Lookups hit in-memory dicts (catching up on the log only when another
+    process has written to it); writes hold an exclusive file lock and
+    append their changes to a log next to the JSON snapshot, which is
+    rewritten only once COMPACT_AFTER log lines have built up.
+    """
+
+    def __init__(self, path: str = INDEX_FILE):
+        self.path = path
+        self.log_path = f"{path}.log"
+        self.lock_file = f"{path}.lock"
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._loaded = False
+        self._log_offset = 0
+        self._log_lines = 0
+        self._ops: Optional[List[List]] = None
+        self._tables: Dict[str, Dict] = {}
+
+    # Persistence
+    def _reload_if_changed(self):
+        """Pick up the snapshot if it was compacted, then any new log lines"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        try:
+            log_size = os.stat(self.log_path).st_size
+        except FileNotFoundError:
+            log_size = 0
+        if mtime != self._mtime or log_size < self._log_offset or not self._loaded:
+            self._load_snapshot(mtime)
+        if log_size > self._log_offset:
+            self._replay_log()
+
+    def _load_snapshot(self, mtime: Optional[int]):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        # records: {record_id: [key, created_at]}; keys is derived
+        self._tables = {}
+        for table_name, records in data.get('tables', {}).items():
+            keys: Dict[str, List[str]] = {}
+            for record_id, (key, _) in records.items():
+                keys.setdefault(key, []).append(record_id)
+            self._tables[table_name] = {"records": records, "keys": keys}
+        self._mtime = mtime
+        self._log_offset = self._log_lines = 0
+        self._loaded = True
+
+    def _replay_log(self):
+        """Apply log lines written since the last read (complete lines only)"""
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            try:
+                ops = json.loads(line)
+            except ValueError:
+                continue
+            for op in ops:
+                if op[0] == '+':
+                    self._index(op[1], op[2], op[3], op[4])
+                else:
+                    self._unindex(op[1], op[2])
+            self._log_lines += 1
+        self._log_offset += end
+
+    def _append_log(self, ops: List[List]):
+        """One line per write call; O(change) rather than O(index)"""
+        line = (json.dumps(ops, separators=(',', ':')) + '\n').encode('utf-8')
+        fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+        self._log_offset += len(line)
+        self._log_lines += 1
+
+    def _compact(self):
+        """Fold the log into a fresh snapshot and start an empty log"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"tables": {name: t["records"] for name, t in self._tables.items()}},
+                      f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        # Replaying a log line onto a snapshot that already has it is a no-op,
+        # so a crash between these two steps loses nothing
+        open(self.log_path, 'w').close()
+        self._mtime = os.stat(self.path).st_mtime_ns
+        self._log_offset = self._log_lines = 0
+
+    def _locked(self, fn, compact: bool = False):
+        """Run fn() on fresh in-memory state under the file lock, then log its changes"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+            with open(self.lock_file, 'a') as lock:
+                if HAS_FCNTL:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    self._reload_if_changed()
+                    self._ops = []
+                    result = fn()
+                    if compact or self._log_lines + bool(self._ops) >= COMPACT_AFTER:
+                        self._compact()
+                    elif self._ops:
+                        self._append_log(self._ops)
+                    return result
+                finally:
+                    self._ops = None
+                    if HAS_FCNTL:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _table(self, table_name: str) -> Dict:
+        return self._tables.setdefault(table_name, {"records": {}, "keys": {}})
+
+    # Writes
+    def _index(self, table_name: str, record_id: str, key: str, created_at: float):
+        self._unindex(table_name, record_id)
+        table = self._table(table_name)
+        table["records"][record_id] = [key, created_at]
+        table["keys"].setdefault(key, []).append(record_id)
+
+    def _unindex(self, table_name: str, record_id: str) -> bool:
+        table = self._table(table_name)
+        entry = table["records"].pop(record_id, None)
+        if entry is None:
+            return False
+        ids = table["keys"].get(entry[0], [])
+        if record_id in ids:
+            ids.remove(record_id)
+        if not ids:
+            table["keys"].pop(entry[0], None)
+        return True
+
+    def _add(self, table_name: str, record: Dict):
+        key_fn = INDEXED_TABLES[table_name]
+        key = key_fn(record.get('fields', {}))
+        if key is None:
+            self._remove(table_name, record['id'])
+            return
+        created_at = _created_at(record)
+        self._index(table_name, record['id'], key, created_at)
+        self._ops.append(['+', table_name, record['id'], key, created_at])
+
+    def _remove(self, table_name: str, record_id: str):
+        if self._unindex(table_name, record_id):
+            self._ops.append(['-', table_name, record_id])
+
+    def add(self, table_name: str, records: List[Dict]):
+        """Index (or re-key) records returned by Airtable"""
+        records = [r for r in records if 'id' in r and 'fields' in r]
+        if table_name not in INDEXED_TABLES or not records:
+            return
+        self._locked(lambda: [self._add(table_name, r) for r in records])
+
+    def remove(self, table_name: str, record_ids: List[str]):
+        if table_name not in INDEXED_TABLES or not record_ids:
+            return
+        self._locked(lambda: [self._remove(table_name, rid) for rid in record_ids])
+
+    def rebuild(self, table_name: str, records: List[Dict]):
+        """Replace a table's index with a full listing of its records"""
+        def replace():
+            self._tables[table_name] = {"records": {}, "keys": {}}
+            for record in records:
+                self._add(table_name, record)
+        self._locked(replace, compact=True)
+
+    # Lookups
+    def find(self, table_name: str, fields: Dict[str, Any],
+             created_at: Optional[float] = None,
+             exclude: Optional[str] = None) -> List[Dict]:
+        """Indexed records that duplicate these fields
+
+        Returns [{"id", "key", "created_at", "cross_day"}]. Food Log also
+        matches the same meal on the neighbouring day when both records
+        were created within CROSS_DAY_WINDOW.
+        """
+        key_fn = INDEXED_TABLES.get(table_name)
+        key = key_fn(fields) if key_fn else None
+        if key is None:
+            return []
+        created_at = created_at or time.time()
+        with self._lock:
+            self._reload_if_changed()
+            table = self._tables.get(table_name)
+            if not table:
+                return []
+            candidates = [(key, False)]
+            if table_name == "Food Log":
+                candidates += [(_shift_key(key, -1), True), (_shift_key(key, 1), True)]
+            matches = []
+            for candidate, cross_day in candidates:
+                for record_id in table["keys"].get(candidate, []):
+                    if record_id == exclude:
+                        continue
+                    indexed_at = table["records"][record_id][1]
+                    if cross_day and abs(indexed_at - created_at) > CROSS_DAY_WINDOW:
+                        continue
+                    matches.append({"id": record_id, "key": candidate,
+                                    "created_at": indexed_at, "cross_day": cross_day})
+            return matches
+
+    def clusters(self, table_name: str,
+                 record_ids: Optional[List[str]] = None) -> List[Dict]:
+        """Groups of records that duplicate each other
+
+        record_ids limits the report to clusters containing one of them.
+        Returns [{"key", "record_ids", "cross_day"}], largest first.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            table = self._tables.get(table_name)
+            if not table:
+                return []
+            records, keys = table["records"], table["keys"]
+            wanted = set(record_ids) if record_ids is not None else None
+
+            # Union-find over exact-key groups and cross-day pairs
+            parent: Dict[str, str] = {}
+
+            def root(rid):
+                parent.setdefault(rid, rid)
+                while parent[rid] != rid:
+                    parent[rid] = parent[parent[rid]]
+                    rid = parent[rid]
+                return rid
+
+            cross_day_roots = set()
+            for key, ids in keys.items():
+                if len(ids) > 1:
+                    for rid in ids[1:]:
+                        parent[root(rid)] = root(ids[0])
+                if table_name != "Food Log":
+                    continue
+                next_day = keys.get(_shift_key(key, 1) or '', [])
+                for rid in ids:
+                    for other in next_day:
+                        if abs(records[rid][1] - records[other][1]) <= CROSS_DAY_WINDOW:
+                            parent[root(other)] = root(rid)
+                            cross_day_roots.add(rid)
+
+            groups: Dict[str, List[str]] = {}
+            for rid in parent:
+                groups.setdefault(root(rid), []).append(rid)
+            cross_day = {root(rid) for rid in cross_day_roots}
+
+            result = []
+            for group_root, ids in groups.items():
+                if len(ids) < 2 or (wanted is not None and wanted.isdisjoint(ids)):
+                    continue
+                ids.sort(key=lambda rid: records[rid][1])
+                result.append({"key": records[ids[0]][0], "record_ids": ids,
+                               "cross_day": group_root in cross_day})
+            result.sort(key=lambda c: (-len(c["record_ids"]), c["key"]))
+            return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._reload_if_changed()
+            return {name: len(t["records"]) for name, t in self._tables.items()}
+
+    def clear(self):
+        with self._lock:
+            self._tables, self._mtime, self._loaded = {}, None, False
+            for path in (self.path, self.log_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+_default_index: Optional[DuplicateIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_duplicate_index() -> DuplicateIndex:
+    """Process-wide index shared by every AirtableClient"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = DuplicateIndex()
+        return _default_index
+
+
+def print_report(index: DuplicateIndex, tables: List[str]):
+    for table_name in tables:
+        clusters = index.clusters(table_name)
+        print(f"\n{table_name}: {len(clusters)} duplicate cluster(s)")
+        for cluster in clusters:
+            tag = " (crosses midnight)" if cluster["cross_day"] else ""
+            print(f"  {cluster['key']}: {', '.join(cluster['record_ids'])}{tag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duplicate record index for Food Log and Daily Habits")
+    sub = parser.add_subparsers(dest='command', required=True)
+    report = sub.add_parser('report', help="list duplicate clusters")
+    report.add_argument('--table', choices=list(INDEXED_TABLES))
+    sub.add_parser('rebuild', help="re-index every record from Airtable")
+    args = parser.parse_args()
+
+    index = get_duplicate_index()
+    if args.command == 'rebuild':
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from airtable_client import AirtableClient, HEALTH_BASE_ID, PRODUCTIVITY_BASE_ID, PRIORITY_LOW
+        client = AirtableClient(priority=PRIORITY_LOW, duplicates=index)
+        bases = {"Food Log": HEALTH_BASE_ID, "Daily Habits": PRODUCTIVITY_BASE_ID}
+        for table_name, base_id in bases.items():
+            records = client.query_records(base_id, table_name)
+            index.rebuild(table_name, records)
+            print(f"✅ {table_name}: indexed {len(records)} records")
+        return
+    print_report(index, [args.table] if args.table else list(INDEXED_TABLES))
+
+
+if __name__ == "__main__":
+    main()
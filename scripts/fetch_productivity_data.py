@@ -1,27 +1,29 @@
 #!/usr/bin/env python3
 """Fetch productivity data (TAT tasks + habits) from Airtable for Mission Control"""
 
-import requests
-import json
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime
+from pathlib import Path
 
-AIRTABLE_KEY = open('/home/samsclaw/.config/airtable/api_key').read().strip()
-PRODUCTIVITY_BASE = "appvUbV8IeGhxmcPn"
+sys.path.insert(0, str(Path(__file__).parent))
 
-def fetch_productivity_data():
-    headers = {"Authorization": f"Bearer {AIRTABLE_KEY}"}
-    
-    # 1. Fetch TAT Tasks (non-complete)
-    tat_url = f"https://api.airtable.com/v0/{PRODUCTIVITY_BASE}/tblkbuvkZUSpm1IgJ"
-    tat_response = requests.get(
-        f"{tat_url}?filterByFormula=Status!='Complete'&maxRecords=100",
-        headers=headers,
-        timeout=30
-    )
-    
+from dashboard_snapshot import ALL, DATA_DIR, deriver, run
+
+@deriver('productivity', DATA_DIR / 'productivity_data.json',
+         tables={'tasks': ALL, 'habits': 7})
+def derive_productivity(snapshot):
+    """Open TAT tasks and the last week of habit scores"""
+    # 1. TAT Tasks (non-complete)
     tat_tasks = []
-    if tat_response.status_code == 200:
-        for r in tat_response.json().get('records', []):
+    try:
+        open_tasks = [r for r in snapshot.records('tasks')
+                      if r['fields'].get('Status') != 'Complete'][:100]
+    except Exception as e:
+        print(f"  TAT error: {e}")
+        open_tasks = None
+    
+    if open_tasks is not None:
+        for r in open_tasks:
             f = r['fields']
             
             # Get days remaining safely - handle NaN dict
@@ -57,18 +59,17 @@ def fetch_productivity_data():
         # Sort by days remaining
         tat_tasks.sort(key=lambda x: x['days_remaining'])
     
-    # 2. Fetch last 7 days of habits
-    habits_url = f"https://api.airtable.com/v0/{PRODUCTIVITY_BASE}/tblZSHA0bOZGNaRUm"
-    week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-    habits_response = requests.get(
-        f"{habits_url}?filterByFormula=IS_AFTER({{Date}}, '{week_ago}')&maxRecords=10",
-        headers=headers,
-        timeout=30
-    )
-    
+    # 2. Last 7 days of habits
+    week_ago = snapshot.date(7)
     habit_days = []
-    if habits_response.status_code == 200:
-        records = habits_response.json().get('records', [])
+    try:
+        records = [r for r in snapshot.records('habits')
+                   if (r['fields'].get('Date') or '') > week_ago]
+    except Exception as e:
+        print(f"  Habits error: {e}")
+        records = None
+    
+    if records is not None:
         for r in records:
             f = r['fields']
             date_str = f.get('Date', '')
@@ -97,9 +98,10 @@ def fetch_productivity_data():
         # Sort by date
         habit_days.sort(key=lambda x: x['date'])
     
-    # Save data
-    data = {
-        'generated_at': datetime.now().isoformat(),
+    print(f"   - {len(tat_tasks)} tasks, {len(habit_days)} habit days")
+    
+    return {
+        'generated_at': snapshot.now.isoformat(),
         'tat_tasks': tat_tasks,
         'habit_days': habit_days,
         'stats': {
@@ -109,11 +111,9 @@ def fetch_productivity_data():
             'completed_7d': 0
         }
     }
-    
-    with open('/home/samsclaw/.openclaw/workspace/data/productivity_data.json', 'w') as f:
-        json.dump(data, f, indent=2)
-    
-    print(f"✅ Productivity data updated: {len(tat_tasks)} tasks, {len(habit_days)} habit days")
+
+def fetch_productivity_data():
+    run(['productivity'])
     return True
 
 if __name__ == "__main__":
@@ -1,25 +1,44 @@
 #!/usr/bin/env python3
-"""Fetch 7-day timeline data from Airtable for Mission Control dashboard"""
+"""Fetch timeline data from Airtable for Mission Control dashboard
 
-import requests
-import json
-from datetime import datetime, timedelta
-import urllib.parse
+One range query per table covers the whole window; rows are grouped
+into day buckets locally, so 90 or 365 days cost the same three
+requests (plus pagination) as the default week.
 
-AIRTABLE_KEY = open('/home/samsclaw/.config/airtable/api_key').read().strip()
-HEALTH_BASE = "appnVeGSjwJgG2snS"
+Usage:
+    python3 fetch_timeline_data.py                  # 7 days -> timeline_data.json
+    python3 fetch_timeline_data.py --days 90        # -> timeline_data_90d.json
+    python3 fetch_timeline_data.py --days 365 --end 2026-06-30
+"""
 
-def fetch_timeline_data():
-    headers = {"Authorization": f"Bearer {AIRTABLE_KEY}"}
-    
-    # Calculate date range
-    today = datetime.now()
-    dates = [(today - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]
-    dates.reverse()  # Oldest first
+import sys
+import asyncio
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dashboard_snapshot import DATA_DIR, deriver, fetch_snapshot, run, write_output
+
+TIMELINE_DAYS = 7
+TIMELINE_TABLES = ('food', 'whoop', 'weight')
+
+# Print a line per day only for short windows
+VERBOSE_DAYS = 14
+
+def build_timeline(snapshot, days):
+    """Calories in/out, strain, sleep and weight per day, oldest first"""
+    buckets = {}
+    for table in TIMELINE_TABLES:
+        try:
+            buckets[table] = snapshot.by_day(table)
+        except Exception as e:
+            print(f"  {table} error: {e}")
+            buckets[table] = {}
     
     days_data = []
-    
-    for date in dates:
+    for date in snapshot.dates(days):
         day_data = {
             'date': date,
             'calories_burned': 0,
@@ -29,73 +48,63 @@ def fetch_timeline_data():
             'sleep': 0
         }
         
-        # 1. Get calories consumed from Food Log using IS_SAME
-        try:
-            food_url = f"https://api.airtable.com/v0/{HEALTH_BASE}/tblsoErCMSBtzBZKB"
-            formula = urllib.parse.quote(f"IS_SAME(Date, '{date}', 'day')")
-            food_resp = requests.get(
-                f"{food_url}?filterByFormula={formula}",
-                headers=headers,
-                timeout=10
-            )
-            if food_resp.status_code == 200:
-                meals = food_resp.json().get('records', [])
-                day_data['calories_consumed'] = sum(
-                    m['fields'].get('Calories', 0) or 0 for m in meals
-                )
-        except Exception as e:
-            print(f"  Food log error for {date}: {e}")
+        # 1. Calories consumed from Food Log
+        meals = buckets['food'].get(date, [])
+        day_data['calories_consumed'] = sum(
+            m['fields'].get('Calories', 0) or 0 for m in meals
+        )
         
-        # 2. Get calories burned, strain, sleep from WHOOP using IS_SAME
-        try:
-            whoop_url = f"https://api.airtable.com/v0/{HEALTH_BASE}/tblUpFFMXvJSHCKXk"
-            formula = urllib.parse.quote(f"IS_SAME(Date, '{date}', 'day')")
-            whoop_resp = requests.get(
-                f"{whoop_url}?filterByFormula={formula}",
-                headers=headers,
-                timeout=10
-            )
-            if whoop_resp.status_code == 200:
-                whoop_records = whoop_resp.json().get('records', [])
-                if whoop_records:
-                    # Take the first record (or could average if multiple)
-                    f = whoop_records[0]['fields']
-                    day_data['calories_burned'] = f.get('Calories Burned', 0) or 0
-                    day_data['strain'] = f.get('Strain', 0) or 0
-                    day_data['sleep'] = f.get('Sleep Performance', 0) or 0
-        except Exception as e:
-            print(f"  WHOOP error for {date}: {e}")
+        # 2. Calories burned, strain, sleep from WHOOP
+        whoop_records = buckets['whoop'].get(date)
+        if whoop_records:
+            # Take the first record (or could average if multiple)
+            f = whoop_records[0]['fields']
+            day_data['calories_burned'] = f.get('Calories Burned', 0) or 0
+            day_data['strain'] = f.get('Strain', 0) or 0
+            day_data['sleep'] = f.get('Sleep Performance', 0) or 0
         
-        # 3. Get weight from Weight Tracker using IS_SAME
-        try:
-            weight_url = f"https://api.airtable.com/v0/{HEALTH_BASE}/tblBXv1DfQWDZSbRc"
-            formula = urllib.parse.quote(f"IS_SAME(Date, '{date}', 'day')")
-            weight_resp = requests.get(
-                f"{weight_url}?filterByFormula={formula}",
-                headers=headers,
-                timeout=10
-            )
-            if weight_resp.status_code == 200:
-                weight_records = weight_resp.json().get('records', [])
-                if weight_records:
-                    day_data['weight'] = weight_records[0]['fields'].get('Weight (kg)')
-        except Exception as e:
-            print(f"  Weight error for {date}: {e}")
+        # 3. Weight from Weight Tracker
+        weight_records = buckets['weight'].get(date)
+        if weight_records:
+            day_data['weight'] = weight_records[0]['fields'].get('Weight (kg)')
         
         days_data.append(day_data)
-        print(f"  {date}: {day_data['calories_consumed']} cal consumed, {day_data['calories_burned']} burned")
+        if days <= VERBOSE_DAYS:
+            print(f"  {date}: {day_data['calories_consumed']} cal consumed, {day_data['calories_burned']} burned")
+    
+    if days > VERBOSE_DAYS:
+        logged = sum(1 for d in days_data if d['calories_consumed'])
+        print(f"  {days_data[0]['date']} → {days_data[-1]['date']}: {logged}/{days} days with food logged")
     
-    # Save data
-    data = {
+    return {
         'generated_at': datetime.now().isoformat(),
         'days': days_data
     }
+
+@deriver('timeline', DATA_DIR / 'timeline_data.json',
+         tables={table: TIMELINE_DAYS for table in TIMELINE_TABLES})
+def derive_timeline(snapshot):
+    """Default 7-day timeline for the dashboard"""
+    return build_timeline(snapshot, TIMELINE_DAYS)
+
+def fetch_timeline_data(days=TIMELINE_DAYS, end=None):
+    """Build the timeline for the N days ending on end (default today)"""
+    if days == TIMELINE_DAYS and end is None:
+        run(['timeline'])
+        return True
     
-    with open('/home/samsclaw/.openclaw/workspace/data/timeline_data.json', 'w') as f:
-        json.dump(data, f, indent=2)
+    now = datetime.strptime(end, '%Y-%m-%d') if end else datetime.now()
+    snapshot = asyncio.run(fetch_snapshot({table: days for table in TIMELINE_TABLES}, now))
+    data = build_timeline(snapshot, days)
     
-    print(f"\n✅ Timeline data updated: {len(days_data)} days")
+    output = DATA_DIR / f'timeline_data_{days}d.json'
+    write_output(output, data)
+    print(f"\n✅ Timeline data updated: {len(data['days'])} days → {output}")
     return True
 
 if __name__ == "__main__":
-    fetch_timeline_data()
+    parser = argparse.ArgumentParser(description="Build calories/strain/weight timeline")
+    parser.add_argument('--days', type=int, default=TIMELINE_DAYS)
+    parser.add_argument('--end', help="last day of the window (YYYY-MM-DD, default today)")
+    args = parser.parse_args()
+    fetch_timeline_data(args.days, args.end)
@@ -2,106 +2,91 @@
 """
 Sam's Daily Command Center - Dashboard Generator v2.1
 With 7-day history, individual habit streaks, and improved layout
+
+Sections are fetched concurrently, each with a deadline; a late or failed
+section is shown from its last good value and marked stale in the header.
 """
 
 import json
 import os
+import sys
+import time
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from notion_client import NOTION_VERSION_DATA_SOURCES, get_notion_client
+from notion_decoder import compile_decoder
+
 # Config
 DASHBOARD_PATH = Path.home() / '.openclaw/workspace/dashboard/index.html'
 DATA_DIR = Path.home() / '.openclaw'
 
+# Seconds from the start of a refresh each section may take; a late or
+# failed section is rendered from its last good value, marked stale
+SECTION_DEADLINE = 8.0
+LOCAL_SECTION_DEADLINE = 2.0  # sections read from local files only
+
+# Last good value per section
+SECTION_CACHE = DASHBOARD_PATH.parent / '.dashboard_sections.json'
+
+# Notion properties read by each section, in the order rows unpack
+TAT_COLUMNS = ['Task Name', 'TAT Category Days', 'Due Date']
+FOOD_COLUMNS = ['Name', 'Meal', 'Calories', 'Protein (g)', 'Carbs (g)', 'Fat (g)']
+FOOD_DEFAULTS = {'Name': '', 'Meal': 'Snack', 'Calories': 0, 'Protein (g)': 0, 'Carbs (g)': 0, 'Fat (g)': 0}
+HABIT_COLUMNS = ['Fruit (2 portions)', 'Multivitamin', 'Creatine', 'Exercise', 'Exercise Type', 'Water (8 glasses)']
+HABIT_DEFAULTS = {**dict.fromkeys(HABIT_COLUMNS, False), 'Exercise Type': ''}
+
 def get_tat_tasks():
     """Fetch urgent TAT tasks - 🔥 Today category + overdue from Notion"""
+    # No token raises ValueError: gather_sections serves the cache or fallback
+    client = get_notion_client()
+    
     try:
-        import requests
-        
-        # Get Notion API key
-        notion_key_path = Path.home() / '.config/notion/api_key'
-        if not notion_key_path.exists():
-            return [{"name": "Notion API not configured", "urgency": "Today", "due": "Setup needed"}]
-        
-        with open(notion_key_path, 'r') as f:
-            notion_key = f.read().strip()
-        
         # TAT Database ID
         db_id = "2fcf2cb1-2276-81d6-aebe-f388bdb09b8e"
         
-        headers = {
-            "Authorization": f"Bearer {notion_key}",
-            "Notion-Version": "2022-06-28",
-            "Content-Type": "application/json"
-        }
-        
         today = datetime.now().strftime('%Y-%m-%d')
         
         # Query for "🔥 Today" category + overdue tasks
-        query = {
-            "filter": {
-                "or": [
-                    {
-                        "property": "TAT Category Days",
-                        "select": {
-                            "equals": "🔥 Today"
-                        }
-                    },
-                    {
-                        "and": [
-                            {
-                                "property": "Due Date",
-                                "date": {
-                                    "is_not_empty": True
-                                }
-                            },
-                            {
-                                "property": "Due Date",
-                                "date": {
-                                    "before": today
-                                }
-                            }
-                        ]
+        tat_filter = {
+            "or": [
+                {
+                    "property": "TAT Category Days",
+                    "select": {
+                        "equals": "🔥 Today"
                     }
-                ]
-            },
-            "sorts": [
+                },
                 {
-                    "property": "Due Date",
-                    "direction": "ascending"
+                    "and": [
+                        {
+                            "property": "Due Date",
+                            "date": {
+                                "is_not_empty": True
+                            }
+                        },
+                        {
+                            "property": "Due Date",
+                            "date": {
+                                "before": today
+                            }
+                        }
+                    ]
                 }
-            ],
-            "page_size": 10
+            ]
         }
         
-        response = requests.post(
-            f"https://api.notion.com/v1/databases/{db_id}/query",
-            headers=headers,
-            json=query
-        )
-        
-        if response.status_code != 200:
-            return [{"name": "TAT query failed", "urgency": "Error", "due": "Check API"}]
+        pages = client.query_all(db_id, filter=tat_filter,
+                                 sorts=[{"property": "Due Date", "direction": "ascending"}],
+                                 limit=10)
         
-        data = response.json()
         tasks = []
+        rows = compile_decoder(pages[0]['properties'], TAT_COLUMNS,
+                               defaults=dict.fromkeys(TAT_COLUMNS, '')).decode_many(pages) if pages else []
         
-        for page in data.get('results', []):
-            props = page.get('properties', {})
-            
-            # Get task name
-            name = ""
-            if 'Task Name' in props:
-                title_items = props['Task Name'].get('title', [])
-                if title_items:
-                    name = title_items[0].get('text', {}).get('content', '')
-            
-            # Get TAT Category Days
-            tat_category = props.get('TAT Category Days', {}).get('select', {}).get('name', '')
-            
-            # Get due date
-            due_date = props.get('Due Date', {}).get('date', {}).get('start', '')
-            
+        for name, tat_category, due_date in rows:
             # Determine urgency display
             is_overdue = due_date and due_date < today
             
@@ -133,54 +118,32 @@ def get_tat_tasks():
         return tasks
         
     except Exception as e:
-        return [{"name": f"Error loading TAT: {str(e)[:30]}", "urgency": "Error", "due": "-"}]
+        print(f"TAT fetch error: {e}")
+        raise
+
+def _get_fallback_tat():
+    """Fallback TAT list when Notion is unavailable"""
+    return [{"name": "TAT tasks unavailable", "urgency": "Error", "due": "Check API"}]
 
 def get_nutrition_with_meals():
     """Get nutrition with detailed meal breakdown from Notion Food Log"""
+    client = get_notion_client(NOTION_VERSION_DATA_SOURCES)
+
     try:
-        import requests
         from datetime import datetime
 
-        # Get Notion API key
-        notion_key_path = Path.home() / '.config/notion/api_key'
-        if not notion_key_path.exists():
-            return _get_fallback_nutrition()
-
-        with open(notion_key_path, 'r') as f:
-            notion_key = f.read().strip()
-
         # Food Log Data Source ID
         data_source_id = "c1d1100c-cbc4-416d-8c1b-59f7e2ff15c0"
 
-        headers = {
-            "Authorization": f"Bearer {notion_key}",
-            "Notion-Version": "2025-09-03",
-            "Content-Type": "application/json"
-        }
-
         today = datetime.now().strftime('%Y-%m-%d')
 
         # Query for today's entries
-        query = {
-            "filter": {
-                "property": "Date",
-                "date": {
-                    "equals": today
-                }
-            },
-            "sorts": [{"property": "Meal", "direction": "ascending"}]
-        }
-
-        response = requests.post(
-            f"https://api.notion.com/v1/data_sources/{data_source_id}/query",
-            headers=headers,
-            json=query
-        )
-
-        if response.status_code != 200:
-            return _get_fallback_nutrition()
+        pages = list(client.iter_data_source(
+            data_source_id,
+            filter={"property": "Date", "date": {"equals": today}},
+            sorts=[{"property": "Meal", "direction": "ascending"}]
+        ))
 
-        data = response.json()
         meals = []
         total_calories = 0
         total_protein = 0
@@ -190,25 +153,10 @@ def get_nutrition_with_meals():
         # Group entries by meal type
         meal_groups = {"Breakfast": [], "Lunch": [], "Dinner": [], "Snack": []}
 
-        for page in data.get('results', []):
-            props = page.get('properties', {})
-
-            # Get food name
-            name = ""
-            if 'Name' in props:
-                title_items = props['Name'].get('title', [])
-                if title_items:
-                    name = title_items[0].get('text', {}).get('content', '')
-
-            # Get meal type
-            meal_type = props.get('Meal', {}).get('select', {}).get('name', 'Snack')
-
-            # Get nutrition values
-            calories = props.get('Calories', {}).get('number') or 0
-            protein = props.get('Protein (g)', {}).get('number') or 0
-            carbs = props.get('Carbs (g)', {}).get('number') or 0
-            fat = props.get('Fat (g)', {}).get('number') or 0
+        rows = compile_decoder(pages[0]['properties'], FOOD_COLUMNS,
+                               defaults=FOOD_DEFAULTS).decode_many(pages) if pages else []
 
+        for name, meal_type, calories, protein, carbs, fat in rows:
             total_calories += calories
             total_protein += protein
             total_carbs += carbs
@@ -252,7 +200,7 @@ def get_nutrition_with_meals():
 
     except Exception as e:
         print(f"Nutrition fetch error: {e}")
-        return _get_fallback_nutrition()
+        raise
 
 def _get_fallback_nutrition():
     """Fallback nutrition data when Notion is unavailable"""
@@ -351,55 +299,28 @@ def get_whoop_data():
     except:
         pass
     
-    # Fallback: no data available
+    # No source had data - gather_sections shows the last good value
+    raise RuntimeError("no WHOOP data available")
+
+def _get_fallback_whoop():
+    """Fallback WHOOP card when no source has data"""
     return {"recovery": 0, "sleep": 0, "zone": "unknown", "nodata": True}
 
 def get_habits_with_streaks():
     """Get habits with individual streaks from Notion Habit Tracker"""
+    client = get_notion_client()
+
     try:
-        import requests
         from datetime import datetime
 
-        # Get Notion API key
-        notion_key_path = Path.home() / '.config/notion/api_key'
-        if not notion_key_path.exists():
-            return _get_fallback_habits()
-
-        with open(notion_key_path, 'r') as f:
-            notion_key = f.read().strip()
-
         # Habit Tracker Database ID
         db_id = "304f2cb1-2276-81bb-b69f-c28f02d35fa5"
 
-        headers = {
-            "Authorization": f"Bearer {notion_key}",
-            "Notion-Version": "2022-06-28",
-            "Content-Type": "application/json"
-        }
-
         today = datetime.now().strftime('%Y-%m-%d')
 
         # Query for today's entry
-        query = {
-            "filter": {
-                "property": "Date",
-                "date": {
-                    "equals": today
-                }
-            }
-        }
-
-        response = requests.post(
-            f"https://api.notion.com/v1/databases/{db_id}/query",
-            headers=headers,
-            json=query
-        )
-
-        if response.status_code != 200:
-            return _get_fallback_habits()
-
-        data = response.json()
-        results = data.get('results', [])
+        results = client.query_all(db_id, filter={"property": "Date", "date": {"equals": today}},
+                                   limit=1)
 
         # Default habits structure
         habits = {
@@ -412,31 +333,23 @@ def get_habits_with_streaks():
         }
 
         if results:
-            props = results[0].get('properties', {})
+            (fruit_done, vitamin_done, creatine_done, exercise_done, exercise_type,
+             water_done) = compile_decoder(results[0]['properties'], HABIT_COLUMNS,
+                                           defaults=HABIT_DEFAULTS).decode(results[0])
 
             # Fruit (2 portions)
-            fruit_done = props.get('Fruit (2 portions)', {}).get('checkbox', False)
             habits['fruit'] = {"current": 2 if fruit_done else 0, "goal": 2, "done": fruit_done, "streak": 0}
 
             # Multivitamin
-            vitamin_done = props.get('Multivitamin', {}).get('checkbox', False)
             habits['vitamins'] = {"done": vitamin_done, "streak": 0}
 
             # Creatine
-            creatine_done = props.get('Creatine', {}).get('checkbox', False)
             habits['creatine'] = {"done": creatine_done, "streak": 0}
 
             # Exercise/Workout
-            exercise_done = props.get('Exercise', {}).get('checkbox', False)
-            exercise_type = ""
-            if 'Exercise Type' in props:
-                rich_text = props['Exercise Type'].get('rich_text', [])
-                if rich_text:
-                    exercise_type = rich_text[0].get('text', {}).get('content', '')
             habits['workout'] = {"done": exercise_done, "streak": 0, "type": exercise_type}
 
             # Water (8 glasses)
-            water_done = props.get('Water (8 glasses)', {}).get('checkbox', False)
             habits['water'] = {"current": 8 if water_done else 0, "goal": 8, "done": water_done, "streak": 0}
 
             # Sleep - estimate from WHOOP or default
@@ -447,7 +360,7 @@ def get_habits_with_streaks():
 
     except Exception as e:
         print(f"Habits fetch error: {e}")
-        return _get_fallback_habits()
+        raise
 
 def _get_fallback_habits():
     """Fallback habits when Notion is unavailable"""
@@ -522,7 +435,11 @@ def get_security_status():
 
     except Exception as e:
         print(f"Security status error: {e}")
-        return {"status": "unknown", "pending_updates": 0, "last_check": "Error"}
+        raise
+
+def _get_fallback_security():
+    """Fallback security status when the audit can't be read"""
+    return {"status": "unknown", "pending_updates": 0, "last_check": "Error"}
 
 def get_7day_history():
     """Get 7-day history for charts"""
@@ -552,19 +469,89 @@ def generate_sparkline(data, height=40):
     path = "M" + " L".join(points)
     return f'<svg width="100%" height="{height}" viewBox="0 0 {width} {height}" style="overflow: visible;"><path d="{path}" fill="none" stroke="#667eea" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"/><circle cx="{width}" cy="{height - ((data[-1] - min_val) / range_val) * (height - 10) - 5}" r="3" fill="#22c55e"/></svg>'
 
+# name -> (fetcher, fallback when nothing is cached, deadline)
+SECTIONS = {
+    'tat': (get_tat_tasks, _get_fallback_tat, SECTION_DEADLINE),
+    'nutrition': (get_nutrition_with_meals, _get_fallback_nutrition, SECTION_DEADLINE),
+    'habits': (get_habits_with_streaks, _get_fallback_habits, SECTION_DEADLINE),
+    'whoop': (get_whoop_data, _get_fallback_whoop, LOCAL_SECTION_DEADLINE),
+    'security': (get_security_status, _get_fallback_security, LOCAL_SECTION_DEADLINE),
+}
+
+def load_section_cache():
+    try:
+        with open(SECTION_CACHE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_section_cache(cache):
+    SECTION_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = SECTION_CACHE.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=2, default=str)
+    os.replace(tmp_path, SECTION_CACHE)
+
+def _run_section(fetch, outcome):
+    try:
+        outcome['data'] = fetch()
+    except Exception as e:
+        outcome['error'] = str(e) or type(e).__name__
+
+def gather_sections():
+    """Fetch every section at once, each bounded by its deadline
+    
+    Returns ({name: data}, {name: as_of}) where the second dict lists the
+    sections served from the cache (as_of None: nothing cached, fallback
+    shown). Fetchers run on daemon threads, so one stuck on a slow request
+    is abandoned at its deadline instead of holding up the render or exit.
+    """
+    started = time.monotonic()
+    outcomes = {name: {} for name in SECTIONS}
+    threads = {}
+    for name, (fetch, _, _) in SECTIONS.items():
+        threads[name] = threading.Thread(target=_run_section, args=(fetch, outcomes[name]),
+                                         name=f"dashboard-{name}", daemon=True)
+        threads[name].start()
+    
+    cache = load_section_cache()
+    now = datetime.now().isoformat(timespec='seconds')
+    data, stale = {}, {}
+    for name, (_, fallback, deadline) in SECTIONS.items():
+        threads[name].join(max(started + deadline - time.monotonic(), 0))
+        outcome = dict(outcomes[name])
+        if 'data' in outcome:
+            data[name] = outcome['data']
+            cache[name] = {'data': outcome['data'], 'as_of': now}
+            continue
+        error = outcome.get('error', 'deadline exceeded')
+        cached = cache.get(name)
+        data[name] = cached['data'] if cached else fallback()
+        stale[name] = cached['as_of'] if cached else None
+        print(f"⚠️ {name}: {error}" + (f" - using cache from {cached['as_of']}" if cached else ""))
+    
+    save_section_cache(cache)
+    return data, stale
+
 def generate_dashboard():
     """Generate HTML dashboard"""
     
     # Fetch all data
-    tat = get_tat_tasks()
-    nutrition = get_nutrition_with_meals()
+    sections, stale = gather_sections()
+    tat = sections['tat']
+    nutrition = sections['nutrition']
     water = get_water_status()
-    whoop = get_whoop_data()
-    habits = get_habits_with_streaks()
+    whoop = sections['whoop']
+    habits = sections['habits']
     workout = get_workout_status()
-    security = get_security_status()
+    security = sections['security']
     history = get_7day_history()
     
+    stale_note = ""
+    if stale:
+        stale_note = "⚠️ Stale: " + ", ".join(
+            f"{name} ({as_of[5:16].replace('T', ' ') if as_of else 'no data'})" for name, as_of in stale.items())
+    
     now = datetime.now()
     
     html = f'''<!DOCTYPE html>
@@ -589,6 +576,7 @@ def generate_dashboard():
         }}
         .header h1 {{ font-size: 20px; font-weight: 600; }}
         .header .date {{ font-size: 14px; opacity: 0.9; margin-top: 5px; }}
+        .header .stale {{ font-size: 12px; color: #fde68a; margin-top: 5px; }}
         
         .card {{
             background: #1a1a2e;
@@ -743,6 +731,7 @@ def generate_dashboard():
     <div class="header">
         <h1>🦞 Sam's Command Center</h1>
         <div class="date">{now.strftime('%A, %B %d')}</div>
+        {f'<div class="stale">{stale_note}</div>' if stale_note else ''}
     </div>
 '''
 
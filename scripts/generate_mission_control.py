@@ -13,7 +13,8 @@ from pathlib import Path
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from airtable_client import get_health_client, get_productivity_client
+from airtable_client import PRIORITY_LOW
+from airtable_replica import get_replica_health_client, get_replica_productivity_client
 
 # Config
 WORKSPACE = Path.home() / '.openclaw/workspace'
@@ -22,7 +23,7 @@ OUTPUT_PATH = WORKSPACE / 'mission-control/index.html'
 def fetch_tat_tasks():
     """Fetch urgent TAT tasks from Airtable"""
     try:
-        client = get_productivity_client()
+        client = get_replica_productivity_client(PRIORITY_LOW)
         urgent_tasks = client.get_urgent_tat_tasks()
         
         today = datetime.now().strftime('%Y-%m-%d')
@@ -67,7 +68,7 @@ def fetch_tat_tasks():
 def get_food_log():
     """Get recent food log entries from Airtable"""
     try:
-        client = get_health_client()
+        client = get_replica_health_client(PRIORITY_LOW)
         entries = client.get_food_entries(days=1)
         
         total_calories = 0
@@ -91,7 +92,7 @@ def get_food_log():
 def get_weight_data():
     """Get latest weight entry"""
     try:
-        client = get_health_client()
+        client = get_replica_health_client(PRIORITY_LOW)
         entries = client.get_weight_entries(days=30)
         
         if entries:
@@ -109,7 +110,7 @@ def get_weight_data():
 def get_workouts():
     """Get recent workouts"""
     try:
-        client = get_health_client()
+        client = get_replica_health_client(PRIORITY_LOW)
         entries = client.get_workouts(days=7)
         
         total_duration = 0
@@ -131,7 +132,7 @@ def get_workouts():
 def get_habits():
     """Get today's habit status"""
     try:
-        client = get_health_client()
+        client = get_replica_health_client(PRIORITY_LOW)
         today = datetime.now().strftime('%Y-%m-%d')
         
         # Get all habits from today
@@ -6,10 +6,15 @@ Generates overview + drill-down pages
 
 import json
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 import requests
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from notion_client import NotionAPIError, get_notion_client
+
 # [Include all the data fetching functions from previous script]
 # ... (same as above)
 
@@ -25,41 +30,16 @@ DB_IDS = {
     'weight': 'f9583de8-69e9-40e6-ab15-c530277ec474',
 }
 
-def get_notion_key():
-    try:
-        with open(Path.home() / '.config/notion/api_key', 'r') as f:
-            return f.read().strip()
-    except:
-        return None
-
 def query_database(db_id, filter_obj=None):
-    notion_key = get_notion_key()
-    if not notion_key:
-        return []
-    headers = {
-        "Authorization": f"Bearer {notion_key}",
-        "Notion-Version": NOTION_VERSION,
-        "Content-Type": "application/json"
-    }
-    payload = {"page_size": 100}
-    if filter_obj:
-        payload["filter"] = filter_obj
+    """Every page in a database matching filter_obj ([] if Notion is unavailable)"""
     try:
-        response = requests.post(
-            f"https://api.notion.com/v1/databases/{db_id}/query",
-            headers=headers,
-            json=payload,
-            timeout=30
-        )
-        if response.status_code == 200:
-            return response.json().get('results', [])
-    except:
-        pass
-    return []
+        return get_notion_client(NOTION_VERSION).query_all(db_id, filter=filter_obj)
+    except (ValueError, NotionAPIError, requests.exceptions.RequestException):
+        return []
 
 def get_today_habits():
     today = datetime.now().strftime('%Y-%m-%d')
-    results = query_database(DB_IDS['habits'])
+    results = query_database(DB_IDS['habits'], {"property": "Date", "date": {"equals": today}})
     for entry in results:
         props = entry.get('properties', {})
         date = props.get('Date', {}).get('date', {}).get('start', '')
@@ -14,7 +14,8 @@ from pathlib import Path
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from airtable_client import get_health_client, get_productivity_client
+from airtable_client import get_health_client, get_productivity_client, PRIORITY_LOW
+from tat_index import get_tat_index
 
 # Try to import WHOOP client
 try:
@@ -46,34 +47,35 @@ def get_whoop_data():
         }
 
 def get_urgent_tat_tasks():
-    """Get Category 1 (Today) + overdue TAT tasks from Airtable"""
+    """Get Category 1 (Today) + overdue TAT tasks from the local TAT index"""
+    index = get_tat_index()
+    try:
+        # Only records changed since the last refresh come over the network
+        index.refresh(get_productivity_client(PRIORITY_LOW))
+    except Exception as e:
+        print(f"⚠️ Could not refresh TAT index, using local copy: {e}")
+    
     try:
-        client = get_productivity_client()
         today = datetime.now().strftime('%Y-%m-%d')
-        
-        # Get urgent tasks from Airtable
-        urgent_tasks = client.get_urgent_tat_tasks()
+        urgent = {t['id']: t for t in index.by_category('1')}
+        urgent.update((t['id'], t) for t in index.overdue(today))
+        urgent_tasks = sorted(urgent.values(),
+                              key=lambda t: t['fields'].get('Due Date') or '9999')
         
         tasks = []
         for task in urgent_tasks[:5]:  # Limit to top 5
             fields = task.get('fields', {})
             
             name = fields.get('Task Name', '')
-            category = fields.get('Category', '')
             due_date = fields.get('Due Date', '')
-            priority = fields.get('Priority', '')
-            
-            # Check if overdue
-            is_overdue = due_date and due_date < today
-            is_urgent = category == '1' or is_overdue
             
-            if name and is_urgent:
+            if name:
                 tasks.append({
                     'name': name,
-                    'category': category,
+                    'category': fields.get('Category', ''),
                     'due_date': due_date,
-                    'priority': priority,
-                    'overdue': is_overdue
+                    'priority': fields.get('Priority', ''),
+                    'overdue': bool(due_date) and due_date < today
                 })
         
         return tasks
@@ -85,7 +87,7 @@ def get_urgent_tat_tasks():
 def get_yesterday_health_summary():
     """Get yesterday's health summary from Airtable"""
     try:
-        client = get_health_client()
+        client = get_health_client(PRIORITY_LOW)
         yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
         
         # Get food entries - filter locally
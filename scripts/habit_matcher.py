@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Compiled Habit Matcher
+Keyword and number matching shared by habit_parser (chat messages) and
+habit_tracker_from_food (food descriptions).
+
+Each vocabulary is compiled once into a single alternation regex, with
+the keywords folded into a prefix trie so the regex engine tries each
+branch once per position instead of once per keyword. One findall pass
+reports the habits whose keywords appear; a keyword can only hide another
+habit's keyword where the two overlap (e.g. "watermelon" hides "water"),
+and those pairs are found at compile time and re-checked only when the
+longer keyword matched. Number patterns compile into one ordered
+alternation that keeps the "first pattern that matches wins" rule.
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Regex matching any of the words, factored on common prefixes"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        ends = '' in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if ends:
+            # Greedy, so the longest keyword at a position wins
+            return f"(?:{body})?" if len(branches) > 1 or len(body) > 1 else f"{body}?"
+        return body
+
+    return build(trie)
+
+
+def _overlaps(longer: str, other: str) -> bool:
+    """Can a match of other start inside a match of longer?"""
+    for i in range(len(longer)):
+        tail = longer[i:]
+        if tail.startswith(other) or other.startswith(tail):
+            return True
+    return False
+
+
+def _first_of(patterns: List[str]) -> Optional[re.Pattern]:
+    """One regex equivalent to trying each pattern in turn with re.search
+
+    Each alternative scans the whole text, and the regex engine only moves
+    on to the next alternative when the current one matches nowhere.
+    """
+    if not patterns:
+        return None
+    return re.compile('|'.join(rf'(?:.*?{p})' for p in patterns), re.DOTALL)
+
+
+class HabitMatcher:
+    """Habits mentioned in a text, and the first number for each
+
+    habits: {name: {"keywords": [...], "number_patterns": [...]}} where
+    every number pattern has exactly one capture group.
+    bounded(keyword) -> True to match that keyword only as a whole word.
+    """
+
+    def __init__(self, habits: Dict[str, Dict],
+                 bounded: Callable[[str], bool] = lambda keyword: False):
+        self.names = list(habits)
+        self._habits_of: Dict[str, List[str]] = {}
+        per_habit = {}
+        for name, config in habits.items():
+            keywords = set(config['keywords'])
+            for keyword in keywords:
+                self._habits_of.setdefault(keyword, []).append(name)
+            per_habit[name] = self._compile(keywords, bounded)
+        self._keywords = self._compile(self._habits_of, bounded)
+
+        # Matched keyword -> (habit, its own regex) it may have hidden
+        self._hidden: Dict[str, List[tuple]] = {}
+        for keyword, owners in self._habits_of.items():
+            for name, config in habits.items():
+                if name not in owners and any(_overlaps(keyword, other)
+                                              for other in config['keywords']):
+                    self._hidden.setdefault(keyword, []).append((name, per_habit[name]))
+
+        self._numbers = {name: _first_of(config.get('number_patterns', []))
+                         for name, config in habits.items()}
+
+    @staticmethod
+    def _compile(keywords: Iterable[str], bounded: Callable[[str], bool]) -> re.Pattern:
+        keywords = list(keywords)
+        whole_words = [k for k in keywords if bounded(k)]
+        substrings = [k for k in keywords if not bounded(k)]
+        parts = []
+        if whole_words:
+            parts.append(rf'\b(?:{trie_pattern(whole_words)})\b')
+        if substrings:
+            parts.append(trie_pattern(substrings))
+        return re.compile('|'.join(parts))
+
+    def habits_in(self, text: str) -> Set[str]:
+        """Names of the habits whose keywords appear in text (lowercased)"""
+        matched = set(self._keywords.findall(text))
+        found = {name for keyword in matched for name in self._habits_of[keyword]}
+        for keyword in matched:
+            for name, regex in self._hidden.get(keyword, ()):
+                if name not in found and regex.search(text):
+                    found.add(name)
+        return found
+
+    def match(self, text: str) -> Dict[str, Optional[int]]:
+        """{habit: first number or None} for each habit in text (lowercased)"""
+        found = self.habits_in(text)
+        result = {}
+        for name in self.names:
+            if name not in found:
+                continue
+            numbers = self._numbers[name]
+            number = numbers.match(text) if numbers else None
+            result[name] = int(number.group(number.lastindex)) if number else None
+        return result
+
+    def match_many(self, texts: Iterable[str]) -> List[Dict[str, Optional[int]]]:
+        """match() for every text (already lowercased), in order"""
+        return [self.match(text) for text in texts]
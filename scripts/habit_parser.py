@@ -4,12 +4,15 @@ Natural Language Habit Parser for OpenClaw
 Auto-detects habit mentions and updates Notion
 """
 
-import re
 import sys
 import os
+from pathlib import Path
 
 # Add workspace to path
 sys.path.insert(0, '/home/samsclaw/.openclaw/workspace')
+sys.path.insert(0, str(Path(__file__).parent))
+
+from habit_matcher import HabitMatcher
 
 # Habit detection patterns
 HABIT_PATTERNS = {
@@ -53,53 +56,42 @@ HABIT_PATTERNS = {
     }
 }
 
-def parse_habit_update(message):
-    """Parse a message for habit updates"""
-    message_lower = message.lower()
+# Short keywords only match as whole words ("ran" shouldn't match "orange")
+HABIT_MATCHER = HabitMatcher(HABIT_PATTERNS, bounded=lambda keyword: len(keyword) <= 4)
+
+def _updates_for(message, found):
     updates = []
-    
-    for habit_name, config in HABIT_PATTERNS.items():
-        # Check if any keyword is present (with word boundaries for short words)
-        found = False
-        for keyword in config['keywords']:
-            if len(keyword) <= 4:
-                # Use word boundaries for short words
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                if re.search(pattern, message_lower):
-                    found = True
-                    break
-            else:
-                if keyword in message_lower:
-                    found = True
-                    break
+    for habit_name, value in found.items():
+        config = HABIT_PATTERNS[habit_name]
+        update = {
+            'habit': habit_name,
+            'field': config['database_field'],
+            'type': config['type']
+        }
         
-        if found:
-            update = {
-                'habit': habit_name,
-                'field': config['database_field'],
-                'type': config['type']
-            }
-            
-            # Try to extract number
-            value = None
-            for pattern in config['number_patterns']:
-                match = re.search(pattern, message_lower)
-                if match:
-                    value = int(match.group(1))
-                    break
-            
-            if value:
-                update['value'] = value
-            
-            # Special handling for specific phrases
-            if habit_name == 'water':
-                if 'another' in message_lower or 'more' in message_lower or '+' in message:
-                    update['increment'] = True
-            
-            updates.append(update)
+        if value:
+            update['value'] = value
+        
+        # Special handling for specific phrases
+        if habit_name == 'water':
+            message_lower = message.lower()
+            if 'another' in message_lower or 'more' in message_lower or '+' in message:
+                update['increment'] = True
+        
+        updates.append(update)
     
     return updates
 
+def parse_habit_update(message):
+    """Parse a message for habit updates"""
+    return _updates_for(message, HABIT_MATCHER.match(message.lower()))
+
+def parse_habit_updates(messages):
+    """parse_habit_update for many messages at once (one list per message)"""
+    messages = list(messages)
+    found = HABIT_MATCHER.match_many(m.lower() for m in messages)
+    return [_updates_for(message, f) for message, f in zip(messages, found)]
+
 def format_confirmation(updates):
     """Format confirmation message"""
     if not updates:
@@ -2,66 +2,98 @@
 """
 Update food logging to also track habits (water, multivitamin)
 When food contains these items, update Daily Habits table
+
+Backfill mode streams the whole Food Log, derives each day's habits and
+upserts only the Daily Habits fields that are missing or lower:
+    python3 habit_tracker_from_food.py --backfill [--dry-run] [--restart]
 """
 
+import os
+import json
 import requests
-import re
 import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from airtable_client import AirtableClient, PRIORITY_LOW
+from airtable_formula import and_, gte, is_after, lte
+from habit_matcher import HabitMatcher
 
 AIRTABLE_KEY = open('/home/samsclaw/.config/airtable/api_key').read().strip()
 HEALTH_BASE = "appnVeGSjwJgG2snS"
 PRODUCTIVITY_BASE = "appvUbV8IeGhxmcPn"
 
+BACKFILL_CHECKPOINT = '/home/samsclaw/.openclaw/workspace/data/habit_backfill_checkpoint.json'
+
+# Days of Food Log diffed against Daily Habits per round trip
+BACKFILL_DAYS_PER_BATCH = 50
+
+# Food Log description fields, in order of preference (all must exist:
+# Airtable rejects unknown names in fields[] with 422 UNKNOWN_FIELD_NAME)
+FOOD_LOG_TEXT_FIELDS = ('Food Items', 'Food Name')
+
 def get_today():
     """Get today's date in YYYY-MM-DD format"""
     return datetime.now().strftime('%Y-%m-%d')
 
+# Daily Habits field -> what counts as a mention in a food description
+FOOD_HABITS = {
+    'Multivitamin': {
+        'keywords': ['multivitamin', 'vitamin', 'multi vitamin', 'multi-vitamin'],
+    },
+    'Fruit': {
+        'keywords': [
+            'apple', 'banana', 'orange', 'pear', 'grape', 'berry', 'berries',
+            'strawberry', 'blueberry', 'raspberry', 'blackberry', 'mango',
+            'pineapple', 'watermelon', 'melon', 'peach', 'plum', 'cherry',
+            'kiwi', 'lemon', 'lime', 'date', 'fig', 'pomegranate'
+        ],
+    },
+    'Water': {
+        'keywords': ['water'],
+        'number_patterns': [
+            r'(\d+)\s*glass(?:es)?\s+of\s+water',
+            r'(\d+)\s*glass(?:es)?\s+water',
+            r'water\s*:\s*(\d+)',
+        ],
+    },
+}
+
+FOOD_HABIT_MATCHER = HabitMatcher(FOOD_HABITS)
+
+def _habit_fields(found):
+    updates = {}
+    if 'Multivitamin' in found:
+        updates['Multivitamin'] = True
+    if 'Fruit' in found:
+        updates['Fruit'] = True
+    if 'Water' in found:
+        # Assume 1 glass if water is just mentioned
+        updates['Water'] = found['Water'] or 1
+    return updates
+
+def detect_food_habits(food_description):
+    """Daily Habits fields implied by a food description"""
+    return _habit_fields(FOOD_HABIT_MATCHER.match(food_description.lower()))
+
+def detect_food_habits_many(food_descriptions):
+    """detect_food_habits for many descriptions at once (one dict each)"""
+    found = FOOD_HABIT_MATCHER.match_many(d.lower() for d in food_descriptions)
+    return [_habit_fields(f) for f in found]
+
 def update_habits_from_food(food_description):
     """Check if food mentions habits and update accordingly"""
     
-    food_lower = food_description.lower()
-    updates = {}
+    updates = detect_food_habits(food_description)
     
-    # Check for multivitamin
-    if any(word in food_lower for word in ['multivitamin', 'vitamin', 'multi vitamin', 'multi-vitamin']):
-        updates['Multivitamin'] = True
+    if 'Multivitamin' in updates:
         print("  💊 Multivitamin detected - will update habits")
-    
-    # Check for fruit
-    fruit_keywords = [
-        'apple', 'banana', 'orange', 'pear', 'grape', 'berry', 'berries',
-        'strawberry', 'blueberry', 'raspberry', 'blackberry', 'mango',
-        'pineapple', 'watermelon', 'melon', 'peach', 'plum', 'cherry',
-        'kiwi', 'lemon', 'lime', 'date', 'fig', 'pomegranate'
-    ]
-    
-    if any(fruit in food_lower for fruit in fruit_keywords):
-        updates['Fruit'] = True
+    if 'Fruit' in updates:
         print("  🍎 Fruit detected - will update habits")
-    
-    # Check for water
-    water_patterns = [
-        r'(\d+)\s*glass(?:es)?\s+of\s+water',
-        r'(\d+)\s*glass(?:es)?\s+water',
-        r'water\s*:\s*(\d+)',
-    ]
-    
-    water_count = 0
-    for pattern in water_patterns:
-        matches = re.findall(pattern, food_lower)
-        if matches:
-            water_count = int(matches[0])
-            break
-    
-    # Also check for just "water" mentioned
-    if 'water' in food_lower and water_count == 0:
-        # Assume 1 glass if just mentioned
-        water_count = 1
-    
-    if water_count > 0:
-        updates['Water'] = water_count
-        print(f"  💧 Water detected: {water_count} glasses - will update habits")
+    if 'Water' in updates:
+        print(f"  💧 Water detected: {updates['Water']} glasses - will update habits")
     
     if updates:
         update_daily_habits(updates)
@@ -115,11 +147,154 @@ def update_daily_habits(updates):
             else:
                 print(f"  ⚠️  Could not create habits: {create_response.status_code}")
 
+# Backfill
+def load_backfill_checkpoint():
+    try:
+        with open(BACKFILL_CHECKPOINT) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_backfill_checkpoint(checkpoint):
+    os.makedirs(os.path.dirname(BACKFILL_CHECKPOINT), exist_ok=True)
+    tmp_path = f"{BACKFILL_CHECKPOINT}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, BACKFILL_CHECKPOINT)
+
+def iter_food_days(client, after=None):
+    """(date, [food descriptions]) per day, streaming Food Log in date order"""
+    current, texts = None, []
+    for record in client.iter_records(HEALTH_BASE, "Food Log",
+                                      filter_formula=is_after("Date", after) if after else None,
+                                      sort=[{"field": "Date", "direction": "asc"}],
+                                      fields=["Date", *FOOD_LOG_TEXT_FIELDS]):
+        fields = record.get('fields', {})
+        date = (fields.get('Date') or '')[:10]
+        text = next((fields[f] for f in FOOD_LOG_TEXT_FIELDS if fields.get(f)), None)
+        if not date:
+            continue
+        if date != current:
+            if current:
+                yield current, texts
+            current, texts = date, []
+        if isinstance(text, str):
+            texts.append(text)
+    if current:
+        yield current, texts
+
+def derive_day_habits(texts):
+    """Daily Habits fields implied by one day's food descriptions"""
+    derived = {}
+    for updates in detect_food_habits_many(texts):
+        for field_name, value in updates.items():
+            if field_name == 'Water':
+                derived['Water'] = derived.get('Water', 0) + value
+            else:
+                derived[field_name] = True
+    return derived
+
+def habit_changes(derived, existing):
+    """Fields to write: ticks not yet set, Water only where it would go up"""
+    changes = {}
+    for field_name, value in derived.items():
+        current = existing.get(field_name)
+        if field_name == 'Water':
+            if (current or 0) < value:
+                changes[field_name] = value
+        elif not current:
+            changes[field_name] = value
+    return changes
+
+def _apply_backfill_batch(client, days, dry_run):
+    """Diff a batch of derived days against Daily Habits and upsert changes
+
+    Returns (days changed, errors).
+    """
+    dates = sorted(days)
+    existing = {}
+    for record in client.iter_records(PRODUCTIVITY_BASE, "Daily Habits",
+                                      filter_formula=and_(gte("Date", dates[0]), lte("Date", dates[-1])),
+                                      fields=["Date", *FOOD_HABITS]):
+        date = (record['fields'].get('Date') or '')[:10]
+        existing.setdefault(date, {}).update(record['fields'])
+    
+    changes = {}
+    for date in dates:
+        day_changes = habit_changes(days[date], existing.get(date, {}))
+        if day_changes:
+            changes[date] = day_changes
+    
+    if dry_run or not changes:
+        results = [{}] * len(changes)
+    else:
+        results = client.upsert_records(PRODUCTIVITY_BASE, "Daily Habits",
+                                        [{"Date": date, **fields} for date, fields in changes.items()],
+                                        merge_on=["Date"])
+    
+    errors = []
+    for (date, fields), result in zip(changes.items(), results):
+        summary = ', '.join(f"{k}={v}" for k, v in fields.items())
+        if 'error' in result:
+            errors.append(f"{date}: {result['error']}")
+        else:
+            print(f"  {'🔍' if dry_run else '✅'} {date}: {summary}")
+    return len(changes) - len(errors), errors
+
+def backfill_habits_from_food_log(dry_run=False, restart=False):
+    """Derive habits for every day in Food Log and fill gaps in Daily Habits
+    
+    Food Log is streamed page by page; every BACKFILL_DAYS_PER_BATCH days
+    are checked against Daily Habits with one range query and written with
+    batched upserts on Date. The checkpoint records the last day applied,
+    so an interrupted run resumes after it.
+    """
+    client = AirtableClient(AIRTABLE_KEY, priority=PRIORITY_LOW)
+    checkpoint = {} if restart else load_backfill_checkpoint()
+    after = checkpoint.get('last_date')
+    print(f"🔄 Backfilling habits from Food Log" + (f" after {after}" if after else ""))
+    
+    totals = {'days': 0, 'changed': 0}
+    batch = {}
+    
+    def flush(through):
+        """Apply the batch; every day up to through is then done"""
+        changed, errors = _apply_backfill_batch(client, batch, dry_run) if batch else (0, [])
+        if errors:
+            for error in errors:
+                print(f"  ❌ {error}")
+            raise RuntimeError(f"{len(errors)} upsert(s) failed - rerun to resume")
+        totals['days'] += len(batch)
+        totals['changed'] += changed
+        if not dry_run:
+            checkpoint.update(last_date=through, changed=checkpoint.get('changed', 0) + changed,
+                              updated_at=datetime.now().isoformat(timespec='seconds'))
+            save_backfill_checkpoint(checkpoint)
+        batch.clear()
+    
+    last_date = None
+    for last_date, texts in iter_food_days(client, after):
+        derived = derive_day_habits(texts)
+        if derived:
+            batch[last_date] = derived
+        if len(batch) >= BACKFILL_DAYS_PER_BATCH:
+            flush(last_date)
+    if last_date:
+        flush(last_date)
+    
+    print(f"✅ Checked {totals['days']} day(s) with food-implied habits, "
+          f"{'would change' if dry_run else 'changed'} {totals['changed']}")
+    return totals
+
 # Example usage
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    if '--backfill' in sys.argv:
+        backfill_habits_from_food_log(dry_run='--dry-run' in sys.argv,
+                                      restart='--restart' in sys.argv)
+    elif len(sys.argv) > 1:
         food = sys.argv[1]
         print(f"Checking habits in: {food}")
         update_habits_from_food(food)
     else:
         print("Usage: python3 habit_tracker_from_food.py 'food description'")
+        print("       python3 habit_tracker_from_food.py --backfill [--dry-run] [--restart]")
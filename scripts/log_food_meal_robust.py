@@ -11,6 +11,11 @@ import requests
 from datetime import datetime, timedelta
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from airtable_client import AirtableClient
+from nutrition_retry_queue import get_retry_queue, nutrition_fields
+
 # Config
 AIRTABLE_KEY = open('/home/samsclaw/.config/airtable/api_key').read().strip()
 HEALTH_BASE = "appnVeGSjwJgG2snS"
@@ -21,7 +26,7 @@ TAT_TABLE = "tblkbuvkZUSpm1IgJ"
 def log_food_meal(food_description, meal_type="Snack"):
     """
     Log food meal with full nutrition
-    If Edamam fails, save description and create follow-up task
+    If Edamam fails, save description and queue it for retry
     """
     
     print(f"🍽️ Logging {meal_type}: {food_description}")
@@ -35,11 +40,12 @@ def log_food_meal(food_description, meal_type="Snack"):
         status = "✅ Complete"
         print(f"  ✓ Full nutrition logged (24 nutrients)")
     else:
-        # Failure - save description only, create task
+        # Failure - save description only, retry from the queue
         record = create_partial_record(food_description, meal_type)
-        task_id = create_nutrition_update_task(food_description, meal_type)
+        if record:
+            queue_for_retry(record['id'], food_description, meal_type)
         status = "⏳ Pending API"
-        print(f"  ⚠️  Edamam API failed - saved description, created task #{task_id}")
+        print(f"  ⚠️  Edamam API failed - saved description, queued for retry")
     
     return record, status
 
@@ -145,27 +151,7 @@ def create_full_nutrition_record(food_desc, meal_type, nutrition):
             "Food Items": food_desc,
             "Status": "Complete",
             
-            # All 24 nutrients
-            "Calories": nutrition['calories'],
-            "Protein (g)": round(nutrition['protein'], 1),
-            "Carbs (g)": round(nutrition['carbs'], 1),
-            "Fat (g)": round(nutrition['fat'], 1),
-            "Fiber (g)": round(nutrition['fiber'], 1),
-            "Sugar (g)": round(nutrition['sugar'], 1),
-            "Sodium (mg)": round(nutrition['sodium'], 0),
-            "Cholesterol (mg)": round(nutrition['cholesterol'], 0),
-            "Vitamin C (mg)": round(nutrition['vitamin_c'], 1),
-            "Calcium (mg)": round(nutrition['calcium'], 0),
-            "Iron (mg)": round(nutrition['iron'], 1),
-            "Potassium (mg)": round(nutrition['potassium'], 0),
-            "Vitamin A (mcg)": round(nutrition['vitamin_a'], 0),
-            "Vitamin D (mcg)": round(nutrition['vitamin_d'], 1),
-            "Vitamin B6 (mg)": round(nutrition['vitamin_b6'], 2),
-            "Vitamin B12 (mcg)": round(nutrition['vitamin_b12'], 2),
-            "Folate (mcg)": round(nutrition['folate'], 0),
-            "Magnesium (mg)": round(nutrition['magnesium'], 0),
-            "Phosphorus (mg)": round(nutrition['phosphorus'], 0),
-            "Zinc (mg)": round(nutrition['zinc'], 1),
+            **nutrition_fields(nutrition),
             "Notes": f"Complete nutrition via Edamam API"
         }
     }
@@ -224,73 +210,47 @@ def create_nutrition_update_task(food_desc, meal_type):
         return response.json().get('id', 'created')
     return None
 
+def queue_for_retry(record_id, food_desc, meal_type):
+    """Add a partial record to the nutrition retry queue"""
+    get_retry_queue().enqueue(record_id, food_desc, meal_type=meal_type, fields={
+        "Status": "Complete",
+        "Notes": "Nutrition updated on retry - Edamam API success"
+    })
+
 def check_pending_nutrition_updates():
-    """Check for meals with pending nutrition and try to update"""
-    
-    url = f"https://api.airtable.com/v0/{HEALTH_BASE}/{FOOD_TABLE}"
-    headers = {"Authorization": f"Bearer {AIRTABLE_KEY}"}
-    
-    # Find pending meals
-    params = {
-        "filterByFormula": "{Status}='Pending API'",
-        "maxRecords": 10
-    }
-    
-    response = requests.get(url, headers=headers, params=params)
+    """Retry due meals from the nutrition queue and update them in batches"""
     
-    if response.status_code != 200:
-        return []
+    client = AirtableClient(AIRTABLE_KEY)
+    queue = get_retry_queue()
     
-    records = response.json().get('records', [])
-    updated = []
+    # Pick up pending meals the queue doesn't know about (logged elsewhere
+    # or before the queue existed)
+    try:
+        records = client.query_records(HEALTH_BASE, FOOD_TABLE,
+                                       filter_formula="{Status}='Pending API'",
+                                       fields=["Food Items", "Meal Type"])
+    except Exception:
+        records = []
     
+    queued = queue.queued_record_ids()
     for record in records:
         food_desc = record['fields'].get('Food Items', '')
-        meal_type = record['fields'].get('Meal Type', 'Snack')
-        
-        print(f"  Retrying: {food_desc[:50]}...")
-        
-        # Try Edamam again
-        nutrition = get_edamam_nutrition(food_desc)
-        
-        if nutrition:
-            # Update with full nutrition
-            update_url = f"{url}/{record['id']}"
-            update_data = {
-                "fields": {
-                    "Status": "Complete",
-                    "Calories": nutrition['calories'],
-                    "Protein (g)": round(nutrition['protein'], 1),
-                    "Carbs (g)": round(nutrition['carbs'], 1),
-                    "Fat (g)": round(nutrition['fat'], 1),
-                    "Fiber (g)": round(nutrition['fiber'], 1),
-                    "Sugar (g)": round(nutrition['sugar'], 1),
-                    "Sodium (mg)": round(nutrition['sodium'], 0),
-                    "Cholesterol (mg)": round(nutrition['cholesterol'], 0),
-                    "Vitamin C (mg)": round(nutrition['vitamin_c'], 1),
-                    "Calcium (mg)": round(nutrition['calcium'], 0),
-                    "Iron (mg)": round(nutrition['iron'], 1),
-                    "Potassium (mg)": round(nutrition['potassium'], 0),
-                    "Vitamin A (mcg)": round(nutrition['vitamin_a'], 0),
-                    "Vitamin D (mcg)": round(nutrition['vitamin_d'], 1),
-                    "Vitamin B6 (mg)": round(nutrition['vitamin_b6'], 2),
-                    "Vitamin B12 (mcg)": round(nutrition['vitamin_b12'], 2),
-                    "Folate (mcg)": round(nutrition['folate'], 0),
-                    "Magnesium (mg)": round(nutrition['magnesium'], 0),
-                    "Phosphorus (mg)": round(nutrition['phosphorus'], 0),
-                    "Zinc (mg)": round(nutrition['zinc'], 1),
-                    "Notes": f"Nutrition updated on retry - Edamam API success"
-                }
-            }
-            
-            update_resp = requests.patch(update_url, headers=headers, json=update_data)
-            if update_resp.status_code == 200:
-                updated.append(food_desc)
-                print(f"    ✅ Updated with full nutrition!")
-        else:
-            print(f"    ⏳ Still pending - API still failing")
+        if record['id'] not in queued and food_desc:
+            queue_for_retry(record['id'], food_desc, record['fields'].get('Meal Type', 'Snack'))
+    
+    summary = queue.process(client, HEALTH_BASE, FOOD_TABLE, get_edamam_nutrition)
+    
+    # Out of retries - hand over to a manual task
+    for food in summary['gave_up']:
+        meal_type = next(iter(food['records'].values()), {}).get('meal_type') or 'Snack'
+        task_id = create_nutrition_update_task(food['text'], meal_type)
+        print(f"    ❌ Gave up on {food['text'][:50]} - created task #{task_id}")
     
-    return updated
+    if summary['pending']:
+        print(f"    ⏳ {len(summary['pending'])} food(s) still pending - will retry with backoff")
+    if summary['updated']:
+        print(f"    ✅ Updated {len(summary['updated'])} meal(s) with full nutrition!")
+    return summary['updated']
 
 # Main execution
 if __name__ == "__main__":
@@ -315,5 +275,5 @@ if __name__ == "__main__":
     print(f"\nStatus: {status}")
     
     if status == "⏳ Pending API":
-        print("\n💡 A task has been created to retry this later.")
-        print("   You'll get reminders at 12pm, 3pm, and 8pm to check status.")
+        print("\n💡 Queued for automatic retry (12pm, 3pm and 8pm checks).")
+        print("   A task is only created if Edamam keeps failing.")
@@ -4,178 +4,141 @@ TAT Database Migration Script
 Updates Notion TAT database schema per user requirements
 """
 
-import requests
-import json
-import os
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from notion_client import NotionAPIError, NOTION_VERSION_DATA_SOURCES, get_notion_client
 
 # Config
-NOTION_TOKEN = os.getenv('NOTION_TOKEN') or open(os.path.expanduser('~/.config/notion/api_key')).read().strip()
 TAT_DATABASE_ID = "2fcf2cb1-2276-81d6-aebe-f388bdb09b8e"
 
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2025-09-03"
-}
+client = get_notion_client(NOTION_VERSION_DATA_SOURCES)
 
 def get_database_schema():
     """Get current database schema"""
-    url = f"https://api.notion.com/v1/databases/{TAT_DATABASE_ID}"
-    response = requests.get(url, headers=HEADERS)
-    return response.json()
+    return client.get_schema(TAT_DATABASE_ID)
 
 def update_tat_category():
     """Update TAT Category to strict 4 options"""
-    url = f"https://api.notion.com/v1/databases/{TAT_DATABASE_ID}"
-    
-    data = {
-        "properties": {
-            "TAT Category": {
-                "select": {
-                    "options": [
-                        {"name": "🔥 Today", "color": "red"},
-                        {"name": "⚡ 3 days", "color": "yellow"},
-                        {"name": "📅 7 days", "color": "blue"},
-                        {"name": "📆 30 days", "color": "green"}
-                    ]
-                }
+    properties = {
+        "TAT Category": {
+            "select": {
+                "options": [
+                    {"name": "🔥 Today", "color": "red"},
+                    {"name": "⚡ 3 days", "color": "yellow"},
+                    {"name": "📅 7 days", "color": "blue"},
+                    {"name": "📆 30 days", "color": "green"}
+                ]
             }
         }
     }
-    
-    response = requests.patch(url, headers=HEADERS, json=data)
-    if response.status_code == 200:
+
+    try:
+        client.update_schema(TAT_DATABASE_ID, properties)
         print("✅ TAT Category updated to strict 4 options")
         return True
-    else:
-        print(f"❌ Failed to update TAT Category: {response.text}")
+    except NotionAPIError as e:
+        print(f"❌ Failed to update TAT Category: {e}")
         return False
 
 def add_date_created_property():
     """Add 'Date Created' property"""
-    url = f"https://api.notion.com/v1/databases/{TAT_DATABASE_ID}"
-    
-    data = {
-        "properties": {
-            "Date Created": {
-                "date": {}
-            }
+    properties = {
+        "Date Created": {
+            "date": {}
         }
     }
-    
-    response = requests.patch(url, headers=HEADERS, json=data)
-    if response.status_code == 200:
+
+    try:
+        client.update_schema(TAT_DATABASE_ID, properties)
         print("✅ Date Created property added")
         return True
-    else:
-        print(f"❌ Failed to add Date Created: {response.text}")
+    except NotionAPIError as e:
+        print(f"❌ Failed to add Date Created: {e}")
         return False
 
 def update_category_options():
     """Update Category to include 'Laptop tasks' and modify AI Development"""
-    url = f"https://api.notion.com/v1/databases/{TAT_DATABASE_ID}"
-    
-    data = {
-        "properties": {
-            "Category": {
-                "select": {
-                    "options": [
-                        {"name": "💪 Health", "color": "green"},
-                        {"name": "💼 Work", "color": "blue"},
-                        {"name": "👨‍👩‍👧 Family", "color": "yellow"},
-                        {"name": "🔧 Projects", "color": "orange"},
-                        {"name": "🛡️ Security", "color": "red"},
-                        {"name": "🎨 Content", "color": "purple"},
-                        {"name": "🧠 AI Development", "color": "pink"},
-                        {"name": "💻 Laptop Tasks", "color": "gray"},
-                        {"name": "🏠 Home", "color": "brown"},
-                        {"name": "💰 Finance", "color": "default"}
-                    ]
-                }
+    properties = {
+        "Category": {
+            "select": {
+                "options": [
+                    {"name": "💪 Health", "color": "green"},
+                    {"name": "💼 Work", "color": "blue"},
+                    {"name": "👨‍👩‍👧 Family", "color": "yellow"},
+                    {"name": "🔧 Projects", "color": "orange"},
+                    {"name": "🛡️ Security", "color": "red"},
+                    {"name": "🎨 Content", "color": "purple"},
+                    {"name": "🧠 AI Development", "color": "pink"},
+                    {"name": "💻 Laptop Tasks", "color": "gray"},
+                    {"name": "🏠 Home", "color": "brown"},
+                    {"name": "💰 Finance", "color": "default"}
+                ]
             }
         }
     }
-    
-    response = requests.patch(url, headers=HEADERS, json=data)
-    if response.status_code == 200:
+
+    try:
+        client.update_schema(TAT_DATABASE_ID, properties)
         print("✅ Category options updated (added Laptop Tasks)")
         return True
-    else:
-        print(f"❌ Failed to update Category: {response.text}")
+    except NotionAPIError as e:
+        print(f"❌ Failed to update Category: {e}")
         return False
 
 def remove_property(property_name):
     """Remove a property from database"""
-    url = f"https://api.notion.com/v1/databases/{TAT_DATABASE_ID}"
-    
     # Note: Notion API doesn't actually support deleting properties
     # We'll archive them by renaming instead
-    data = {
-        "properties": {
-            property_name: None  # This should remove it
-        }
-    }
-    
-    response = requests.patch(url, headers=HEADERS, json=data)
-    if response.status_code == 200:
+    try:
+        client.update_schema(TAT_DATABASE_ID, {property_name: None})  # This should remove it
         print(f"✅ Removed property: {property_name}")
         return True
-    else:
+    except NotionAPIError:
         print(f"⚠️  Could not remove {property_name} via API")
         print(f"   Manual removal required in Notion UI")
         return False
 
+def query_tasks(filter=None):
+    """Every TAT task matching filter (all pages), or None on error"""
+    try:
+        return client.query_all(TAT_DATABASE_ID, filter=filter)
+    except NotionAPIError as e:
+        print(f"❌ Failed to query tasks: {e}")
+        return None
+
 def populate_date_created():
     """Populate Date Created for existing tasks"""
-    # Query all tasks
-    url = f"https://api.notion.com/v1/databases/{TAT_DATABASE_ID}/query"
-    response = requests.post(url, headers=HEADERS)
-    
-    if response.status_code != 200:
-        print(f"❌ Failed to query tasks: {response.text}")
+    # Only tasks without a Date Created; collected before updating so the
+    # updates can't shift the query's pages
+    tasks = query_tasks({"property": "Date Created", "date": {"is_empty": True}})
+    if tasks is None:
         return
-    
-    tasks = response.json().get('results', [])
+
     today = datetime.now().strftime('%Y-%m-%d')
-    
+
     updated = 0
     for task in tasks:
         task_id = task['id']
-        
+
         # Check if Date Created is already set
         if task.get('properties', {}).get('Date Created', {}).get('date'):
             continue
-        
+
         # Update with today's date
-        update_url = f"https://api.notion.com/v1/pages/{task_id}"
-        update_data = {
-            "properties": {
-                "Date Created": {
-                    "date": {
-                        "start": today
-                    }
-                }
-            }
-        }
-        
-        update_response = requests.patch(update_url, headers=HEADERS, json=update_data)
-        if update_response.status_code == 200:
+        try:
+            client.update_page(task_id, {"Date Created": {"date": {"start": today}}})
             updated += 1
-    
+        except NotionAPIError as e:
+            print(f"⚠️  Could not update {task_id}: {e}")
+
     print(f"✅ Populated Date Created for {updated} existing tasks")
 
 def migrate_existing_tasks():
     """Migrate existing tasks to new category format"""
-    url = f"https://api.notion.com/v1/databases/{TAT_DATABASE_ID}/query"
-    response = requests.post(url, headers=HEADERS)
-    
-    if response.status_code != 200:
-        print(f"❌ Failed to query tasks: {response.text}")
-        return
-    
-    tasks = response.json().get('results', [])
-    
     # Mapping old categories to new
     category_mapping = {
         "🔥 1 Day": "🔥 Today",
@@ -183,29 +146,26 @@ def migrate_existing_tasks():
         "📅 7 Day": "📅 7 days",
         "📆 30 Day": "📆 30 days"
     }
-    
+
+    tasks = query_tasks({"or": [{"property": "TAT Category", "select": {"equals": old}}
+                                for old in category_mapping]})
+    if tasks is None:
+        return
+
     updated = 0
     for task in tasks:
         task_id = task['id']
         properties = task.get('properties', {})
-        
+
         # Check TAT Category
-        tat_category = properties.get('TAT Category', {}).get('select', {}).get('name', '')
+        tat_category = (properties.get('TAT Category', {}).get('select') or {}).get('name', '')
         if tat_category in category_mapping:
-            update_url = f"https://api.notion.com/v1/pages/{task_id}"
-            update_data = {
-                "properties": {
-                    "TAT Category": {
-                        "select": {
-                            "name": category_mapping[tat_category]
-                        }
-                    }
-                }
-            }
-            
-            requests.patch(update_url, headers=HEADERS, json=update_data)
-            updated += 1
-    
+            try:
+                client.update_page(task_id, {"TAT Category": {"select": {"name": category_mapping[tat_category]}}})
+                updated += 1
+            except NotionAPIError as e:
+                print(f"⚠️  Could not migrate {task_id}: {e}")
+
     if updated > 0:
         print(f"✅ Migrated {updated} tasks to new category format")
     else:
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Notion Client Helper Module
+One client for every script that talks to Notion: a shared keep-alive
+session, Notion's 3 requests/second limit enforced across processes, retries
+with backoff on 429/5xx, and start_cursor/has_more pagination so queries
+return every page instead of the first 100 results.
+
+Two API versions are in use:
+    2022-06-28  databases are queried directly (databases/{id}/query)
+    2025-09-03  databases hold data sources; queries, schema updates and
+                new pages go to the data source (data_sources/{id}/...)
+The client takes the version it was created with and picks the endpoint,
+so callers pass a database ID either way.
+
+    client = get_notion_client()
+    for page in client.iter_query(database_id, filter={...}):
+        ...
+"""
+
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import requests
+
+from airtable_client import get_session
+from airtable_rate_limiter import TokenBucketLimiter, PRIORITY_NORMAL
+from api_metrics import record_request, request_size, response_size
+
+NOTION_API = "https://api.notion.com/v1"
+
+NOTION_VERSION = "2022-06-28"
+NOTION_VERSION_DATA_SOURCES = "2025-09-03"
+
+# Notion allows an average of 3 requests/second per integration
+RATE_LIMIT = 3.0
+RATE_LIMIT_KEY = "notion"
+
+# Notion returns at most 100 results per page
+MAX_PAGE_SIZE = 100
+
+MAX_RETRIES = 4
+RETRY_DELAY = 1.0  # doubled after each failed attempt
+RETRY_STATUSES = (500, 502, 503, 504)
+
+_token_cache: Optional[str] = None
+
+_limiter: Optional[TokenBucketLimiter] = None
+_limiter_lock = threading.Lock()
+
+_END = object()
+
+
+class NotionAPIError(Exception):
+    """Non-retryable error response from the Notion API"""
+
+    def __init__(self, status: Optional[int], code: str, message: str):
+        super().__init__(f"Notion API error: {status} {code} - {message}")
+        self.status = status
+        self.code = code
+
+
+def get_notion_limiter() -> TokenBucketLimiter:
+    """Token bucket shared by every process that calls Notion"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = TokenBucketLimiter(RATE_LIMIT_KEY, rate=RATE_LIMIT, capacity=RATE_LIMIT)
+        return _limiter
+
+
+def load_notion_token() -> str:
+    """NOTION_TOKEN / NOTION_API_KEY, else ~/.config/notion/api_key (read once)"""
+    global _token_cache
+    token = os.getenv('NOTION_TOKEN') or os.getenv('NOTION_API_KEY')
+    if token:
+        return token
+    if _token_cache:
+        return _token_cache
+
+    key_path = os.path.expanduser("~/.config/notion/api_key")
+    try:
+        with open(key_path, 'r') as f:
+            _token_cache = f.read().strip()
+            return _token_cache
+    except FileNotFoundError:
+        raise ValueError(f"Notion API key not found at {key_path}")
+
+
+class NotionClient:
+    """Notion API client for one API version"""
+
+    def __init__(self, token: Optional[str] = None, version: str = NOTION_VERSION,
+                 priority: int = PRIORITY_NORMAL):
+        self.token = token or load_notion_token()
+        self.version = version
+        self.priority = priority
+        self.headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Notion-Version": version,
+            "Content-Type": "application/json"
+        }
+        self.session = get_session(NOTION_API)
+        self.limiter = get_notion_limiter()
+        self._data_sources: Dict[str, str] = {}
+
+    @property
+    def uses_data_sources(self) -> bool:
+        return self.version >= NOTION_VERSION_DATA_SOURCES
+
+    # Requests
+    def request(self, method: str, path: str, body: Optional[Dict] = None,
+                params: Optional[Dict] = None) -> Dict:
+        """Send one request, retrying 429s, 5xx, timeouts and connection errors"""
+        metrics = {"retries": 0, "wait": 0.0, "response": None}
+        started = time.time()
+        error = None
+        try:
+            return self._send_with_retries(method, f"{NOTION_API}/{path}", body, params, metrics)
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            response = metrics["response"]
+            record_request("notion", method, path,
+                           getattr(response, 'status_code', None),
+                           time.time() - started,
+                           retries=metrics["retries"], rate_limit_wait=metrics["wait"],
+                           request_bytes=request_size(response) if response is not None else 0,
+                           response_bytes=response_size(response) if response is not None else 0,
+                           error=error)
+
+    def _send_with_retries(self, method: str, url: str, body: Optional[Dict],
+                           params: Optional[Dict], metrics: Dict) -> Dict:
+        delay = RETRY_DELAY
+        for attempt in range(MAX_RETRIES):
+            metrics["retries"] = attempt
+            last_attempt = attempt == MAX_RETRIES - 1
+            try:
+                metrics["wait"] += self.limiter.acquire(self.priority)
+                response = self.session.request(method, url, headers=self.headers,
+                                                json=body, params=params, timeout=30)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if last_attempt:
+                    raise
+                print(f"⚠️ Notion request error: {e}, retrying ({attempt + 1}/{MAX_RETRIES})...")
+                time.sleep(delay)
+                delay *= 2
+                continue
+            metrics["response"] = response
+
+            # Rate limited - hold back every process, not just this one
+            if response.status_code == 429 and not last_attempt:
+                retry_after = float(response.headers.get('Retry-After', delay))
+                print(f"⚠️ Notion rate limited. Waiting {retry_after:g}s...")
+                self.limiter.penalize(retry_after)
+                delay *= 2
+                continue
+
+            if response.status_code in RETRY_STATUSES and not last_attempt:
+                print(f"⚠️ Notion returned {response.status_code}, retrying in {delay:g}s...")
+                time.sleep(delay)
+                delay *= 2
+                continue
+
+            if response.status_code >= 400:
+                try:
+                    data = response.json()
+                except ValueError:
+                    data = {}
+                raise NotionAPIError(response.status_code, data.get('code', 'unknown'),
+                                     data.get('message', response.text))
+            return response.json()
+
+        raise NotionAPIError(None, 'max_retries', "Max retries exceeded")
+
+    # Databases and data sources
+    def get_database(self, database_id: str) -> Dict:
+        return self.request("GET", f"databases/{database_id}")
+
+    def data_source_id(self, database_id: str) -> str:
+        """The data source behind a database (2025-09-03)
+
+        An ID Notion doesn't know as a database is taken to be a data source
+        ID already. Resolved once per client.
+        """
+        if database_id not in self._data_sources:
+            try:
+                sources = self.get_database(database_id).get('data_sources') or []
+                resolved = sources[0]['id'] if sources else database_id
+            except NotionAPIError as e:
+                if e.status not in (400, 404):
+                    raise
+                resolved = database_id
+            self._data_sources[database_id] = resolved
+        return self._data_sources[database_id]
+
+    def get_schema(self, database_id: str) -> Dict:
+        """Database (or data source) object including its properties"""
+        if self.uses_data_sources:
+            return self.request("GET", f"data_sources/{self.data_source_id(database_id)}")
+        return self.get_database(database_id)
+
+    def update_schema(self, database_id: str, properties: Dict[str, Any]) -> Dict:
+        """Add or change database properties"""
+        if self.uses_data_sources:
+            return self.request("PATCH", f"data_sources/{self.data_source_id(database_id)}",
+                                {"properties": properties})
+        return self.request("PATCH", f"databases/{database_id}", {"properties": properties})
+
+    def parent(self, database_id: Optional[str] = None,
+               data_source_id: Optional[str] = None) -> Dict:
+        """Parent object for a new page in a database or data source"""
+        if data_source_id or self.uses_data_sources:
+            return {"type": "data_source_id",
+                    "data_source_id": data_source_id or self.data_source_id(database_id)}
+        return {"database_id": database_id}
+
+    # Pagination
+    def paginate(self, method: str, path: str, body: Optional[Dict] = None,
+                 limit: Optional[int] = None) -> Iterator[Dict]:
+        """Stream results across pages, following start_cursor / has_more
+
+        The next page is fetched in the background while the caller works
+        through the current one. limit stops after that many results.
+        """
+        body = dict(body or {})
+        remaining = limit
+
+        def fetch(cursor):
+            page = dict(body)
+            page["page_size"] = min(body.get("page_size", MAX_PAGE_SIZE), remaining or MAX_PAGE_SIZE)
+            if cursor:
+                page["start_cursor"] = cursor
+            if method == "GET":
+                return self.request(method, path, params=page)
+            return self.request(method, path, page)
+
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            pending = prefetcher.submit(fetch, None)
+            while pending is not None:
+                result = pending.result()
+                pending = None
+
+                results = result.get('results', [])
+                if remaining is not None:
+                    results = results[:remaining]
+                    remaining -= len(results)
+                if result.get('has_more') and result.get('next_cursor') and remaining != 0:
+                    pending = prefetcher.submit(fetch, result['next_cursor'])
+
+                for item in results:
+                    yield item
+
+    def iter_query(self, database_id: str, filter: Optional[Dict] = None,
+                   sorts: Optional[List[Dict]] = None,
+                   limit: Optional[int] = None) -> Iterator[Dict]:
+        """Stream every page in a database matching filter"""
+        if self.uses_data_sources:
+            yield from self.iter_data_source(self.data_source_id(database_id), filter, sorts, limit)
+            return
+        yield from self.paginate("POST", f"databases/{database_id}/query",
+                                 self._query_body(filter, sorts), limit)
+
+    def iter_data_source(self, data_source_id: str, filter: Optional[Dict] = None,
+                         sorts: Optional[List[Dict]] = None,
+                         limit: Optional[int] = None) -> Iterator[Dict]:
+        """Stream every page in a data source matching filter (2025-09-03)"""
+        yield from self.paginate("POST", f"data_sources/{data_source_id}/query",
+                                 self._query_body(filter, sorts), limit)
+
+    @staticmethod
+    def _query_body(filter: Optional[Dict], sorts: Optional[List[Dict]]) -> Dict:
+        body: Dict[str, Any] = {}
+        if filter:
+            body["filter"] = filter
+        if sorts:
+            body["sorts"] = sorts
+        return body
+
+    def query_all(self, database_id: str, filter: Optional[Dict] = None,
+                  sorts: Optional[List[Dict]] = None,
+                  limit: Optional[int] = None) -> List[Dict]:
+        """Every page in a database matching filter"""
+        return list(self.iter_query(database_id, filter, sorts, limit))
+
+    async def aiter_query(self, database_id: str, filter: Optional[Dict] = None,
+                          sorts: Optional[List[Dict]] = None,
+                          limit: Optional[int] = None) -> AsyncIterator[Dict]:
+        """Async stream of iter_query, page requests run off the event loop"""
+        loop = asyncio.get_running_loop()
+        pages = self.iter_query(database_id, filter, sorts, limit)
+        while True:
+            page = await loop.run_in_executor(None, next, pages, _END)
+            if page is _END:
+                break
+            yield page
+
+    # Pages
+    def create_page(self, properties: Dict[str, Any], database_id: Optional[str] = None,
+                    data_source_id: Optional[str] = None,
+                    children: Optional[List[Dict]] = None) -> Dict:
+        body: Dict[str, Any] = {"parent": self.parent(database_id, data_source_id),
+                                "properties": properties}
+        if children:
+            body["children"] = children
+        return self.request("POST", "pages", body)
+
+    def update_page(self, page_id: str, properties: Optional[Dict[str, Any]] = None,
+                    archived: Optional[bool] = None) -> Dict:
+        body: Dict[str, Any] = {}
+        if properties is not None:
+            body["properties"] = properties
+        if archived is not None:
+            body["archived"] = archived
+        return self.request("PATCH", f"pages/{page_id}", body)
+
+
+_clients: Dict[str, NotionClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_notion_client(version: str = NOTION_VERSION) -> NotionClient:
+    """Process-wide client for an API version"""
+    with _clients_lock:
+        client = _clients.get(version)
+        if client is None:
+            client = NotionClient(version=version)
+            _clients[version] = client
+        return client
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Notion Property Decoders
+Turns Notion pages into plain rows. A decoder is compiled once from a
+database's property types - taken from its schema or from any page of query
+results, which carry the same {"type": ...} shape - into one extractor per
+column, so decoding a page is a single pass over the requested columns
+with no type dispatch or nested .get() chains per field.
+
+    decoder = compile_decoder(pages[0]['properties'],
+                              {'date': 'Date', 'water': 'Water', 'fruit': 'Fruit'},
+                              defaults={'water': 0}, page_fields=('id',))
+    rows = decoder.decode_many(pages)   # [(id, date, water, fruit), ...]
+    df = decoder.to_dataframe(pages)    # same columns, needs pandas
+
+Values: title / rich_text -> str, select / status -> option name,
+multi_select / people / relation / files -> tuple, date -> start string,
+formula / rollup -> their computed value, everything else as Notion sends it.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+Extractor = Callable[[Dict], Any]
+
+
+def _plain(item: Dict) -> str:
+    if 'plain_text' in item:
+        return item['plain_text']
+    return (item.get('text') or {}).get('content', '')
+
+
+def _text(key: str) -> Extractor:
+    def extract(prop):
+        parts = prop.get(key)
+        if not parts:
+            return None
+        if len(parts) == 1:
+            return _plain(parts[0])
+        return ''.join(_plain(part) for part in parts)
+    return extract
+
+
+def _raw(key: str) -> Extractor:
+    return lambda prop: prop.get(key)
+
+
+def _name(key: str) -> Extractor:
+    def extract(prop):
+        option = prop.get(key)
+        return option.get('name') if option else None
+    return extract
+
+
+def _names(key: str) -> Extractor:
+    return lambda prop: tuple(item.get('name') for item in prop.get(key) or ())
+
+
+def _ids(key: str) -> Extractor:
+    return lambda prop: tuple(item.get('id') for item in prop.get(key) or ())
+
+
+def _date(key: str) -> Extractor:
+    def extract(prop):
+        value = prop.get(key)
+        return value.get('start') if value else None
+    return extract
+
+
+def _unique_id(prop):
+    value = prop.get('unique_id')
+    if not value:
+        return None
+    prefix = value.get('prefix')
+    return f"{prefix}-{value.get('number')}" if prefix else value.get('number')
+
+
+def _user(key: str) -> Extractor:
+    def extract(prop):
+        user = prop.get(key)
+        return (user.get('name') or user.get('id')) if user else None
+    return extract
+
+
+def decode_value(prop: Optional[Dict]) -> Any:
+    """Decode one property value by its own type (no compiled plan)"""
+    if not prop:
+        return None
+    kind = prop.get('type')
+    if kind in ('formula', 'rollup'):
+        return _computed(prop)
+    return _extractor(kind)(prop)
+
+
+def _computed(prop: Dict) -> Any:
+    """formula / rollup values are themselves typed: {"type": "number", "number": 3}"""
+    value = prop.get(prop.get('type')) or {}
+    kind = value.get('type')
+    if kind == 'array':
+        return tuple(decode_value(item) for item in value.get('array') or ())
+    if kind == 'date':
+        return (value.get('date') or {}).get('start')
+    return value.get(kind)
+
+
+_EXTRACTORS: Dict[str, Extractor] = {
+    'title': _text('title'),
+    'rich_text': _text('rich_text'),
+    'select': _name('select'),
+    'status': _name('status'),
+    'multi_select': _names('multi_select'),
+    'people': _names('people'),
+    'files': _names('files'),
+    'relation': _ids('relation'),
+    'date': _date('date'),
+    'formula': _computed,
+    'rollup': _computed,
+    'unique_id': _unique_id,
+    'created_by': _user('created_by'),
+    'last_edited_by': _user('last_edited_by'),
+}
+
+
+def _extractor(kind: Optional[str]) -> Extractor:
+    if kind is None:
+        return lambda prop: None
+    return _EXTRACTORS.get(kind) or _raw(kind)
+
+
+def title_property(properties: Mapping[str, Dict]) -> Optional[str]:
+    """Name of the title property (every database has exactly one)"""
+    return next((name for name, prop in properties.items() if prop.get('type') == 'title'), None)
+
+
+_EMPTY: Dict = {}
+
+# Types sent as a plain JSON value: {"type": "number", "number": 3}
+_RAW_TYPES = ('number', 'checkbox', 'url', 'email', 'phone_number',
+              'created_time', 'last_edited_time')
+
+
+def _option_column(name: str, key: str, default: Any) -> Callable[[Dict], Any]:
+    """select / status / date: one nested key, read without an extractor call"""
+    def column(props):
+        prop = props.get(name)
+        value = (prop.get(key) or _EMPTY).get(field) if prop is not None else None
+        return default if value is None else value
+    field = 'start' if key == 'date' else 'name'
+    return column
+
+
+def _raw_column(name: str, key: str, default: Any) -> Callable[[Dict], Any]:
+    def column(props):
+        prop = props.get(name)
+        value = prop.get(key) if prop is not None else None
+        return default if value is None else value
+    return column
+
+
+# Common types get a closure that reads the value directly
+_INLINE: Dict[str, Callable[[str, str, Any], Callable[[Dict], Any]]] = {
+    'select': _option_column,
+    'status': _option_column,
+    'date': _option_column,
+    **{kind: _raw_column for kind in _RAW_TYPES},
+}
+
+
+def _column(name: str, kind: Optional[str], default: Any) -> Callable[[Dict], Any]:
+    """Extractor for one column over a page's properties dict"""
+    if kind is None:
+        return lambda props: default  # not in the schema: always the default
+    if kind in _INLINE:
+        return _INLINE[kind](name, kind, default)
+    extract = _extractor(kind)
+
+    def column(props):
+        prop = props.get(name)
+        value = extract(prop) if prop is not None else None
+        return default if value is None else value
+    return column
+
+
+def _build(page_fields: Sequence[str], plan: Sequence[Tuple[str, Optional[str], Any]]):
+    """One function decoding a page into a tuple, from per-column closures"""
+    page_fields = tuple(page_fields)
+    columns = tuple(_column(name, kind, default) for name, kind, default in plan)
+
+    def decode(page):
+        props = page.get('properties') or _EMPTY
+        return (*[page.get(field) for field in page_fields], *[column(props) for column in columns])
+    return decode
+
+
+class PageDecoder:
+    """Compiled page -> tuple decoder for a fixed set of columns
+
+    decode is built once per decoder from one closure per column, each
+    holding its property name, extractor and default: one properties
+    lookup per page and no type dispatch per field.
+    """
+
+    def __init__(self, columns: Sequence[str], plan: Sequence[Tuple[str, Optional[str], Any]],
+                 page_fields: Sequence[str] = ()):
+        self.columns = tuple(columns)
+        self.page_fields = tuple(page_fields)
+        self.decode: Callable[[Dict], tuple] = _build(self.page_fields, plan)
+
+    def decode_many(self, pages: Iterable[Dict]) -> List[tuple]:
+        decode = self.decode
+        return [decode(page) for page in pages]
+
+    def records(self, pages: Iterable[Dict]) -> List[Dict[str, Any]]:
+        """decode_many as {column: value} dicts"""
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.decode_many(pages)]
+
+    def to_dataframe(self, pages: Iterable[Dict]):
+        import pandas as pd
+        return pd.DataFrame.from_records(self.decode_many(pages), columns=list(self.columns))
+
+
+def compile_decoder(properties: Mapping[str, Dict],
+                    columns: Union[Sequence[str], Mapping[str, str], None] = None,
+                    defaults: Optional[Mapping[str, Any]] = None,
+                    page_fields: Sequence[str] = ()) -> PageDecoder:
+    """Build a decoder from a schema's (or a page's) properties
+
+    columns: property names, or {column name: property name}; defaults to
+    every property. A property missing from properties always decodes to
+    its default. defaults: {column name: value used when empty}.
+    page_fields: page-level keys (e.g. 'id', 'url') placed before the
+    property columns.
+    """
+    if columns is None:
+        columns = list(properties)
+    mapping = dict(columns) if isinstance(columns, Mapping) else {name: name for name in columns}
+    defaults = defaults or {}
+
+    plan = []
+    for column, name in mapping.items():
+        prop = properties.get(name)
+        plan.append((name, prop.get('type') if prop else None, defaults.get(column)))
+    return PageDecoder([*page_fields, *mapping], plan, page_fields)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Nutrition Retry Queue
+Durable local queue of Food Log records still waiting for Edamam nutrition.
+
+Meals are deduplicated by normalized food text, so one successful lookup
+fills in every record that logged the same food. Each run looks up the
+due foods concurrently, backs off exponentially per food while Edamam is
+failing (and stops early when a whole wave fails), and writes the results
+back with batched Airtable PATCHes. Foods that exhaust MAX_ATTEMPTS are
+returned to the caller to hand off (log_food_meal_robust creates a TAT task).
+
+Usage:
+    python3 nutrition_retry_queue.py status
+    python3 nutrition_retry_queue.py run      # same as check_pending_nutrition.py
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+QUEUE_FILE = '/home/samsclaw/.openclaw/workspace/data/nutrition_retry_queue.json'
+
+# Backoff per food: 5 min, 10 min, 20 min ... capped at 6 hours
+BASE_DELAY = 5 * 60
+MAX_DELAY = 6 * 3600
+MAX_ATTEMPTS = 10
+
+# Concurrent Edamam lookups per wave; a wave where every lookup fails
+# means Edamam is down, so the rest of the queue waits for the next run
+EDAMAM_CONCURRENCY = 4
+
+# nutrient key -> (Food Log field, decimals)
+NUTRITION_FIELDS = {
+    'calories': ("Calories", None),
+    'protein': ("Protein (g)", 1),
+    'carbs': ("Carbs (g)", 1),
+    'fat': ("Fat (g)", 1),
+    'fiber': ("Fiber (g)", 1),
+    'sugar': ("Sugar (g)", 1),
+    'sodium': ("Sodium (mg)", 0),
+    'cholesterol': ("Cholesterol (mg)", 0),
+    'vitamin_c': ("Vitamin C (mg)", 1),
+    'calcium': ("Calcium (mg)", 0),
+    'iron': ("Iron (mg)", 1),
+    'potassium': ("Potassium (mg)", 0),
+    'vitamin_a': ("Vitamin A (mcg)", 0),
+    'vitamin_d': ("Vitamin D (mcg)", 1),
+    'vitamin_b6': ("Vitamin B6 (mg)", 2),
+    'vitamin_b12': ("Vitamin B12 (mcg)", 2),
+    'folate': ("Folate (mcg)", 0),
+    'magnesium': ("Magnesium (mg)", 0),
+    'phosphorus': ("Phosphorus (mg)", 0),
+    'zinc': ("Zinc (mg)", 1),
+}
+
+
+def normalize_food(text: str) -> str:
+    """Queue key: lowercase, single-spaced, no trailing punctuation"""
+    return re.sub(r'\s+', ' ', text.lower()).strip(' .,;')
+
+
+def nutrition_fields(nutrition: Dict[str, float]) -> Dict[str, Any]:
+    """Food Log fields for an Edamam nutrient dict"""
+    fields = {}
+    for key, (field_name, decimals) in NUTRITION_FIELDS.items():
+        value = nutrition.get(key, 0)
+        fields[field_name] = value if decimals is None else round(value, decimals)
+    return fields
+
+
+def backoff(attempts: int) -> float:
+    """Seconds before the next try after N failed attempts (with jitter)"""
+    delay = min(BASE_DELAY * 2 ** max(attempts - 1, 0), MAX_DELAY)
+    return delay * random.uniform(0.9, 1.1)
+
+
+class NutritionRetryQueue:
+    """Foods awaiting Edamam data and the Food Log records that need it"""
+
+    def __init__(self, path: str = QUEUE_FILE):
+        self.path = path
+        self.lock_file = f"{path}.lock"
+        self._lock = threading.Lock()
+
+    # Persistence
+    def _load(self) -> Dict:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        data.setdefault("foods", {})
+        return data
+
+    def _save(self, data: Dict):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _update(self, fn: Callable[[Dict], Any]) -> Any:
+        """Run fn(data) under the file lock and save"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+            with open(self.lock_file, 'a') as lock:
+                if HAS_FCNTL:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    data = self._load()
+                    result = fn(data)
+                    self._save(data)
+                    return result
+                finally:
+                    if HAS_FCNTL:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # Queue
+    def enqueue(self, record_id: str, food_text: str,
+                fields: Optional[Dict[str, Any]] = None, meal_type: str = ""):
+        """Queue a Food Log record for nutrition (no-op if already queued)
+
+        A new record for a food that hit MAX_ATTEMPTS resets its attempts.
+
+        fields: extra fields to write alongside the nutrition on success.
+        """
+        key = normalize_food(food_text)
+        if not key:
+            return
+
+        def add(data):
+            food = data["foods"].setdefault(key, {
+                "text": food_text,
+                "attempts": 0,
+                "next_attempt": 0,
+                "queued_at": time.time(),
+                "last_error": None,
+                "nutrition": None,
+                "records": {},
+            })
+            if record_id in food["records"]:
+                return
+            food["records"][record_id] = {"meal_type": meal_type, "fields": fields or {}}
+            # A food that ran out of retries stays queued (so its records
+            # aren't swept up again); a new record of it starts over
+            if food["attempts"] >= MAX_ATTEMPTS:
+                food["attempts"], food["next_attempt"] = 0, 0
+        self._update(add)
+
+    def queued_record_ids(self) -> set:
+        return {rid for food in self._load()["foods"].values() for rid in food["records"]}
+
+    def status(self) -> Dict[str, Any]:
+        foods = self._load()["foods"]
+        now = time.time()
+        waiting = [f for f in foods.values() if f["attempts"] < MAX_ATTEMPTS]
+        return {
+            "foods": len(foods),
+            "records": sum(len(f["records"]) for f in foods.values()),
+            "due": sum(1 for f in waiting if f["next_attempt"] <= now),
+            "awaiting_patch": sum(1 for f in foods.values() if f.get("nutrition")),
+            "gave_up": len(foods) - len(waiting),
+            "next_attempt": min((f["next_attempt"] for f in waiting), default=None),
+            "oldest": min((f["queued_at"] for f in foods.values()), default=None),
+        }
+
+    # Processing
+    def _lookup_due(self, due: Dict[str, Dict],
+                    lookup: Callable[[str], Optional[Dict]]) -> Dict[str, Optional[Dict]]:
+        """Edamam results by key, in waves; stops after a wave that fails entirely"""
+        results: Dict[str, Optional[Dict]] = {}
+        keys = list(due)
+        with ThreadPoolExecutor(max_workers=EDAMAM_CONCURRENCY) as pool:
+            for start in range(0, len(keys), EDAMAM_CONCURRENCY):
+                wave = keys[start:start + EDAMAM_CONCURRENCY]
+                found = list(pool.map(lambda k: self._safe_lookup(lookup, due[k]["text"]), wave))
+                results.update(zip(wave, found))
+                if not any(found):
+                    break
+        return results
+
+    @staticmethod
+    def _safe_lookup(lookup, text):
+        try:
+            return lookup(text)
+        except Exception:
+            return None
+
+    def process(self, client, base_id: str, table_name: str,
+                lookup: Callable[[str], Optional[Dict]]) -> Dict[str, List]:
+        """Retry every due food once and PATCH what succeeded
+
+        Returns {"updated": [food text per record], "pending": [...],
+        "gave_up": [{"text", "records"}]} for foods that hit MAX_ATTEMPTS
+        this run.
+        """
+        now = time.time()
+        foods = self._load()["foods"]
+        due = {k: f for k, f in foods.items()
+               if f["attempts"] < MAX_ATTEMPTS and (f.get("nutrition") or f["next_attempt"] <= now)}
+        summary: Dict[str, List] = {"updated": [], "pending": [], "gave_up": []}
+        if not due:
+            return summary
+
+        # Nutrition fetched earlier whose PATCH failed needs no new lookup
+        to_lookup = {k: f for k, f in due.items() if not f.get("nutrition")}
+        results = self._lookup_due(to_lookup, lookup) if to_lookup else {}
+        nutrition = {k: f["nutrition"] for k, f in due.items() if f.get("nutrition")}
+        nutrition.update({k: n for k, n in results.items() if n})
+
+        updates = []
+        for key, values in nutrition.items():
+            for record_id, record in due[key]["records"].items():
+                updates.append({"id": record_id,
+                                "fields": {**nutrition_fields(values), **record["fields"]}})
+
+        patched = set()
+        if updates:
+            for result in client.update_records(base_id, table_name, updates):
+                if 'error' not in result:
+                    patched.add(result.get('id'))
+
+        def apply(data):
+            for key, food in list(data["foods"].items()):
+                if key not in due:
+                    continue
+                if key in nutrition:
+                    done = [rid for rid in food["records"] if rid in patched]
+                    summary["updated"] += [food["text"]] * len(done)
+                    for rid in done:
+                        del food["records"][rid]
+                    if not food["records"]:
+                        del data["foods"][key]
+                        continue
+                    food["nutrition"] = nutrition[key]  # retry the PATCH next run
+                    food["last_error"] = "Airtable update failed"
+                elif key in results:
+                    food["attempts"] += 1
+                    food["last_error"] = "Edamam lookup failed"
+                    food["next_attempt"] = time.time() + backoff(food["attempts"])
+                    if food["attempts"] >= MAX_ATTEMPTS:
+                        summary["gave_up"].append({"text": food["text"], "records": dict(food["records"])})
+                        continue
+                else:
+                    # Skipped after an all-fail wave - try again next run, no attempt spent
+                    food["next_attempt"] = max(food["next_attempt"], time.time() + BASE_DELAY)
+                summary["pending"].append(food["text"])
+        self._update(apply)
+        return summary
+
+
+_default_queue: Optional[NutritionRetryQueue] = None
+
+
+def get_retry_queue() -> NutritionRetryQueue:
+    global _default_queue
+    if _default_queue is None:
+        _default_queue = NutritionRetryQueue()
+    return _default_queue
+
+
+def _when(ts: Optional[float]) -> str:
+    return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M') if ts else '-'
+
+
+def print_status(queue: NutritionRetryQueue):
+    status = queue.status()
+    print("🍽️ Nutrition retry queue")
+    print(f"  Foods queued:     {status['foods']} ({status['records']} records)")
+    print(f"  Due now:          {status['due']}")
+    print(f"  Awaiting PATCH:   {status['awaiting_patch']}")
+    print(f"  Gave up:          {status['gave_up']}")
+    print(f"  Next attempt:     {_when(status['next_attempt'])}")
+    print(f"  Oldest in queue:  {_when(status['oldest'])}")
+    for key, food in sorted(queue._load()["foods"].items(), key=lambda kv: kv[1]["next_attempt"]):
+        print(f"  • {food['text'][:50]:<50} tries={food['attempts']} "
+              f"next={_when(food['next_attempt'])} records={len(food['records'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Edamam nutrition retry queue")
+    parser.add_argument('command', choices=['status', 'run'], nargs='?', default='status')
+    args = parser.parse_args()
+
+    if args.command == 'status':
+        print_status(get_retry_queue())
+        return
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from log_food_meal_robust import check_pending_nutrition_updates
+    updated = check_pending_nutrition_updates()
+    print(f"✅ Updated {len(updated)} record(s)")
+
+
+if __name__ == "__main__":
+    main()
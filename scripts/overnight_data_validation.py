@@ -9,20 +9,83 @@ Categorizes issues: SEVERE vs MINOR
 import os
 import sys
 import json
-import requests
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from airtable_client import AirtableClient, PRIORITY_LOW
+from airtable_formula import eq, in_, is_after
+from duplicate_index import INDEXED_TABLES
+from validation_rules import (
+    FOOD_RULES, HABIT_RULES, TAT_RULES, SEVERE, MINOR, WARNING
+)
 
 AIRTABLE_KEY = open('/home/samsclaw/.config/airtable/api_key').read().strip()
 HEALTH_BASE = "appnVeGSjwJgG2snS"
 PRODUCTIVITY_BASE = "appvUbV8IeGhxmcPn"
 
+DATA_DIR = '/home/samsclaw/.openclaw/workspace/data'
+
+# Incremental mode: watermark + outstanding issues per record / day
+STATE_FILE = os.path.join(DATA_DIR, 'validation_state.json')
+
+# Overlap each incremental window to absorb clock skew
+WATERMARK_SKEW = timedelta(minutes=5)
+
+# Dates per OR(...) query when re-fetching whole days around modified records
+DATES_PER_QUERY = 30
+
+# Report name -> (base, Airtable table)
+VALIDATED_TABLES = {
+    'Food Log': (HEALTH_BASE, "Food Log"),
+    'Daily Habits': (PRODUCTIVITY_BASE, "Daily Habits"),
+    'TAT Tasks': (PRODUCTIVITY_BASE, "TAT Tasks v2"),
+}
+
+ISSUE_KINDS = (SEVERE, MINOR, WARNING)
+
+
+def modified_since(watermark):
+    return f"IS_AFTER(LAST_MODIFIED_TIME(), '{watermark}')"
+
+
+def group_by_date(records):
+    """Records grouped by their Date field (records without one are dropped)"""
+    by_date = defaultdict(list)
+    for r in records:
+        date = r.get('fields', {}).get('Date')
+        if date:
+            by_date[date[:10]].append(r)
+    return by_date
+
+
+class IssueLog:
+    """Issues from one validator, attributed to the record or day that raised them
+
+    Keys are record IDs for per-record checks and 'date:YYYY-MM-DD' for
+    checks across a day's records (duplicates, totals, cross-table).
+    """
+    
+    def __init__(self):
+        self.severe = []
+        self.minor = []
+        self.warnings = []
+        self.by_key = defaultdict(lambda: {kind: [] for kind in ISSUE_KINDS})
+    
+    def add(self, key, kind, message):
+        getattr(self, kind).append(message)
+        self.by_key[key][kind].append(message)
+
+
 class DataValidator:
     def __init__(self):
-        self.headers = {
-            "Authorization": f"Bearer {AIRTABLE_KEY}",
-            "Content-Type": "application/json"
-        }
+        self.client = AirtableClient(AIRTABLE_KEY, priority=PRIORITY_LOW)
+        # Per-table IssueLog and the record/day keys each run validated
+        self.issue_logs = {}
+        self.validated_keys = {}
         self.validation_report = {
             "timestamp": datetime.now().isoformat(),
             "date_checked": (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
@@ -38,482 +101,240 @@ class DataValidator:
             }
         }
     
-    def classify_issue(self, issue_type, description):
-        """
-        Classify issue as SEVERE or MINOR
-        SEVERE: Data corruption, missing required fields, duplicates
-        MINOR: Missing optional data, recommendations, formatting
-        """
-        severe_keywords = [
-            'missing required', 'cannot fetch', 'exception', 'duplicate', 
-            'invalid', 'orphaned', 'multiple records', 'data type',
-            'corrupt', 'empty', 'null'
-        ]
-        
-        issue_lower = description.lower()
-        if any(keyword in issue_lower for keyword in severe_keywords):
-            return 'SEVERE'
-        return 'MINOR'
+    def _error_result(self, log, message):
+        log.add('table', SEVERE, message)
+        return {
+            "status": "ERROR", 
+            "severe": log.severe, 
+            "minor": log.minor,
+            "warnings": log.warnings,
+            "missing_fields": 0
+        }
+    
+    def _duplicate_clusters(self, table_name, records):
+        """Index the records, then return duplicate clusters that include any of them"""
+        index = self.client.duplicates
+        index.add(table_name, records)
+        return index.clusters(table_name, record_ids=[r['id'] for r in records])
     
     # ============================================================================
     # FOOD LOG VALIDATIONS
     # ============================================================================
-    def validate_food_log(self, date):
-        """Validate Food Log table integrity with field completeness checks"""
-        print("\n" + "="*60)
-        print("🍽️  VALIDATING FOOD LOG")
-        print("="*60)
+    def validate_food_log(self, date=None, records=None):
+        """Validate Food Log table integrity with field completeness checks
         
-        url = f"https://api.airtable.com/v0/{HEALTH_BASE}/tblsoErCMSBtzBZKB"
-        severe_issues = []
-        minor_issues = []
-        warnings = []
+        Checks one date's meals, or a given list of records (whole days, so
+        duplicate and total checks see every meal of each day).
+        """
+        log = IssueLog()
+        self.issue_logs['Food Log'] = log
         auto_fixed = 0
-        missing_fields_total = 0
-        
-        # Define field completeness expectations
-        required_fields = {
-            'Date': 'Date of meal',
-            'Meal Type': 'Type of meal (Breakfast/Lunch/Dinner/Snack)',
-            'Food Items': 'Description of food consumed',
-            'Calories': 'Calorie count'
-        }
-        
-        optional_fields = {
-            'Protein (g)': 'Protein content',
-            'Carbs (g)': 'Carbohydrate content',
-            'Fat (g)': 'Fat content',
-            'Edamam Data': 'Whether data came from Edamam API'
-        }
         
         try:
-            response = requests.get(
-                f"{url}?filterByFormula=Date='{date}'&maxRecords=50",
-                headers=self.headers,
-                timeout=30
-            )
-            
-            if response.status_code != 200:
-                severe_issues.append(f"SEVERE: Cannot fetch Food Log: HTTP {response.status_code}")
-                return {
-                    "status": "ERROR", 
-                    "severe": severe_issues, 
-                    "minor": minor_issues,
-                    "warnings": warnings,
-                    "missing_fields": 0
-                }
-            
-            records = response.json().get('records', [])
-            
-            for r in records:
-                f = r.get('fields', {})
-                record_id = r['id'][:10]
-                missing_in_record = 0
-                
-                # Check 1: Required fields - SEVERE if missing
-                for field, description in required_fields.items():
-                    if field not in f or f[field] is None or f[field] == '':
-                        severe_issues.append(f"SEVERE: Record {record_id}: Missing required field '{field}' ({description})")
-                        missing_in_record += 1
-                
-                # Check 2: Optional fields - MINOR if missing
-                for field, description in optional_fields.items():
-                    if field not in f or f[field] is None or f[field] == '':
-                        minor_issues.append(f"MINOR: Record {record_id}: Missing optional field '{field}' ({description})")
-                        missing_in_record += 1
-                
-                missing_fields_total += missing_in_record
-                
-                # Check 3: Data type validations - SEVERE
-                meal_type = f.get('Meal Type', '')
-                if meal_type and meal_type not in ['Breakfast', 'Lunch', 'Dinner', 'Snack']:
-                    severe_issues.append(f"SEVERE: Record {record_id}: Invalid Meal Type '{meal_type}'")
-                
-                calories = f.get('Calories')
-                if calories is not None:
-                    if not isinstance(calories, (int, float)):
-                        severe_issues.append(f"SEVERE: Record {record_id}: Calories must be numeric, got {type(calories)}")
-                    elif calories < 0:
-                        severe_issues.append(f"SEVERE: Record {record_id}: Calories cannot be negative ({calories})")
-                    elif calories == 0:
-                        warnings.append(f"⚠️ Record {record_id}: Calories is 0 - verify this is correct")
-                
-                # Check 4: Date format - SEVERE
-                record_date = f.get('Date', '')
-                if record_date:
-                    try:
-                        datetime.strptime(record_date, '%Y-%m-%d')
-                    except:
-                        severe_issues.append(f"SEVERE: Record {record_id}: Invalid Date format '{record_date}' (expected YYYY-MM-DD)")
-            
-            # Check 5: Duplicates - SEVERE
-            seen_meals = defaultdict(list)
-            for r in records:
+            if records is None:
+                try:
+                    records = self.client.query_records(HEALTH_BASE, "Food Log",
+                                                        filter_formula=eq("Date", date))
+                except Exception as e:
+                    return self._error_result(log, f"SEVERE: Cannot fetch Food Log: {e}")
+            
+            # Per-day groups, built in the same pass as the record checks
+            by_date = defaultdict(list)
+            fixes = []
+            
+            def collect(r):
                 f = r.get('fields', {})
+                if f.get('Date'):
+                    by_date[f['Date'][:10]].append(r)
+                # Edamam flag missing on a record that has Edamam nutrition
+                if not f.get('Edamam Data', False) and f.get('Protein (g)'):
+                    fixes.append({"id": r['id'], "fields": {"Edamam Data": True}})
+            
+            missing_fields_total = FOOD_RULES.run(records, log, on_record=collect)
+            
+            # Duplicates against the whole history (other days, retried writes) - SEVERE
+            clusters = self._duplicate_clusters("Food Log", records)
+            batch = {r['id']: r['fields'] for r in records if 'fields' in r}
+            for cluster in clusters:
+                f = next(batch[rid] for rid in cluster['record_ids'] if rid in batch)
                 key = f"{f.get('Date', '')}:{f.get('Meal Type', '')}:{f.get('Food Items', '')[:30]}"
-                seen_meals[key].append(r['id'][:10])
-            
-            for key, ids in seen_meals.items():
-                if len(ids) > 1:
-                    severe_issues.append(f"SEVERE: Duplicate meals found ({len(ids)} copies with IDs: {', '.join(ids)}): {key[:50]}")
-            
-            # Check 6: Data quality warnings - MINOR
-            total_calories = sum(r['fields'].get('Calories', 0) for r in records if 'Calories' in r['fields'])
-            if total_calories > 5000:
-                warnings.append(f"⚠️ Total calories ({total_calories}) unusually high - verify entries")
-            elif total_calories < 500 and len(records) > 0:
-                warnings.append(f"⚠️ Total calories ({total_calories}) unusually low - verify entries")
+                ids = [rid[:10] for rid in cluster['record_ids']]
+                note = " (logged either side of midnight)" if cluster['cross_day'] else ""
+                log.add(f"date:{key[:10]}", SEVERE, f"SEVERE: Duplicate meals found ({len(ids)} copies with IDs: {', '.join(ids)}): {key[:50]}{note}")
+            
+            # Data quality warnings per day
+            total_calories = 0
+            for day, day_records in by_date.items():
+                day_calories = sum(r['fields'].get('Calories', 0) for r in day_records if 'Calories' in r['fields'])
+                total_calories += day_calories
+                label = f" on {day}" if len(by_date) > 1 else ""
+                if day_calories > 5000:
+                    log.add(f"date:{day}", WARNING, f"⚠️ Total calories ({day_calories}){label} unusually high - verify entries")
+                elif day_calories < 500:
+                    log.add(f"date:{day}", WARNING, f"⚠️ Total calories ({day_calories}){label} unusually low - verify entries")
+            
+            # Auto-fix, 10 records per request
+            if fixes:
+                try:
+                    results = self.client.update_records(HEALTH_BASE, "Food Log", fixes)
+                    auto_fixed = sum(1 for res in results if 'error' not in res)
+                except Exception:
+                    pass
+            
+            self.validated_keys['Food Log'] = [r['id'] for r in records] + [f"date:{d}" for d in by_date]
             
-            # Check 7: Edamam Data consistency - MINOR
-            for r in records:
-                f = r.get('fields', {})
-                has_edamam = f.get('Edamam Data', False)
-                has_protein = f.get('Protein (g)')
-                
-                if has_edamam and not has_protein:
-                    minor_issues.append(f"MINOR: Record {r['id'][:10]}: Edamam Data=True but missing protein - incomplete nutrition")
-                elif not has_edamam and has_protein:
-                    # Auto-fix
-                    try:
-                        fix_resp = requests.patch(
-                            f"{url}/{r['id']}",
-                            headers=self.headers,
-                            json={"fields": {"Edamam Data": True}},
-                            timeout=10
-                        )
-                        if fix_resp.status_code == 200:
-                            auto_fixed += 1
-                    except:
-                        pass
-            
-            result = {
-                "status": "PASS" if not severe_issues else "FAIL",
+            return {
+                "status": "PASS" if not log.severe else "FAIL",
                 "records_checked": len(records),
                 "total_calories": total_calories,
-                "severe": severe_issues,
-                "minor": minor_issues,
-                "warnings": warnings,
+                "severe": log.severe,
+                "minor": log.minor,
+                "warnings": log.warnings,
                 "auto_fixed": auto_fixed,
-                "missing_fields": missing_fields_total
+                "missing_fields": missing_fields_total,
+                "duplicate_clusters": clusters
             }
             
-            print(f"  Records checked: {len(records)}")
-            print(f"  Severe issues: {len(severe_issues)}")
-            print(f"  Minor issues: {len(minor_issues)}")
-            print(f"  Warnings: {len(warnings)}")
-            print(f"  Missing fields: {missing_fields_total}")
-            print(f"  Auto-fixed: {auto_fixed}")
-            
-            return result
-            
         except Exception as e:
-            severe_issues.append(f"SEVERE: Exception during validation: {str(e)}")
-            return {
-                "status": "ERROR", 
-                "severe": severe_issues, 
-                "minor": minor_issues,
-                "warnings": warnings,
-                "missing_fields": 0
-            }
+            return self._error_result(log, f"SEVERE: Exception during validation: {str(e)}")
     
     # ============================================================================
     # DAILY HABITS VALIDATIONS
     # ============================================================================
-    def validate_daily_habits(self, date):
-        """Validate Daily Habits table with field completeness checks"""
-        print("\n" + "="*60)
-        print("📊 VALIDATING DAILY HABITS")
-        print("="*60)
+    def validate_daily_habits(self, date=None, records=None, food_by_date=None):
+        """Validate Daily Habits table with field completeness checks
         
-        url = f"https://api.airtable.com/v0/{PRODUCTIVITY_BASE}/tblZSHA0bOZGNaRUm"
-        severe_issues = []
-        minor_issues = []
-        warnings = []
-        missing_fields_total = 0
-        
-        required_fields = {
-            'Date': 'Date of habit tracking'
-        }
-        
-        optional_fields = {
-            'Multivitamin': 'Multivitamin taken (checkbox)',
-            'Fruit': 'Fruit consumed (checkbox)',
-            'Exercise': 'Exercise completed (checkbox)',
-            'Creatine': 'Creatine taken (checkbox)',
-            'Water': 'Water intake (number of glasses)'
-        }
+        Checks one date, or a given list of records (whole days). food_by_date
+        supplies Food Log records for the cross-check; fetched if omitted.
+        """
+        log = IssueLog()
+        self.issue_logs['Daily Habits'] = log
         
         try:
-            response = requests.get(
-                f"{url}?filterByFormula=Date='{date}'&maxRecords=10",
-                headers=self.headers,
-                timeout=30
-            )
+            if records is None:
+                try:
+                    records = self.client.query_records(PRODUCTIVITY_BASE, "Daily Habits",
+                                                        filter_formula=eq("Date", date))
+                except Exception as e:
+                    return self._error_result(log, f"SEVERE: Cannot fetch Daily Habits: {e}")
             
-            if response.status_code != 200:
-                severe_issues.append(f"SEVERE: Cannot fetch Daily Habits: HTTP {response.status_code}")
-                return {
-                    "status": "ERROR", 
-                    "severe": severe_issues, 
-                    "minor": minor_issues,
-                    "warnings": warnings,
-                    "missing_fields": 0
-                }
+            by_date = defaultdict(list)
             
-            records = response.json().get('records', [])
+            def collect(r):
+                day = r.get('fields', {}).get('Date')
+                if day:
+                    by_date[day[:10]].append(r)
             
-            # Check 1: Duplicate records - SEVERE
-            if len(records) > 1:
-                ids = [r['id'][:10] for r in records]
-                severe_issues.append(f"SEVERE: Multiple habit records for {date} ({len(records)} records: {', '.join(ids)}) - should be unique per day")
+            missing_fields_total = HABIT_RULES.run(records, log, on_record=collect)
             
-            for r in records:
-                f = r.get('fields', {})
-                record_id = r['id'][:10]
-                missing_in_record = 0
-                
-                # Check required fields
-                for field, description in required_fields.items():
-                    if field not in f or not f[field]:
-                        severe_issues.append(f"SEVERE: Record {record_id}: Missing required field '{field}' ({description})")
-                        missing_in_record += 1
-                
-                # Check optional fields (minor)
-                for field, description in optional_fields.items():
-                    if field not in f:
-                        minor_issues.append(f"MINOR: Record {record_id}: Missing field '{field}' ({description})")
-                        missing_in_record += 1
-                
-                # Check data types
-                water = f.get('Water')
-                if water is not None:
-                    if not isinstance(water, (int, float)):
-                        severe_issues.append(f"SEVERE: Record {record_id}: Water must be numeric, got {type(water)}")
-                    elif water < 0 or water > 20:
-                        warnings.append(f"⚠️ Record {record_id}: Water value ({water}) seems unusual")
-                
-                # Check boolean fields
-                boolean_fields = ['Multivitamin', 'Fruit', 'Exercise', 'Creatine']
-                for field in boolean_fields:
-                    value = f.get(field)
-                    if value is not None and not isinstance(value, bool):
-                        severe_issues.append(f"SEVERE: Record {record_id}: {field} should be boolean (checkbox), got {type(value)}")
-                
-                missing_fields_total += missing_in_record
+            # Check 1: Duplicate records - SEVERE
+            clusters = self._duplicate_clusters("Daily Habits", records)
+            for cluster in clusters:
+                day = cluster['key']
+                ids = [rid[:10] for rid in cluster['record_ids']]
+                log.add(f"date:{day}", SEVERE, f"SEVERE: Multiple habit records for {day} ({len(ids)} records: {', '.join(ids)}) - should be unique per day")
             
             # Check 2: Missing record - WARNING
-            if not records:
-                warnings.append(f"⚠️ No habit record found for {date}")
+            if date and not records:
+                log.add(f"date:{date}", WARNING, f"⚠️ No habit record found for {date}")
             
             # Check 3: Cross-reference with Food Log - MINOR
-            food_issues = self._cross_validate_habits_food(date)
-            minor_issues.extend(food_issues)
+            if food_by_date is None and date and records:
+                try:
+                    food = self.client.query_records(HEALTH_BASE, "Food Log",
+                                                     filter_formula=eq("Date", date))
+                    food_by_date = group_by_date(food)
+                except Exception:
+                    food_by_date = {}
+            for day, day_records in by_date.items():
+                for issue in self._cross_validate_habits_food(day_records[0]['fields'],
+                                                              (food_by_date or {}).get(day, [])):
+                    log.add(f"date:{day}", MINOR, issue)
+            
+            self.validated_keys['Daily Habits'] = [r['id'] for r in records] + [f"date:{d}" for d in by_date]
             
-            result = {
-                "status": "PASS" if not severe_issues else "FAIL",
+            return {
+                "status": "PASS" if not log.severe else "FAIL",
                 "records_checked": len(records),
-                "severe": severe_issues,
-                "minor": minor_issues,
-                "warnings": warnings,
-                "missing_fields": missing_fields_total
+                "severe": log.severe,
+                "minor": log.minor,
+                "warnings": log.warnings,
+                "missing_fields": missing_fields_total,
+                "duplicate_clusters": clusters
             }
             
-            print(f"  Records checked: {len(records)}")
-            print(f"  Severe issues: {len(severe_issues)}")
-            print(f"  Minor issues: {len(minor_issues)}")
-            print(f"  Warnings: {len(warnings)}")
-            print(f"  Missing fields: {missing_fields_total}")
-            
-            return result
-            
         except Exception as e:
-            severe_issues.append(f"SEVERE: Exception during validation: {str(e)}")
-            return {
-                "status": "ERROR", 
-                "severe": severe_issues, 
-                "minor": minor_issues,
-                "warnings": warnings,
-                "missing_fields": 0
-            }
+            return self._error_result(log, f"SEVERE: Exception during validation: {str(e)}")
     
-    def _cross_validate_habits_food(self, date):
-        """Cross-validate habits with food log - returns minor issues"""
+    def _cross_validate_habits_food(self, habits, food_records):
+        """Cross-validate one day's habits with its food log - returns minor issues"""
         minor_issues = []
         
-        try:
-            # Get habits
-            habits_url = f"https://api.airtable.com/v0/{PRODUCTIVITY_BASE}/tblZSHA0bOZGNaRUm"
-            habits_resp = requests.get(
-                f"{habits_url}?filterByFormula=Date='{date}'",
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if habits_resp.status_code != 200:
-                return minor_issues
-            
-            habits_records = habits_resp.json().get('records', [])
-            if not habits_records:
-                return minor_issues
-            
-            habits = habits_records[0]['fields']
-            
-            # Get food log
-            food_url = f"https://api.airtable.com/v0/{HEALTH_BASE}/tblsoErCMSBtzBZKB"
-            food_resp = requests.get(
-                f"{food_url}?filterByFormula=Date='{date}'",
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if food_resp.status_code != 200:
-                return minor_issues
-            
-            food_records = food_resp.json().get('records', [])
-            food_text = ' '.join([r['fields'].get('Food Items', '') for r in food_records]).lower()
-            
-            # Check: If multivitamin in food log, should be checked in habits
-            if 'multivitamin' in food_text and not habits.get('Multivitamin'):
-                minor_issues.append("MINOR: Multivitamin found in Food Log but not checked in Daily Habits")
-            
-            # Check: If fruit in food log, should be checked in habits
-            fruit_keywords = ['apple', 'banana', 'date', 'fruit', 'berry']
-            has_fruit_in_food = any(f in food_text for f in fruit_keywords)
-            if has_fruit_in_food and not habits.get('Fruit'):
-                minor_issues.append("MINOR: Fruit found in Food Log but not checked in Daily Habits")
-            
-        except Exception as e:
-            pass
+        food_text = ' '.join([r['fields'].get('Food Items', '') for r in food_records]).lower()
+        
+        # Check: If multivitamin in food log, should be checked in habits
+        if 'multivitamin' in food_text and not habits.get('Multivitamin'):
+            minor_issues.append("MINOR: Multivitamin found in Food Log but not checked in Daily Habits")
+        
+        # Check: If fruit in food log, should be checked in habits
+        fruit_keywords = ['apple', 'banana', 'date', 'fruit', 'berry']
+        has_fruit_in_food = any(f in food_text for f in fruit_keywords)
+        if has_fruit_in_food and not habits.get('Fruit'):
+            minor_issues.append("MINOR: Fruit found in Food Log but not checked in Daily Habits")
         
         return minor_issues
     
     # ============================================================================
     # TAT TASKS VALIDATIONS
     # ============================================================================
-    def validate_tat_tasks(self, date):
-        """Validate TAT Tasks table with field completeness checks"""
-        print("\n" + "="*60)
-        print("📋 VALIDATING TAT TASKS")
-        print("="*60)
-        
-        url = f"https://api.airtable.com/v0/{PRODUCTIVITY_BASE}/tblkbuvkZUSpm1IgJ"
-        severe_issues = []
-        minor_issues = []
-        warnings = []
-        missing_fields_total = 0
-        
-        required_fields = {
-            'Task Name': 'Description of the task',
-            'Category': 'TAT category (1/3/7/30 days)',
-            'Status': 'Current status of the task'
-        }
+    def validate_tat_tasks(self, date=None, records=None):
+        """Validate TAT Tasks table with field completeness checks
         
-        optional_fields = {
-            'Priority': 'Task priority level',
-            'Notes': 'Additional notes',
-            'Tags': 'Task tags'
-        }
+        Checks tasks created in the week before date, or a given list of records.
+        """
+        log = IssueLog()
+        self.issue_logs['TAT Tasks'] = log
         
         try:
-            # TAT Tasks don't have a Date field - use Date Created instead
-            # Get tasks created recently (last 7 days) or filter by Due Date
-            from datetime import datetime, timedelta
-            week_ago = (datetime.strptime(date, '%Y-%m-%d') - timedelta(days=7)).strftime('%Y-%m-%d')
-            response = requests.get(
-                f"{url}?filterByFormula=IS_AFTER({{Date Created}}, '{week_ago}')&maxRecords=50",
-                headers=self.headers,
-                timeout=30
-            )
+            if records is None:
+                # TAT Tasks don't have a Date field - use Date Created instead
+                # Get tasks created recently (last 7 days)
+                week_ago = (datetime.strptime(date, '%Y-%m-%d') - timedelta(days=7)).strftime('%Y-%m-%d')
+                try:
+                    records = self.client.query_records(PRODUCTIVITY_BASE, "TAT Tasks v2",
+                                                        filter_formula=is_after("Date Created", week_ago))
+                except Exception as e:
+                    return self._error_result(log, f"SEVERE: Cannot fetch TAT Tasks: {e}")
             
-            if response.status_code != 200:
-                severe_issues.append(f"SEVERE: Cannot fetch TAT Tasks: HTTP {response.status_code}")
-                return {
-                    "status": "ERROR", 
-                    "severe": severe_issues, 
-                    "minor": minor_issues,
-                    "warnings": warnings,
-                    "missing_fields": 0
-                }
+            missing_fields_total = TAT_RULES.run(records, log)
             
-            records = response.json().get('records', [])
+            self.validated_keys['TAT Tasks'] = [r['id'] for r in records]
             
-            for r in records:
-                f = r.get('fields', {})
-                record_id = r['id'][:10]
-                missing_in_record = 0
-                
-                # Check required fields
-                for field, description in required_fields.items():
-                    if field not in f or not f[field]:
-                        severe_issues.append(f"SEVERE: Record {record_id}: Missing required field '{field}' ({description})")
-                        missing_in_record += 1
-                
-                # Check optional fields
-                for field, description in optional_fields.items():
-                    if field not in f:
-                        minor_issues.append(f"MINOR: Record {record_id}: Missing field '{field}' ({description})")
-                        missing_in_record += 1
-                
-                # Check Category valid values
-                category = f.get('Category', '')
-                if category and category not in ['1', '3', '7', '30']:
-                    severe_issues.append(f"SEVERE: Record {record_id}: Invalid Category '{category}' (must be 1, 3, 7, or 30)")
-                
-                # Check Status valid values
-                status = f.get('Status', '')
-                valid_statuses = ['Not Started', 'In Progress', 'Blocked', 'Complete', 'Cancelled']
-                if status and status not in valid_statuses:
-                    severe_issues.append(f"SEVERE: Record {record_id}: Invalid Status '{status}' (must be one of: {', '.join(valid_statuses)})")
-                
-                # Check Due Date formula
-                date_created = f.get('Date Created')
-                cat = f.get('Category')
-                due_date = f.get('Due Date')
-                
-                if date_created and cat and due_date:
-                    try:
-                        created = datetime.fromisoformat(date_created.replace('Z', '+00:00'))
-                        expected_due = created + timedelta(days=int(cat))
-                        actual_due = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                        
-                        if abs((expected_due - actual_due).days) > 1:
-                            severe_issues.append(f"SEVERE: Record {record_id}: Due Date formula error - expected {expected_due.date()}, got {actual_due.date()}")
-                    except:
-                        pass
-                
-                # Check overdue tasks
-                days_remaining = f.get('Days Remaining')
-                if days_remaining is not None and days_remaining < 0 and status not in ['Complete', 'Cancelled']:
-                    warnings.append(f"⚠️ Record {record_id}: Task overdue ({days_remaining} days) with status '{status}'")
-                
-                missing_fields_total += missing_in_record
-            
-            result = {
-                "status": "PASS" if not severe_issues else "FAIL",
+            return {
+                "status": "PASS" if not log.severe else "FAIL",
                 "records_checked": len(records),
-                "severe": severe_issues,
-                "minor": minor_issues,
-                "warnings": warnings,
+                "severe": log.severe,
+                "minor": log.minor,
+                "warnings": log.warnings,
                 "missing_fields": missing_fields_total
             }
             
-            print(f"  Records checked: {len(records)}")
-            print(f"  Severe issues: {len(severe_issues)}")
-            print(f"  Minor issues: {len(minor_issues)}")
-            print(f"  Warnings: {len(warnings)}")
-            print(f"  Missing fields: {missing_fields_total}")
-            
-            return result
-            
         except Exception as e:
-            severe_issues.append(f"SEVERE: Exception during validation: {str(e)}")
-            return {
-                "status": "ERROR", 
-                "severe": severe_issues, 
-                "minor": minor_issues,
-                "warnings": warnings,
-                "missing_fields": 0
-            }
+            return self._error_result(log, f"SEVERE: Exception during validation: {str(e)}")
+    
+    def _print_result(self, table_name, result):
+        """Print one table's counts (after concurrent validators finish)"""
+        icons = {'Food Log': '🍽️ ', 'Daily Habits': '📊', 'TAT Tasks': '📋'}
+        print("\n" + "="*60)
+        print(f"{icons.get(table_name, '')} VALIDATING {table_name.upper()}")
+        print("="*60)
+        print(f"  Records checked: {result.get('records_checked', 0)}")
+        print(f"  Severe issues: {len(result.get('severe', []))}")
+        print(f"  Minor issues: {len(result.get('minor', []))}")
+        print(f"  Warnings: {len(result.get('warnings', []))}")
+        print(f"  Missing fields: {result.get('missing_fields', 0)}")
+        if 'auto_fixed' in result:
+            print(f"  Auto-fixed: {result['auto_fixed']}")
     
     # ============================================================================
     # GENERATE VALIDATION REPORT
@@ -617,7 +438,14 @@ class DataValidator:
                 
                 if len(result.get('severe', [])) > 3 or len(result.get('minor', [])) > 2:
                     message += f"... and {len(result.get('severe', [])) + len(result.get('minor', [])) - 5} more issues\n"
-        
+
+        # Incremental runs: issues still open on records not touched tonight
+        outstanding = report.get('outstanding', {})
+        if any(counts['severe'] or counts['minor'] for counts in outstanding.values()):
+            message += "\n📌 **Outstanding (all records):**\n"
+            for table_name, counts in outstanding.items():
+                message += f"• {table_name}: {counts['severe']} severe, {counts['minor']} minor\n"
+
         if summary['overall_status'] == 'PASS':
             message += "\n🎉 All data integrity checks passed! Your tables are in good shape."
         elif summary['severe_errors'] > 0:
@@ -632,19 +460,30 @@ class DataValidator:
     # ============================================================================
     # MAIN VALIDATION RUN
     # ============================================================================
+    def _run_concurrently(self, jobs):
+        """Run {table name: validator thunk} in parallel, print results in table order"""
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = {name: pool.submit(job) for name, job in jobs.items()}
+        for name, future in futures.items():
+            self.validation_report['tables'][name] = future.result()
+            self._print_result(name, future.result())
+    
     def run_validations(self, date=None):
         """Run all validations for a given date"""
         if date is None:
             date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        self.validation_report['date_checked'] = date
         
         print("="*60)
         print(f"🔍 OVERNIGHT DATA VALIDATION - {date}")
         print("="*60)
         
-        # Run validations for each table
-        self.validation_report['tables']['Food Log'] = self.validate_food_log(date)
-        self.validation_report['tables']['Daily Habits'] = self.validate_daily_habits(date)
-        self.validation_report['tables']['TAT Tasks'] = self.validate_tat_tasks(date)
+        # The three tables are independent - validate them side by side
+        self._run_concurrently({
+            'Food Log': lambda: self.validate_food_log(date),
+            'Daily Habits': lambda: self.validate_daily_habits(date),
+            'TAT Tasks': lambda: self.validate_tat_tasks(date),
+        })
         
         # Generate report
         report = self.generate_report()
@@ -653,6 +492,163 @@ class DataValidator:
         self.send_morning_report(report)
         
         return report
+    
+    # ============================================================================
+    # INCREMENTAL VALIDATION
+    # ============================================================================
+    def load_state(self):
+        """Watermark and outstanding issues from the last incremental run"""
+        try:
+            with open(STATE_FILE) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"watermark": None, "tables": {}}
+    
+    def save_state(self, state):
+        tmp_file = f"{STATE_FILE}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_file, STATE_FILE)
+    
+    def _fetch_tables(self, formula=None):
+        """Fetch every validated table concurrently; a failed fetch maps to its exception"""
+        def fetch(base, table):
+            return self.client.query_records(base, table, filter_formula=formula)
+        
+        with ThreadPoolExecutor(max_workers=len(VALIDATED_TABLES)) as pool:
+            futures = {name: pool.submit(fetch, base, table)
+                       for name, (base, table) in VALIDATED_TABLES.items()}
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+        return results
+    
+    def _fetch_dates(self, table_name, dates):
+        """Every record of a table on the given dates, DATES_PER_QUERY per request"""
+        base, table = VALIDATED_TABLES[table_name]
+        dates = sorted(dates)
+        records = []
+        for i in range(0, len(dates), DATES_PER_QUERY):
+            records.extend(self.client.query_records(
+                base, table, filter_formula=in_("Date", dates[i:i + DATES_PER_QUERY])))
+        return records
+    
+    def _expand_to_days(self, changed):
+        """Re-fetch Food Log and Daily Habits for every day a change touched
+        
+        Duplicate, total and cross-table checks need the whole day, and a
+        change on either table affects the other's cross-check.
+        """
+        day_tables = ['Food Log', 'Daily Habits']
+        dates = set()
+        for name in day_tables:
+            if not isinstance(changed[name], Exception):
+                dates.update(group_by_date(changed[name]))
+        if not dates:
+            return
+        
+        with ThreadPoolExecutor(max_workers=len(day_tables)) as pool:
+            futures = {name: pool.submit(self._fetch_dates, name, dates)
+                       for name in day_tables if not isinstance(changed[name], Exception)}
+        for name, future in futures.items():
+            try:
+                changed[name] = future.result()
+            except Exception as e:
+                changed[name] = e
+    
+    def _update_state(self, state, full):
+        """Replace the validated records' / days' issues with this run's findings"""
+        for name, log in self.issue_logs.items():
+            if name not in self.validated_keys:
+                continue  # fetch failed - keep what we knew
+            outstanding = {} if full else state['tables'].get(name, {})
+            for key in self.validated_keys[name]:
+                outstanding.pop(key, None)
+            for key, issues in log.by_key.items():
+                if any(issues.values()):
+                    outstanding[key] = issues
+            state['tables'][name] = outstanding
+    
+    def outstanding_summary(self, state):
+        """{table: {severe, minor, warnings, keys}} counts of issues still open"""
+        summary = {}
+        for name, outstanding in state.get('tables', {}).items():
+            counts = {kind: sum(len(issues[kind]) for issues in outstanding.values())
+                      for kind in ISSUE_KINDS}
+            counts['keys'] = len(outstanding)
+            summary[name] = counts
+        return summary
+    
+    def run_incremental(self, full=False):
+        """Validate only records modified since the last run (everything if full)
+        
+        Issues are tracked per record and per day in STATE_FILE, so fixed
+        records drop out and untouched ones keep their outstanding issues.
+        The watermark only advances when every table was fetched.
+        """
+        state = self.load_state()
+        watermark = None if full else state.get('watermark')
+        started = datetime.now(timezone.utc)
+        
+        mode = "FULL" if watermark is None else f"CHANGES SINCE {watermark}"
+        self.validation_report['mode'] = 'full' if watermark is None else 'incremental'
+        self.validation_report['date_checked'] = started.astimezone().strftime('%Y-%m-%d')
+        print("="*60)
+        print(f"🔍 OVERNIGHT DATA VALIDATION - {mode}")
+        print("="*60)
+        
+        changed = self._fetch_tables(modified_since(watermark) if watermark else None)
+        if watermark is not None:
+            self._expand_to_days(changed)
+        else:
+            # Full listing - rebuild the duplicate index so deleted records drop out
+            for name in INDEXED_TABLES:
+                if not isinstance(changed[name], Exception):
+                    self.client.duplicates.rebuild(name, changed[name])
+        
+        def validate(name, validator, **kwargs):
+            records = changed[name]
+            if isinstance(records, Exception):
+                log = IssueLog()
+                self.issue_logs[name] = log
+                return lambda: self._error_result(log, f"SEVERE: Cannot fetch {name}: {records}")
+            return lambda: validator(records=records, **kwargs)
+        
+        food = changed['Food Log']
+        food_by_date = group_by_date(food) if not isinstance(food, Exception) else {}
+        self._run_concurrently({
+            'Food Log': validate('Food Log', self.validate_food_log),
+            'Daily Habits': validate('Daily Habits', self.validate_daily_habits,
+                                     food_by_date=food_by_date),
+            'TAT Tasks': validate('TAT Tasks', self.validate_tat_tasks),
+        })
+        
+        self._update_state(state, full=watermark is None)
+        if not any(isinstance(r, Exception) for r in changed.values()):
+            state['watermark'] = (started - WATERMARK_SKEW).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        self.save_state(state)
+        self.validation_report['outstanding'] = self.outstanding_summary(state)
+        
+        report = self.generate_report()
+        self.send_morning_report(report)
+        return report
+    
+    def audit(self):
+        """Report outstanding issues from the last incremental run (no API calls)"""
+        state = self.load_state()
+        if state.get('watermark') is None:
+            print("No incremental run recorded yet")
+            return
+        print(f"Outstanding issues as of {state['watermark']}:")
+        for name, counts in self.outstanding_summary(state).items():
+            print(f"\n{name}: {counts['severe']} severe, {counts['minor']} minor, "
+                  f"{counts['warnings']} warnings across {counts['keys']} records/days")
+            for key, issues in state['tables'][name].items():
+                for issue in issues['severe']:
+                    print(f"  🔴 {key}: {issue.replace('SEVERE: ', '')}")
 
 # ============================================================================
 # Main execution
@@ -663,12 +659,17 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Overnight Data Validation with Severity Levels')
     parser.add_argument('--date', help='Date to validate (YYYY-MM-DD)', default=None)
     parser.add_argument('--report-only', action='store_true', help='Only generate report from last run')
+    parser.add_argument('--incremental', action='store_true', help='Validate records changed since the last incremental run')
+    parser.add_argument('--full', action='store_true', help='Validate every record and reset incremental state')
+    parser.add_argument('--audit', action='store_true', help='List outstanding issues from incremental state')
     
     args = parser.parse_args()
     
     validator = DataValidator()
     
-    if args.report_only:
+    if args.audit:
+        validator.audit()
+    elif args.report_only:
         date = args.date or (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
         report_file = f'/home/samsclaw/.openclaw/workspace/data/validation_report_{date}.json'
         if os.path.exists(report_file):
@@ -677,5 +678,7 @@ if __name__ == "__main__":
             validator.send_morning_report(report)
         else:
             print(f"No report found for {date}")
+    elif args.incremental or args.full:
+        validator.run_incremental(full=args.full)
     else:
         validator.run_validations(args.date)
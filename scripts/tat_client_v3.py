@@ -2,24 +2,80 @@
 """
 TAT v3 API Client - Updated for Formula Due Dates
 No manual due date calculation - Airtable handles it via formula
+
+Bulk operations:
+    python3 tat_client_v3.py import tasks.csv      # or .jsonl, 10 per request
+    python3 tat_client_v3.py export tasks.jsonl    # streamed page by page
 """
 
 import os
+import csv
+import sys
+import json
 import requests
 from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from airtable_client import AirtableClient
+from tat_index import get_tat_index
 
 AIRTABLE_KEY = open('/home/samsclaw/.config/airtable/api_key').read().strip()
 BASE_ID = "appvUbV8IeGhxmcPn"
 TABLE_ID = "tblkbuvkZUSpm1IgJ"
 
+CATEGORIES = ['1', '3', '7', '30']
+
+# Columns written by a CSV export (JSONL exports keep every field)
+EXPORT_FIELDS = ["Task Name", "Category", "Status", "Priority", "Date Created",
+                 "Due Date", "Completed Date", "Notes"]
+
+def task_fields(task_name, category, status="Not Started", notes=""):
+    """Validated Airtable fields for a new task (raises ValueError)"""
+    if not task_name or not str(task_name).strip():
+        raise ValueError("Task Name is required")
+    
+    category = str(category).strip()
+    if category not in CATEGORIES:
+        raise ValueError("Category must be 1, 3, 7, or 30")
+    
+    fields = {
+        "Task Name": str(task_name).strip(),
+        "Category": category,
+        "Status": status or "Not Started",
+    }
+    if notes:
+        fields["Notes"] = notes
+    return fields
+
+def read_task_rows(path):
+    """Rows from a CSV (header = field names) or JSONL file"""
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
 class TATClient:
-    def __init__(self):
+    def __init__(self, index=None):
         self.api_key = AIRTABLE_KEY
         self.base_url = f"https://api.airtable.com/v0/{BASE_ID}/{TABLE_ID}"
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.index = index or get_tat_index()
+        self._airtable = None
+    
+    @property
+    def airtable(self):
+        """Shared-session client for batched and paged requests"""
+        if self._airtable is None:
+            self._airtable = AirtableClient(self.api_key)
+        return self._airtable
     
     def add_task(self, task_name, category, status="Not Started", priority="Medium", notes="", tags=None):
         """
@@ -36,17 +92,7 @@ class TATClient:
         - tags: list of tags
         """
         
-        if not task_name or not task_name.strip():
-            raise ValueError("Task Name is required")
-        
-        if category not in ['1', '3', '7', '30']:
-            raise ValueError("Category must be 1, 3, 7, or 30")
-        
-        fields = {
-            "Task Name": task_name.strip(),
-            "Category": category,
-            "Status": status,
-        }
+        fields = task_fields(task_name, category, status, notes)
         
         # Only add optional fields if they exist in your table
         # Remove these lines if Priority/Tags fields don't exist yet
@@ -54,9 +100,6 @@ class TATClient:
         # if tags:
         #     fields["Tags"] = tags
         
-        if notes:
-            fields["Notes"] = notes
-        
         # Note: Due Date is NOT included - it's auto-calculated by formula
         # Due Date = DATEADD({Date Created}, VALUE({Category}), 'days')
         
@@ -68,6 +111,7 @@ class TATClient:
         
         if response.status_code == 200:
             result = response.json()
+            self.index.upsert([result])
             print(f"✅ TAT Task created: {task_name}")
             print(f"   Category: {category} days")
             print(f"   Status: {status}")
@@ -93,7 +137,9 @@ class TATClient:
         )
         
         if response.status_code == 200:
-            return response.json()
+            result = response.json()
+            self.index.upsert([result])
+            return result
         else:
             error_msg = response.json().get('error', {}).get('message', 'Unknown error')
             raise Exception(f"Failed to update task: {error_msg}")
@@ -138,14 +184,100 @@ class TATClient:
             return response.json().get('records', [])
         return []
 
+    # Bulk import / export
+    def import_tasks(self, path, skip_existing=True):
+        """Create tasks from a CSV or JSONL file, 10 per request
+        
+        Each row needs Task Name and Category; Status and Notes are
+        optional. With skip_existing, rows whose name matches an open task
+        (per the refreshed local index) are skipped.
+        
+        Returns {"created": [records], "skipped": [names], "errors": [(row, message)]}
+        """
+        existing = set()
+        if skip_existing:
+            self.refresh_index()
+            existing = self.index.names()
+        
+        to_create, skipped, errors = [], [], []
+        for row_number, row in enumerate(read_task_rows(path), start=1):
+            try:
+                fields = task_fields(row.get('Task Name'), row.get('Category', ''),
+                                     row.get('Status'), row.get('Notes', ''))
+            except ValueError as e:
+                errors.append((row_number, str(e)))
+                continue
+            name = fields["Task Name"].lower()
+            if name in existing:
+                skipped.append(fields["Task Name"])
+                continue
+            existing.add(name)
+            to_create.append(fields)
+        
+        created = []
+        for result in self.airtable.create_records(BASE_ID, TABLE_ID, to_create):
+            if 'error' in result:
+                errors.append((result['input']['fields']["Task Name"], result['error']))
+            else:
+                created.append(result)
+        self.index.upsert(created)
+        return {"created": created, "skipped": skipped, "errors": errors}
+    
+    def export_tasks(self, path, filter_formula=None):
+        """Stream tasks to a .csv or .jsonl file; returns the record count
+        
+        Records are written as each page arrives, and an unfiltered export
+        also refreshes the local index.
+        """
+        count = 0
+        as_csv = path.endswith('.csv')
+        with open(path, 'w', newline='') as f:
+            writer = None
+            if as_csv:
+                writer = csv.DictWriter(f, fieldnames=["id"] + EXPORT_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+            batch = []
+            for record in self.airtable.iter_records(BASE_ID, TABLE_ID, filter_formula=filter_formula):
+                if as_csv:
+                    writer.writerow({"id": record['id'], **record.get('fields', {})})
+                else:
+                    f.write(json.dumps({"id": record['id'], **record.get('fields', {})}) + '\n')
+                batch.append(record)
+                count += 1
+                if len(batch) >= 100:
+                    self.index.upsert(batch)
+                    batch = []
+            self.index.upsert(batch)
+        return count
+    
+    # Local index
+    def refresh_index(self, full=False):
+        """Bring the local task index up to date (incremental by default)"""
+        return self.index.refresh(self.airtable, full=full)
+
 # Convenience function for quick use
 def add_tat_task_v3(task_name, category, **kwargs):
     """Quick add TAT task with v3 structure"""
     client = TATClient()
     return client.add_task(task_name, category, **kwargs)
 
+def bulk_command(argv):
+    """import FILE [--all] | export FILE"""
+    client = TATClient()
+    command, path = argv[0], argv[1]
+    if command == 'import':
+        result = client.import_tasks(path, skip_existing='--all' not in argv)
+        print(f"✅ Imported {len(result['created'])} task(s), skipped {len(result['skipped'])} existing")
+        for row, message in result['errors']:
+            print(f"  ❌ {row}: {message}")
+    else:
+        count = client.export_tasks(path)
+        print(f"✅ Exported {count} task(s) to {path}")
+
 if __name__ == "__main__":
-    import sys
+    if len(sys.argv) >= 3 and sys.argv[1] in ('import', 'export'):
+        bulk_command(sys.argv[1:])
+        sys.exit(0)
     
     if len(sys.argv) < 3:
         print("TAT v3 - Formula Due Dates")
@@ -157,6 +289,9 @@ if __name__ == "__main__":
         print("  python3 tat_client_v3.py 'Research flights' 3 --priority High")
         print("  python3 tat_client_v3.py 'Quarterly review' 30 --notes 'Prepare slides'")
         print("")
+        print("  python3 tat_client_v3.py import backlog.csv [--all]")
+        print("  python3 tat_client_v3.py export tasks.jsonl")
+        print("")
         print("Categories: 1, 3, 7, 30 (days)")
         print("Due Date: Auto-calculated by Airtable formula")
         sys.exit(1)
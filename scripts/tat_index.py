@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+TAT Task Index
+Local copy of the TAT table's scheduling fields (name, status, category,
+priority, due date), indexed by Status, Category and Due Date and kept
+fresh incrementally: each refresh only fetches records modified since the
+last one, with a full listing once a day to drop deleted tasks.
+
+tat_reminders and the morning brief answer "what's overdue / due today"
+from here instead of filtering the whole table over the network.
+
+Usage:
+    python3 tat_index.py refresh [--full]
+    python3 tat_index.py due            # overdue + due today
+    python3 tat_index.py stats
+"""
+
+import os
+import json
+import time
+import bisect
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+from airtable_client import PRODUCTIVITY_BASE_ID
+from airtable_formula import quote
+
+INDEX_FILE = os.path.expanduser("~/.openclaw/workspace/data/tat_index.json")
+
+TAT_BASE_ID = PRODUCTIVITY_BASE_ID
+TAT_TABLE_ID = "tblkbuvkZUSpm1IgJ"
+
+INDEX_FIELDS = ["Task Name", "Status", "Category", "Priority", "Date Created", "Due Date"]
+OPEN_STATUSES = ("Not Started", "In Progress", "Blocked")
+
+# Full listing at least this often so deleted tasks fall out of the index
+FULL_REFRESH_INTERVAL = 24 * 3600
+
+# Re-read records modified this long before the watermark (clock skew)
+WATERMARK_SKEW = timedelta(minutes=2)
+
+
+def _indexed(fields: Dict) -> Dict:
+    return {f: fields[f] for f in INDEX_FIELDS if f in fields}
+
+
+def _today() -> str:
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+class TATIndex:
+    """record ID -> scheduling fields, with in-memory secondary indexes
+
+    Lookups reload the file only when another process has changed it;
+    writes hold an exclusive file lock.
+    """
+
+    def __init__(self, path: str = INDEX_FILE):
+        self.path = path
+        self.lock_file = f"{path}.lock"
+        self._lock = threading.RLock()
+        self._mtime = None
+        self._tasks: Dict[str, Dict] = {}
+        self._meta: Dict = {}
+        self._by_status: Dict[str, set] = {}
+        self._by_category: Dict[str, set] = {}
+        self._by_due: List[tuple] = []  # sorted (due date, record ID)
+
+    # Persistence
+    def _reload_if_changed(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            if self._mtime is not None:
+                self._tasks, self._meta, self._mtime = {}, {}, None
+                self._reindex()
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        self._tasks = data.get('tasks', {})
+        self._meta = data.get('meta', {})
+        self._mtime = mtime
+        self._reindex()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"meta": self._meta, "tasks": self._tasks}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    def _locked(self, fn):
+        """Run fn() on fresh in-memory state under the file lock, then save"""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+            with open(self.lock_file, 'a') as lock:
+                if HAS_FCNTL:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    self._reload_if_changed()
+                    result = fn()
+                    self._reindex()
+                    self._save()
+                    return result
+                finally:
+                    if HAS_FCNTL:
+                        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _reindex(self):
+        by_status: Dict[str, set] = {}
+        by_category: Dict[str, set] = {}
+        by_due = []
+        for record_id, fields in self._tasks.items():
+            by_status.setdefault(fields.get('Status') or '', set()).add(record_id)
+            by_category.setdefault(str(fields.get('Category') or ''), set()).add(record_id)
+            if fields.get('Due Date'):
+                by_due.append((fields['Due Date'][:10], record_id))
+        by_due.sort()
+        self._by_status, self._by_category, self._by_due = by_status, by_category, by_due
+
+    # Writes
+    def upsert(self, records: Iterable[Dict]):
+        """Index records returned by Airtable (create, update or list)"""
+        records = [r for r in records if 'id' in r and 'fields' in r]
+        if not records:
+            return
+
+        def add():
+            for record in records:
+                self._tasks[record['id']] = _indexed(record['fields'])
+        self._locked(add)
+
+    def remove(self, record_ids: Iterable[str]):
+        record_ids = list(record_ids)
+        if record_ids:
+            self._locked(lambda: [self._tasks.pop(rid, None) for rid in record_ids])
+
+    def refresh(self, client, full: bool = False) -> int:
+        """Pull changes from Airtable; returns the number of records fetched
+
+        Incremental unless full is set, there is no watermark yet, or the
+        last full listing is older than FULL_REFRESH_INTERVAL.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            watermark = self._meta.get('watermark')
+            last_full = self._meta.get('last_full', 0)
+        full = full or not watermark or time.time() - last_full > FULL_REFRESH_INTERVAL
+
+        started = datetime.now(timezone.utc)
+        formula = None
+        if not full:
+            since = datetime.fromisoformat(watermark) - WATERMARK_SKEW
+            formula = f"IS_AFTER(LAST_MODIFIED_TIME(), {quote(since.strftime('%Y-%m-%dT%H:%M:%SZ'))})"
+        records = list(client.iter_records(TAT_BASE_ID, TAT_TABLE_ID,
+                                           filter_formula=formula, fields=INDEX_FIELDS))
+
+        def apply():
+            if full:
+                self._tasks.clear()
+                self._meta['last_full'] = time.time()
+            for record in records:
+                self._tasks[record['id']] = _indexed(record.get('fields', {}))
+            self._meta['watermark'] = started.isoformat()
+        self._locked(apply)
+        return len(records)
+
+    # Lookups
+    def _records(self, record_ids: Iterable[str], today: Optional[str] = None) -> List[Dict]:
+        """Airtable-shaped records sorted by due date, with Days Remaining"""
+        today_date = datetime.strptime(today or _today(), '%Y-%m-%d')
+        records = []
+        for record_id in record_ids:
+            fields = dict(self._tasks[record_id])
+            due = fields.get('Due Date')
+            if due:
+                try:
+                    fields['Days Remaining'] = (datetime.strptime(due[:10], '%Y-%m-%d') - today_date).days
+                except ValueError:
+                    pass
+            records.append({"id": record_id, "fields": fields})
+        records.sort(key=lambda r: (r['fields'].get('Due Date') or '9999', r['fields'].get('Task Name', '')))
+        return records
+
+    def by_status(self, *statuses: str) -> List[Dict]:
+        with self._lock:
+            self._reload_if_changed()
+            ids = set().union(*(self._by_status.get(s, set()) for s in statuses))
+            return self._records(ids)
+
+    def open_tasks(self) -> List[Dict]:
+        return self.by_status(*OPEN_STATUSES)
+
+    def by_category(self, category: str, open_only: bool = True) -> List[Dict]:
+        with self._lock:
+            self._reload_if_changed()
+            ids = self._by_category.get(str(category), set())
+            if open_only:
+                ids = ids & set().union(*(self._by_status.get(s, set()) for s in OPEN_STATUSES))
+            return self._records(ids)
+
+    def due_between(self, start: Optional[str], end: Optional[str],
+                    open_only: bool = True, today: Optional[str] = None) -> List[Dict]:
+        """Tasks with start <= Due Date <= end (None = unbounded)"""
+        with self._lock:
+            self._reload_if_changed()
+            lo = bisect.bisect_left(self._by_due, (start,)) if start else 0
+            hi = bisect.bisect_right(self._by_due, (end, '\uffff')) if end else len(self._by_due)
+            ids = [rid for _, rid in self._by_due[lo:hi]]
+            if open_only:
+                ids = [rid for rid in ids if self._tasks[rid].get('Status') in OPEN_STATUSES]
+            return self._records(ids, today)
+
+    def overdue(self, today: Optional[str] = None) -> List[Dict]:
+        today = today or _today()
+        yesterday = (datetime.strptime(today, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+        return self.due_between(None, yesterday, today=today)
+
+    def due_today(self, today: Optional[str] = None) -> List[Dict]:
+        today = today or _today()
+        return self.due_between(today, today, today=today)
+
+    def names(self, open_only: bool = True) -> set:
+        """Lowercased task names (for skipping duplicates on import)"""
+        with self._lock:
+            self._reload_if_changed()
+            return {(f.get('Task Name') or '').strip().lower()
+                    for f in self._tasks.values()
+                    if not open_only or f.get('Status') in OPEN_STATUSES}
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._reload_if_changed()
+            return {
+                "tasks": len(self._tasks),
+                "by_status": {s: len(ids) for s, ids in sorted(self._by_status.items())},
+                "by_category": {c: len(ids) for c, ids in sorted(self._by_category.items())},
+                "watermark": self._meta.get('watermark'),
+            }
+
+
+_default_index: Optional[TATIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_tat_index() -> TATIndex:
+    """Process-wide TAT index"""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = TATIndex()
+        return _default_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local TAT task index")
+    sub = parser.add_subparsers(dest='command', required=True)
+    refresh = sub.add_parser('refresh', help="pull changes from Airtable")
+    refresh.add_argument('--full', action='store_true', help="re-list the whole table")
+    sub.add_parser('due', help="overdue and due-today tasks")
+    sub.add_parser('stats', help="index size by status and category")
+    args = parser.parse_args()
+
+    index = get_tat_index()
+    if args.command == 'refresh':
+        from airtable_client import AirtableClient
+        count = index.refresh(AirtableClient(), full=args.full)
+        print(f"✅ Refreshed TAT index ({count} record(s) fetched)")
+    elif args.command == 'due':
+        for label, tasks in (("🔴 Overdue", index.overdue()), ("🟠 Due today", index.due_today())):
+            print(f"{label} ({len(tasks)})")
+            for task in tasks:
+                fields = task['fields']
+                print(f"  • {fields.get('Task Name', 'Unnamed')} (due {fields.get('Due Date', '?')})")
+    else:
+        print(json.dumps(index.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
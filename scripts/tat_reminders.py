@@ -2,6 +2,11 @@
 """
 TAT Reminder System - Cron Jobs for Overdue/Upcoming Tasks
 Runs at 9am daily or triggered manually
+
+tat_scheduler.py sends due-today and overdue reminders as tasks cross their
+deadlines. Both share its state file: tasks the scheduler has already
+announced are only counted here, and tasks announced here are marked so
+the scheduler doesn't repeat them.
 """
 
 import sys
@@ -32,28 +37,64 @@ def send_notification(message):
     # Always print
     print(message)
 
+def load_task_index(client):
+    """Refresh the local TAT index (only changed records are fetched)"""
+    try:
+        client.refresh_index()
+    except Exception as e:
+        print(f"⚠️ Could not refresh TAT index, using local copy: {e}")
+    return client.index
+
+def unannounced(tasks, kind):
+    """Split tasks into (not yet reminded about, already reminded) for kind
+
+    Uses the reminder state shared with tat_scheduler.py.
+    """
+    # Imported here: tat_scheduler imports send_notification from this module
+    from tat_scheduler import load_fired, already_fired
+    fired = load_fired()
+    new, seen = [], []
+    for task in tasks:
+        due = (task.get('fields', {}).get('Due Date') or '')[:10]
+        (seen if already_fired(fired, task['id'], kind, due) else new).append(task)
+    return new, seen
+
+def mark_announced(tasks, kind):
+    """Record reminders sent here so tat_scheduler.py doesn't repeat them"""
+    from tat_scheduler import record_fired, DUE_TODAY, OVERDUE
+    sent = {}
+    for task in tasks:
+        due = (task.get('fields', {}).get('Due Date') or '')[:10]
+        # Like the scheduler: an overdue reminder covers the due-today one
+        kinds = [DUE_TODAY, OVERDUE] if kind == OVERDUE else [kind]
+        sent[task['id']] = {k: due for k in kinds}
+    if sent:
+        record_fired(sent)
+
 def check_tat_reminders():
     """Check for overdue and due-soon TAT tasks"""
+    from tat_scheduler import DUE_TODAY, OVERDUE
     client = TATClient()
+    index = load_task_index(client)
     
     messages = []
     messages.append("📋 <b>TAT Task Reminder</b>\n")
     
-    # Get overdue tasks
-    overdue = client.get_overdue_tasks()
+    # Get overdue tasks (only those no reminder has covered yet)
+    overdue, overdue_seen = unannounced(index.overdue(), OVERDUE)
     if overdue:
         messages.append(f"🔴 <b>OVERDUE ({len(overdue)} tasks):</b>")
         for task in overdue[:5]:  # Show max 5
             fields = task.get('fields', {})
             name = fields.get('Task Name', 'Unnamed')
-            days = fields.get('Days Remaining', '??')
+            days = -fields['Days Remaining'] if 'Days Remaining' in fields else '??'
             messages.append(f"  • {name} ({days} days overdue)")
         if len(overdue) > 5:
             messages.append(f"  ... and {len(overdue) - 5} more")
         messages.append("")
     
     # Get tasks due today
-    due_today = client.get_tasks_due_today()
+    due_today, due_today_seen = unannounced(index.due_today(), DUE_TODAY)
     if due_today:
         messages.append(f"🟠 <b>DUE TODAY ({len(due_today)} tasks):</b>")
         for task in due_today[:5]:
@@ -65,9 +106,14 @@ def check_tat_reminders():
             messages.append(f"  ... and {len(due_today) - 5} more")
         messages.append("")
     
+    already = len(overdue_seen) + len(due_today_seen)
+    if already:
+        messages.append(f"🔔 {len(overdue_seen)} overdue, {len(due_today_seen)} due today (already reminded)")
+        messages.append("")
+    
     # Get pending tasks summary
-    pending = client.get_pending_tasks()
-    if not overdue and not due_today and pending:
+    pending = index.open_tasks()
+    if not overdue and not due_today and not already and pending:
         messages.append(f"✅ <b>No urgent tasks!</b>")
         messages.append(f"   You have {len(pending)} pending tasks, none overdue.")
     elif not pending:
@@ -76,19 +122,25 @@ def check_tat_reminders():
     # Send consolidated message
     full_message = "\n".join(messages)
     send_notification(full_message)
+    mark_announced(overdue, OVERDUE)
+    mark_announced(due_today, DUE_TODAY)
     
     return {
-        'overdue': len(overdue),
-        'due_today': len(due_today),
+        'overdue': len(overdue) + len(overdue_seen),
+        'due_today': len(due_today) + len(due_today_seen),
         'pending': len(pending)
     }
 
 def urgent_check():
-    """Quick check for only overdue + due today - for frequent reminders"""
-    client = TATClient()
+    """Quick check for only overdue + due today - for frequent reminders
+    
+    Only tasks no reminder has covered yet (see tat_scheduler.py).
+    """
+    from tat_scheduler import DUE_TODAY, OVERDUE
+    index = load_task_index(TATClient())
     
-    overdue = client.get_overdue_tasks()
-    due_today = client.get_tasks_due_today()
+    overdue, _ = unannounced(index.overdue(), OVERDUE)
+    due_today, _ = unannounced(index.due_today(), DUE_TODAY)
     
     if overdue or due_today:
         messages = ["⏰ <b>TAT Urgent Tasks:</b>\n"]
@@ -99,6 +151,8 @@ def urgent_check():
             messages.append(f"🟠 {len(due_today)} due today")
         
         send_notification("\n".join(messages))
+        mark_announced(overdue, OVERDUE)
+        mark_announced(due_today, DUE_TODAY)
         return True
     
     return False
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+TAT Reminder Scheduler - Long-running replacement for cron polling
+Keeps every open task's next threshold (due today, then overdue) in a
+min-heap and sleeps until the earliest one, so reminders go out at the
+moment a task crosses its TAT deadline.
+
+Task changes come from the local TAT index: every POLL_INTERVAL the index
+pulls only records modified since the last refresh, and the scheduler
+re-queues tasks whose status or due date changed. Thresholds that fall in
+quiet hours are held until QUIET_END. Fired reminders are recorded in a
+state file shared with tat_reminders.py, so neither a restart nor the daily
+digest repeats them.
+
+Started at boot from crontab (see crontab-complete.txt); flock keeps a
+single instance and the periodic entry restarts it if it dies.
+
+Usage:
+    python3 tat_scheduler.py              # run until interrupted
+    python3 tat_scheduler.py --poll 120   # check for task changes every 2 min
+    python3 tat_scheduler.py --list       # show upcoming reminders and exit
+"""
+
+import os
+import sys
+import json
+import heapq
+import signal
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+sys.path.insert(0, '/home/samsclaw/.openclaw/workspace/scripts')
+
+from tat_client_v3 import TATClient
+from tat_index import get_tat_index, OPEN_STATUSES
+from tat_reminders import send_notification
+
+STATE_FILE = os.path.expanduser("~/.openclaw/workspace/data/tat_scheduler_state.json")
+
+# Seconds between incremental index refreshes
+POLL_INTERVAL = 5 * 60
+
+# No notifications between QUIET_START and QUIET_END (local hours)
+QUIET_START = 22
+QUIET_END = 8
+
+DUE_TODAY = 'due_today'
+OVERDUE = 'overdue'
+
+
+@contextmanager
+def _state_lock(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock:
+        if HAS_FCNTL:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if HAS_FCNTL:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def load_fired(path: str = STATE_FILE) -> Dict[str, Dict[str, str]]:
+    """record ID -> {kind: due date} for every reminder already sent"""
+    try:
+        with open(path) as f:
+            return json.load(f).get('fired', {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def record_fired(fired: Dict[str, Dict[str, str]], open_ids: Optional[Iterable[str]] = None,
+                 path: str = STATE_FILE) -> Dict[str, Dict[str, str]]:
+    """Merge sent reminders into the shared state file; returns the merged state
+
+    Both the scheduler and tat_reminders write here, so the file is re-read
+    under a lock rather than overwritten. open_ids: forget every other task.
+    """
+    with _state_lock(path):
+        merged = load_fired(path)
+        for record_id, kinds in fired.items():
+            merged.setdefault(record_id, {}).update(kinds)
+        if open_ids is not None:
+            open_ids = set(open_ids)
+            merged = {rid: kinds for rid, kinds in merged.items() if rid in open_ids}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"fired": merged}, f)
+        os.replace(tmp_path, path)
+    return merged
+
+
+def already_fired(fired: Dict[str, Dict[str, str]], record_id: str, kind: str, due: str) -> bool:
+    return fired.get(record_id, {}).get(kind) == due
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value[:10], '%Y-%m-%d') if value else None
+    except ValueError:
+        return None
+
+
+def outside_quiet_hours(when: datetime) -> datetime:
+    """Same moment, or QUIET_END if it falls in quiet hours"""
+    if when.hour >= QUIET_START:
+        return (when + timedelta(days=1)).replace(hour=QUIET_END, minute=0, second=0, microsecond=0)
+    if when.hour < QUIET_END:
+        return when.replace(hour=QUIET_END, minute=0, second=0, microsecond=0)
+    return when
+
+
+def thresholds(due: datetime) -> List[Tuple[datetime, str]]:
+    """(fire time, kind) for a due date: the day it is due, the day after"""
+    return [(outside_quiet_hours(due), DUE_TODAY),
+            (outside_quiet_hours(due + timedelta(days=1)), OVERDUE)]
+
+
+class TATScheduler:
+    """Min-heap of (fire time, record ID, kind, due date) for open tasks
+
+    Heap entries are never removed in place; an entry whose task has since
+    closed or moved to a different due date is skipped when popped.
+    """
+
+    def __init__(self, client, index=None, state_path: str = STATE_FILE,
+                 poll_interval: int = POLL_INTERVAL):
+        self.client = client
+        self.index = index or get_tat_index()
+        self.state_path = state_path
+        self.poll_interval = poll_interval
+        self._heap: List[Tuple[datetime, str, str, str]] = []
+        self._tasks: Dict[str, Dict] = {}  # open tasks as last seen
+        self._fired = load_fired(state_path)  # record ID -> {kind: due date}
+        self._stop = threading.Event()
+
+    # Task changes
+    def sync_tasks(self) -> int:
+        """Refresh the index and queue thresholds for new or changed tasks
+
+        Returns the number of tasks (re)scheduled.
+        """
+        try:
+            self.index.refresh(self.client)
+        except Exception as e:
+            print(f"⚠️ TAT index refresh failed, using local copy: {e}")
+
+        current = {t['id']: t['fields'] for t in self.index.by_status(*OPEN_STATUSES)}
+        changed = 0
+        for record_id, fields in current.items():
+            previous = self._tasks.get(record_id)
+            if previous and previous.get('Due Date') == fields.get('Due Date'):
+                continue
+            due = _parse_date(fields.get('Due Date'))
+            if due is None:
+                continue
+            for fire_at, kind in thresholds(due):
+                heapq.heappush(self._heap, (fire_at, record_id, kind, fields['Due Date'][:10]))
+            changed += 1
+        self._tasks = current
+        return changed
+
+    def _is_current(self, record_id: str, kind: str, due: str) -> bool:
+        fields = self._tasks.get(record_id)
+        if not fields or (fields.get('Due Date') or '')[:10] != due:
+            return False  # closed, deleted or rescheduled since it was queued
+        return not already_fired(self._fired, record_id, kind, due)
+
+    def next_fire_time(self) -> Optional[datetime]:
+        while self._heap and not self._is_current(*self._heap[0][1:]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    # Firing
+    def fire_due(self, now: Optional[datetime] = None) -> List[Tuple[str, str]]:
+        """Send one notification for every threshold reached by now"""
+        now = now or datetime.now()
+        if not (self._heap and self._heap[0][0] <= now):
+            return []
+        # Pick up reminders tat_reminders sent since the last check
+        self._fired = load_fired(self.state_path)
+        sent: Dict[str, Dict[str, str]] = {}
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, record_id, kind, due = heapq.heappop(self._heap)
+            if not self._is_current(record_id, kind, due):
+                continue
+            # An overdue reminder supersedes a due-today one not yet sent
+            sent.setdefault(record_id, {})[kind] = due
+            self._fired.setdefault(record_id, {})[kind] = due
+            if kind == OVERDUE:
+                fired = [(rid, k) for rid, k in fired if rid != record_id]
+                sent[record_id][DUE_TODAY] = due
+                self._fired[record_id][DUE_TODAY] = due
+            fired.append((record_id, kind))
+
+        if fired:
+            self._notify(fired, now)
+            # Forget tasks that are no longer open
+            self._fired = record_fired(sent, self._tasks, self.state_path)
+        return fired
+
+    def _notify(self, fired: List[Tuple[str, str]], now: datetime):
+        overdue = [rid for rid, kind in fired if kind == OVERDUE]
+        due_today = [rid for rid, kind in fired if kind == DUE_TODAY]
+        messages = ["⏰ <b>TAT Reminder</b>\n"]
+        if overdue:
+            messages.append(f"🔴 <b>Now overdue ({len(overdue)}):</b>")
+            for rid in overdue:
+                fields = self._tasks[rid]
+                days = (now - _parse_date(fields['Due Date'])).days
+                messages.append(f"  • {fields.get('Task Name', 'Unnamed')} ({days} day(s) overdue)")
+        if due_today:
+            messages.append(f"🟠 <b>Due today ({len(due_today)}):</b>")
+            for rid in due_today:
+                fields = self._tasks[rid]
+                messages.append(f"  • {fields.get('Task Name', 'Unnamed')} ({fields.get('Priority', 'Medium')})")
+        send_notification("\n".join(messages))
+
+    # Main loop
+    def run(self):
+        next_poll = datetime.now()
+        while not self._stop.is_set():
+            now = datetime.now()
+            if now >= next_poll:
+                self.sync_tasks()
+                next_poll = now + timedelta(seconds=self.poll_interval)
+            self.fire_due()
+
+            wake = next_poll
+            next_fire = self.next_fire_time()
+            if next_fire and next_fire < wake:
+                wake = next_fire
+            self._stop.wait(max((wake - datetime.now()).total_seconds(), 1))
+
+    def stop(self):
+        self._stop.set()
+
+    def upcoming(self) -> List[Tuple[datetime, str, str]]:
+        """(fire time, task name, kind) for every pending reminder"""
+        return [(fire_at, self._tasks[rid].get('Task Name', 'Unnamed'), kind)
+                for fire_at, rid, kind, due in sorted(self._heap)
+                if self._is_current(rid, kind, due)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Event-driven TAT reminders')
+    parser.add_argument('--poll', type=int, default=POLL_INTERVAL,
+                        help='seconds between checks for task changes')
+    parser.add_argument('--list', action='store_true', help='show upcoming reminders and exit')
+    args = parser.parse_args()
+
+    client = TATClient()
+    scheduler = TATScheduler(client.airtable, client.index, poll_interval=args.poll)
+
+    if args.list:
+        scheduler.sync_tasks()
+        for fire_at, name, kind in scheduler.upcoming():
+            print(f"{fire_at:%Y-%m-%d %H:%M}  {kind:<9}  {name}")
+        return
+
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    print(f"⏰ TAT scheduler running (checking for changes every {args.poll}s)")
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        pass
+    print("⏹️ TAT scheduler stopped")
+
+
+if __name__ == "__main__":
+    main()
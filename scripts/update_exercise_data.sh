@@ -6,11 +6,9 @@ WORKSPACE="/home/samsclaw/.openclaw/workspace"
 # Update exercise data
 python3 "$WORKSPACE/scripts/fetch_exercise_data.py" 2>/dev/null || echo "Failed to fetch exercise data"
 
-# Update productivity data (TAT tasks + habits)
-python3 "$WORKSPACE/scripts/fetch_productivity_data.py" 2>/dev/null || echo "Failed to fetch productivity data"
-
-# Update timeline data (7-day view)
-python3 "$WORKSPACE/scripts/fetch_timeline_data.py" 2>/dev/null || echo "Failed to fetch timeline data"
+# Update productivity, timeline, overview, trend and mission control data
+# from a single Airtable snapshot
+python3 "$WORKSPACE/scripts/dashboard_snapshot.py" 2>/dev/null || echo "Failed to build dashboard snapshot"
 
 # Update daily nutrition data (meals + macros for last 7 days)
 python3 "$WORKSPACE/scripts/fetch_daily_nutrition.py" 2>/dev/null || echo "Failed to fetch daily nutrition data"
@@ -4,73 +4,49 @@ Update Notion Habit Tracker from natural language
 Parses habit updates and updates Notion database
 """
 
-import os
 import re
-import requests
+import sys
 from datetime import datetime
+from pathlib import Path
 
-NOTION_API_KEY = os.getenv('NOTION_API_KEY')
-if not NOTION_API_KEY:
-    try:
-        with open(os.path.expanduser('~/.config/notion/api_key'), 'r') as f:
-            NOTION_API_KEY = f.read().strip()
-    except FileNotFoundError:
-        print("❌ Notion API key not found")
-        exit(1)
+sys.path.insert(0, str(Path(__file__).parent))
 
-# Tracker Database ID
-TRACKER_DB_ID = "2fdf2cb1-2276-819a-b352-000b8c4ff0be"
+from notion_client import NotionAPIError, NOTION_VERSION_DATA_SOURCES, get_notion_client
 
-HEADERS = {
-    "Authorization": f"Bearer {NOTION_API_KEY}",
-    "Notion-Version": "2025-09-03",
-    "Content-Type": "application/json"
-}
+try:
+    client = get_notion_client(NOTION_VERSION_DATA_SOURCES)
+except ValueError:
+    print("❌ Notion API key not found")
+    exit(1)
+
+# Tracker Data Source ID
+TRACKER_DB_ID = "2fdf2cb1-2276-819a-b352-000b8c4ff0be"
 
 def get_or_create_todays_entry():
     """Get today's entry or create if not exists"""
     today = datetime.now().strftime('%Y-%m-%d')
     
-    # Search for today's entry
-    url = f"https://api.notion.com/v1/data_sources/{TRACKER_DB_ID}/query"
-    payload = {
-        "filter": {
-            "property": "Date",
-            "date": {
-                "equals": today
-            }
-        }
-    }
-    
-    response = requests.post(url, headers=HEADERS, json=payload)
-    
-    if response.status_code == 200:
-        data = response.json()
-        results = data.get('results', [])
-        
+    try:
+        # Search for today's entry
+        results = list(client.iter_data_source(
+            TRACKER_DB_ID,
+            filter={"property": "Date", "date": {"equals": today}},
+            limit=1
+        ))
         if results:
             return results[0]['id']
-        else:
-            # Create new entry for today
-            create_url = "https://api.notion.com/v1/pages"
-            create_payload = {
-                "parent": {"database_id": TRACKER_DB_ID},
-                "properties": {
-                    "Name": {"title": [{"text": {"content": f"Day Entry - {today}"}}]},
-                    "Date": {"date": {"start": today}}
-                }
-            }
-            
-            create_response = requests.post(create_url, headers=HEADERS, json=create_payload)
-            if create_response.status_code == 200:
-                return create_response.json()['id']
-    
-    return None
+        
+        # Create new entry for today
+        page = client.create_page({
+            "Name": {"title": [{"text": {"content": f"Day Entry - {today}"}}]},
+            "Date": {"date": {"start": today}}
+        }, data_source_id=TRACKER_DB_ID)
+        return page['id']
+    except NotionAPIError:
+        return None
 
 def update_habit(page_id, habit_type, value=None):
     """Update a specific habit"""
-    url = f"https://api.notion.com/v1/pages/{page_id}"
-    
     properties = {}
     
     if habit_type == 'water':
@@ -86,9 +62,11 @@ def update_habit(page_id, habit_type, value=None):
     elif habit_type == 'creatine':
         properties['Creatine'] = {"checkbox": True}
     
-    response = requests.patch(url, headers=HEADERS, json={"properties": properties})
-    
-    return response.status_code == 200
+    try:
+        client.update_page(page_id, properties)
+        return True
+    except NotionAPIError:
+        return False
 
 def parse_and_update(text):
     """Parse natural language and update Notion"""
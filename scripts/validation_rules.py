@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Validation Rules
+Declarative record checks for overnight_data_validation.py.
+
+Each rule is data - (field, test, severity, message) - and a RuleSet
+runs every rule on a record in a single pass over the records, with
+presence and type checks evaluated inline rather than called. Severity is
+fixed when the rule is declared rather than guessed from the message text.
+
+Benchmark: python3 benchmark_validation.py
+"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+SEVERE = 'severe'
+MINOR = 'minor'
+WARNING = 'warnings'
+
+
+class _Missing:
+    """Value of a field the record doesn't have (falsy, unlike object())"""
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+NUMBER = (int, float)
+
+# callable(value, fields) -> True when the record breaks the rule. Tests
+# other than the presence ones are only called for set (non-None) values.
+Test = Callable[[Any, Dict], bool]
+# message: str.format template ({id}, {value}, {type}, {fields}) or
+# callable(value, fields, record_id) -> str
+Message = Union[str, Callable[[Any, Dict, str], str]]
+
+
+class Rule:
+    """One check on one field of a record"""
+
+    __slots__ = ('field', 'test', 'severity', 'message', 'missing')
+
+    def __init__(self, field: str, test: Test, severity: str, message: Message,
+                 missing: bool = False):
+        self.field = field
+        self.test = test
+        self.severity = severity
+        self.message = message
+        self.missing = missing  # counts towards the missing-fields total
+
+    def format(self, value: Any, fields: Dict, record_id: str) -> str:
+        if callable(self.message):
+            return self.message(value, fields, record_id)
+        return self.message.format(id=record_id, value=value, type=type(value), fields=fields)
+
+
+class RuleSet:
+    """Rules sorted by kind of test, checking each record in one pass
+
+    Presence tests (absent, blank, falsy) and type tests (wrong_type) are
+    plain data to the run loop, which evaluates them inline. Any other test
+    is called with the value, and only when the value is set - every such
+    test passes on a missing or None value.
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules = list(rules)
+        self._absent: List[Tuple[str, Rule]] = []
+        self._blank: List[Tuple[str, Rule]] = []
+        self._falsy: List[Tuple[str, Rule]] = []
+        self._types: List[Tuple[str, tuple, Rule]] = []
+        by_field: Dict[str, List[Tuple[Test, Rule]]] = {}
+        for rule in self.rules:
+            test = rule.test
+            if test is absent:
+                self._absent.append((rule.field, rule))
+            elif test is blank:
+                self._blank.append((rule.field, rule))
+            elif test is falsy:
+                self._falsy.append((rule.field, rule))
+            elif isinstance(test, wrong_type):
+                self._types.append((rule.field, test.types, rule))
+            else:
+                by_field.setdefault(rule.field, []).append((test, rule))
+        self._checks = list(by_field.items())
+        self._required = frozenset(name for name, _ in self._absent)
+
+    def run(self, records: Iterable[Dict], log,
+            on_record: Optional[Callable[[Dict], None]] = None) -> int:
+        """Check every record into log (an IssueLog); returns missing-field count
+
+        on_record is called for each record in the same pass, so callers can
+        build per-day groups for duplicate and total checks without walking
+        the records again.
+        """
+        add = log.add
+        absent_rules, blank_rules, falsy_rules = self._absent, self._blank, self._falsy
+        required = self._required
+        type_rules, checks = self._types, self._checks
+        broken = []
+        missing = 0
+        for record in records:
+            f = record.get('fields', {})
+            if not f.keys() >= required:
+                for name, rule in absent_rules:
+                    if name not in f:
+                        broken.append((rule, MISSING))
+            for name, rule in blank_rules:
+                v = f.get(name)
+                if v is None or v == '':
+                    broken.append((rule, f.get(name, MISSING)))
+            for name, rule in falsy_rules:
+                v = f.get(name)
+                if not v:
+                    broken.append((rule, f.get(name, MISSING)))
+            for name, types, rule in type_rules:
+                v = f.get(name)
+                if v is not None and not isinstance(v, types):
+                    broken.append((rule, v))
+            for name, field_checks in checks:
+                v = f.get(name)
+                if v is not None:
+                    for test, rule in field_checks:
+                        if test(v, f):
+                            broken.append((rule, v))
+            if broken:
+                rid = record['id']
+                for rule, v in broken:
+                    add(rid, rule.severity, rule.format(v, f, rid[:10]))
+                    if rule.missing:
+                        missing += 1
+                broken.clear()
+            if on_record is not None:
+                on_record(record)
+        return missing
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+def blank(v, f):
+    """Absent, None or empty string"""
+    return v is MISSING or v is None or v == ''
+
+
+def falsy(v, f):
+    return not v
+
+
+def absent(v, f):
+    return v is MISSING
+
+
+class wrong_type:
+    """Set but not an instance of types"""
+
+    def __init__(self, types):
+        self.types = types
+
+    def __call__(self, v, f):
+        return v is not MISSING and v is not None and not isinstance(v, self.types)
+
+
+not_number = wrong_type(NUMBER)
+not_bool = wrong_type(bool)
+
+
+def one_of(allowed) -> Test:
+    """Set but not one of the allowed values"""
+    allowed = tuple(allowed)
+    return lambda v, f: bool(v) and v not in allowed
+
+
+def number_where(condition: Callable[[Any], bool]) -> Test:
+    """Numeric and condition(value) holds"""
+    return lambda v, f: isinstance(v, NUMBER) and condition(v)
+
+
+@lru_cache(maxsize=4096)
+def _is_iso_date(value: str) -> bool:
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+        return True
+    except ValueError:
+        return False
+
+
+def bad_date(v, f):
+    """Set but not a YYYY-MM-DD date"""
+    return bool(v) and not (isinstance(v, str) and _is_iso_date(v))
+
+
+# ---------------------------------------------------------------------------
+# Table rules
+# ---------------------------------------------------------------------------
+
+MEAL_TYPES = ['Breakfast', 'Lunch', 'Dinner', 'Snack']
+TAT_CATEGORIES = ['1', '3', '7', '30']
+TAT_STATUSES = ['Not Started', 'In Progress', 'Blocked', 'Complete', 'Cancelled']
+HABIT_CHECKBOXES = ['Multivitamin', 'Fruit', 'Exercise', 'Creatine']
+
+
+def required(fields: Dict[str, str], test: Test = blank) -> List[Rule]:
+    return [Rule(name, test, SEVERE,
+                 f"SEVERE: Record {{id}}: Missing required field '{name}' ({description})",
+                 missing=True)
+            for name, description in fields.items()]
+
+
+def optional(fields: Dict[str, str], test: Test, label: str) -> List[Rule]:
+    return [Rule(name, test, MINOR,
+                 f"MINOR: Record {{id}}: Missing {label} '{name}' ({description})",
+                 missing=True)
+            for name, description in fields.items()]
+
+
+FOOD_REQUIRED = {
+    'Date': 'Date of meal',
+    'Meal Type': 'Type of meal (Breakfast/Lunch/Dinner/Snack)',
+    'Food Items': 'Description of food consumed',
+    'Calories': 'Calorie count'
+}
+
+FOOD_OPTIONAL = {
+    'Protein (g)': 'Protein content',
+    'Carbs (g)': 'Carbohydrate content',
+    'Fat (g)': 'Fat content',
+    'Edamam Data': 'Whether data came from Edamam API'
+}
+
+FOOD_RULES = RuleSet(
+    required(FOOD_REQUIRED)
+    + optional(FOOD_OPTIONAL, blank, 'optional field')
+    + [
+        Rule('Meal Type', one_of(MEAL_TYPES), SEVERE,
+             "SEVERE: Record {id}: Invalid Meal Type '{value}'"),
+        Rule('Calories', not_number, SEVERE,
+             "SEVERE: Record {id}: Calories must be numeric, got {type}"),
+        Rule('Calories', number_where(lambda v: v < 0), SEVERE,
+             "SEVERE: Record {id}: Calories cannot be negative ({value})"),
+        Rule('Calories', number_where(lambda v: v == 0), WARNING,
+             "⚠️ Record {id}: Calories is 0 - verify this is correct"),
+        Rule('Date', bad_date, SEVERE,
+             "SEVERE: Record {id}: Invalid Date format '{value}' (expected YYYY-MM-DD)"),
+        Rule('Edamam Data', lambda v, f: bool(v) and not f.get('Protein (g)'), MINOR,
+             "MINOR: Record {id}: Edamam Data=True but missing protein - incomplete nutrition"),
+    ]
+)
+
+HABIT_REQUIRED = {
+    'Date': 'Date of habit tracking'
+}
+
+HABIT_OPTIONAL = {
+    'Multivitamin': 'Multivitamin taken (checkbox)',
+    'Fruit': 'Fruit consumed (checkbox)',
+    'Exercise': 'Exercise completed (checkbox)',
+    'Creatine': 'Creatine taken (checkbox)',
+    'Water': 'Water intake (number of glasses)'
+}
+
+HABIT_RULES = RuleSet(
+    required(HABIT_REQUIRED, falsy)
+    + optional(HABIT_OPTIONAL, absent, 'field')
+    + [
+        Rule('Water', not_number, SEVERE,
+             "SEVERE: Record {id}: Water must be numeric, got {type}"),
+        Rule('Water', number_where(lambda v: v < 0 or v > 20), WARNING,
+             "⚠️ Record {id}: Water value ({value}) seems unusual"),
+    ]
+    + [Rule(name, not_bool, SEVERE,
+            f"SEVERE: Record {{id}}: {name} should be boolean (checkbox), got {{type}}")
+       for name in HABIT_CHECKBOXES]
+)
+
+TAT_REQUIRED = {
+    'Task Name': 'Description of the task',
+    'Category': 'TAT category (1/3/7/30 days)',
+    'Status': 'Current status of the task'
+}
+
+TAT_OPTIONAL = {
+    'Priority': 'Task priority level',
+    'Notes': 'Additional notes',
+    'Tags': 'Task tags'
+}
+
+
+def _due_date_error(value, fields):
+    """Due Date off from Date Created + Category by more than a day"""
+    created, category = fields.get('Date Created'), fields.get('Category')
+    if not (value and created and category):
+        return None
+    try:
+        expected = datetime.fromisoformat(created.replace('Z', '+00:00')) + timedelta(days=int(category))
+        actual = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return (expected, actual) if abs((expected - actual).days) > 1 else None
+
+
+def _due_date_message(value, fields, record_id):
+    expected, actual = _due_date_error(value, fields)
+    return (f"SEVERE: Record {record_id}: Due Date formula error - "
+            f"expected {expected.date()}, got {actual.date()}")
+
+
+TAT_RULES = RuleSet(
+    required(TAT_REQUIRED, falsy)
+    + optional(TAT_OPTIONAL, absent, 'field')
+    + [
+        Rule('Category', one_of(TAT_CATEGORIES), SEVERE,
+             "SEVERE: Record {id}: Invalid Category '{value}' (must be 1, 3, 7, or 30)"),
+        Rule('Status', one_of(TAT_STATUSES), SEVERE,
+             "SEVERE: Record {id}: Invalid Status '{value}' "
+             f"(must be one of: {', '.join(TAT_STATUSES)})"),
+        Rule('Due Date', lambda v, f: _due_date_error(v, f) is not None, SEVERE,
+             _due_date_message),
+        Rule('Days Remaining',
+             lambda v, f: (isinstance(v, NUMBER) and v < 0
+                           and f.get('Status', '') not in ('Complete', 'Cancelled')),
+             WARNING,
+             lambda v, f, record_id: (f"⚠️ Record {record_id}: Task overdue ({v} days) "
+                                      f"with status '{f.get('Status', '')}'")),
+    ]
+)
@@ -5,7 +5,13 @@ Water Tracker - Daily hydration goal with reminders
 
 import json
 import os
+import sys
 from datetime import datetime, date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from change_journal import get_journal
 
 STATE_FILE = "/home/samsclaw/.openclaw/workspace/data/water_tracker.json"
 
@@ -44,6 +50,8 @@ def add_water(glasses=1):
         'glasses': glasses
     })
     save_state(state)
+    # Queue the new total for the Airtable sync, which only ever raises Water
+    get_journal().set_habits({'Water': state['glasses']}, state['date'])
     return state
 
 def get_status():
@@ -18,7 +18,7 @@ from flask import Flask, request, jsonify
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / 'scripts'))
 
 try:
-    from airtable_client import get_health_client
+    from airtable_client import get_health_client, get_pool_stats
     AIRTABLE_AVAILABLE = True
 except ImportError:
     AIRTABLE_AVAILABLE = False
@@ -363,6 +363,7 @@ def health_check():
         'webhook_secret_set': bool(WEBHOOK_SECRET),
         'airtable_available': AIRTABLE_AVAILABLE,
         'data_directory': str(DATA_DIR),
+        'airtable_connections': get_pool_stats() if AIRTABLE_AVAILABLE else {},
         'version': '2.1'
     }), 200
 
@@ -5,11 +5,22 @@ Main client for interacting with WHOOP API
 """
 
 import os
+import sys
 import json
+import time
 import requests
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional
 
+# Shared request metrics live in the workspace scripts dir; optional for this skill
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / 'scripts'))
+try:
+    from api_metrics import record_request, request_size, response_size
+    HAS_METRICS = True
+except ImportError:
+    HAS_METRICS = False
+
 def get_whoop_credentials():
     """Get WHOOP credentials from multiple sources (OpenClaw config, env vars)"""
     client_id = None
@@ -111,6 +122,10 @@ class WhoopClient:
             'Content-Type': 'application/json'
         }
         
+        started = time.time()
+        response = None
+        retries = 0
+        error = None
         try:
             response = requests.get(url, headers=headers, params=params)
             
@@ -118,6 +133,7 @@ class WhoopClient:
                 print("🔄 Token expired, refreshing...")
                 if self._refresh_access_token():
                     headers['Authorization'] = f'Bearer {self.access_token}'
+                    retries = 1
                     response = requests.get(url, headers=headers, params=params)
                 else:
                     print("❌ Token refresh failed")
@@ -127,8 +143,17 @@ class WhoopClient:
             return response.json()
             
         except requests.RequestException as e:
+            error = str(e)
             print(f"❌ API request failed: {e}")
             return None
+        finally:
+            if HAS_METRICS:
+                record_request("whoop", "GET", endpoint,
+                               getattr(response, 'status_code', None),
+                               time.time() - started, retries=retries,
+                               request_bytes=request_size(response) if response is not None else 0,
+                               response_bytes=response_size(response) if response is not None else 0,
+                               error=error)
     
     def get_user_profile(self) -> Optional[Dict]:
         """Get basic user profile information"""